@@ -1,37 +1,92 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import get_principal_cache
 from app.core.config import Settings, get_settings
+from app.core.deadline import DEADLINE_HEADER, deadline_after
 from app.core.security import decode_access_token
-from app.db.session import get_db
-from app.repositories.user_repository import UserRepository
+from app.db.session import get_async_db, get_db
+from app.repositories.conversation_repository import AsyncConversationRepository
+from app.repositories.report_repository import AsyncReportRepository, ReportRepository
+from app.repositories.user_repository import AsyncUserRepository, UserRepository
 from app.schemas.token import TokenPayload
-from app.services.langchain import LangChainService
+from app.schemas.user import User
+from app.services.langchain import LangChainService, get_shared_langchain_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login", auto_error=False)
+
 
+async def get_settings_dependency() -> Settings:
+    """애플리케이션 설정을 FastAPI 의존성으로 제공한다.
 
-def get_settings_dependency() -> Settings:
-    """Expose application settings as a FastAPI dependency."""
+    가벼운 의존성은 `async def` 로 두어 스레드풀을 거치지 않고 이벤트 루프에서 바로 해석되게 한다.
+    """
     return get_settings()
 
 def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
+    """동기 저장소. 비밀번호 메서드가 스레드풀 워커를 막으므로 라우트는 get_async_user_repository 를 쓴다."""
     return UserRepository(db)
 
-def get_langchain_service(
-    settings: Settings = Depends(get_settings_dependency),
-) -> LangChainService:
-    return LangChainService(settings=settings)
+def get_report_repository(db: Session = Depends(get_db)) -> ReportRepository:
+    return ReportRepository(db)
+
+async def get_async_user_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncUserRepository:
+    return AsyncUserRepository(db)
+
+async def get_async_report_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncReportRepository:
+    return AsyncReportRepository(db)
+
+async def get_async_conversation_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncConversationRepository:
+    return AsyncConversationRepository(db)
+
+def request_deadline(default_setting: str):
+    """
+    요청 deadline(time.time() 기준 절대 시각, 없으면 None) 의존성을 만든다.
+    `X-Request-Timeout: <초>` 헤더가 있으면 그 값을, 없으면 settings 의 default_setting 값을 쓰고
+    REQUEST_MAX_TIMEOUT_SECONDS 를 넘지 않게 자른다.
+    """
+
+    async def dependency(
+        timeout: Optional[float] = Header(default=None, alias=DEADLINE_HEADER, gt=0),
+        settings: Settings = Depends(get_settings_dependency),
+    ) -> Optional[float]:
+        seconds = timeout if timeout is not None else getattr(settings, default_setting)
+        if settings.REQUEST_MAX_TIMEOUT_SECONDS > 0 and seconds > 0:
+            seconds = min(seconds, settings.REQUEST_MAX_TIMEOUT_SECONDS)
+        return deadline_after(seconds)
+
+    return dependency
+
 
+get_llm_deadline = request_deadline("LLM_REQUEST_TIMEOUT_SECONDS")
+get_batch_deadline = request_deadline("LLM_BATCH_REQUEST_TIMEOUT_SECONDS")
+get_report_deadline = request_deadline("REPORT_DEADLINE_SECONDS")
 
-def get_token_payload(
+
+def get_langchain_service() -> LangChainService:
+    """앱 시작 시 만들어 둔 공유 서비스(체인 포함)를 반환."""
+    return get_shared_langchain_service()
+
+
+async def get_token_payload(
     token: str = Depends(oauth2_scheme),
     settings: Settings = Depends(get_settings_dependency),
 ) -> TokenPayload:
-    """Common dependency that validates JWTs and returns their payload."""
+    """JWT 를 검증하고 payload 를 반환하는 공통 의존성.
+
+    검증된 클레임은 토큰별로 캐시한다 (토큰 만료 시각을 넘기지 않음).
+    """
+    cache = get_principal_cache()
+    payload = cache.get_claims(token)
+    if payload is not None:
+        return payload
     try:
-        return decode_access_token(
+        payload = decode_access_token(
             token,
             secret_key=settings.JWT_SECRET_KEY,
             algorithm=settings.JWT_ALGORITHM,
@@ -42,18 +97,62 @@ def get_token_payload(
             detail=str(exc),
             headers={"WWW-Authenticate": "Bearer"},
         ) from exc
+    cache.set_claims(token, payload)
+    return payload
 
 
-def get_current_user(
+async def get_current_user(
     payload: TokenPayload = Depends(get_token_payload),
-    repository: UserRepository = Depends(get_user_repository),
-):
-    """Resolve the authenticated user using the JWT payload."""
-    user = repository.get(payload.user_id)
+    repository: AsyncUserRepository = Depends(get_async_user_repository),
+) -> User:
+    """JWT payload 로 인증된 사용자를 찾는다.
+
+    가능하면 principal 캐시의 분리된(detached) 스냅샷을 반환하며, UserRepository.update/delete 가 캐시를 무효화한다.
+    """
+    cache = get_principal_cache()
+    user_id = payload.user_id
+    principal = cache.get_principal(user_id)
+    if principal is not None:
+        return principal
+
+    generation = cache.generation(user_id)
+    user = await repository.get(user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User for provided token no longer exists",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    principal = User.model_validate(user)
+    cache.set_principal(principal, generation)
+    return principal
+
+
+async def get_llm_caller(
+    request: Request,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    settings: Settings = Depends(get_settings_dependency),
+) -> str:
+    """LLM 호출 한도를 나누는 호출자 키.
+
+    유효한 토큰이면 "user:<id>", 토큰이 없거나 유효하지 않으면 401 대신 "ip:<client host>".
+    프록시 뒤에서는 uvicorn --proxy-headers/--forwarded-allow-ips 로 띄워야 client host 가 실제 클라이언트다 (README).
+    """
+    if token:
+        cache = get_principal_cache()
+        payload = cache.get_claims(token)
+        if payload is None:
+            try:
+                payload = decode_access_token(
+                    token,
+                    secret_key=settings.JWT_SECRET_KEY,
+                    algorithm=settings.JWT_ALGORITHM,
+                )
+            except ValueError:
+                payload = None
+            else:
+                cache.set_claims(token, payload)
+        if payload is not None:
+            return f"user:{payload.user_id}"
+    client = request.client
+    return f"ip:{client.host if client else 'unknown'}"
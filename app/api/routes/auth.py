@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.api.dependencies import get_settings_dependency, get_user_repository
+from app.api.dependencies import get_async_user_repository, get_settings_dependency
 from app.core.config import Settings
-from app.core.security import create_access_token
-from app.repositories.user_repository import UserRepository
+from app.core.security import PasswordHashingBusy, create_access_token
+from app.repositories.user_repository import AsyncUserRepository
 from app.schemas.user import LoginRequest, LoginResponse
 
 router = APIRouter()
@@ -14,12 +14,19 @@ router = APIRouter()
     response_model=LoginResponse,
     summary="Authenticate user by loginId/password",
 )
-def login(
+async def login(
     payload: LoginRequest,
-    repository: UserRepository = Depends(get_user_repository),
+    repository: AsyncUserRepository = Depends(get_async_user_repository),
     settings: Settings = Depends(get_settings_dependency),
 ):
-    user = repository.authenticate(payload)
+    try:
+        user = await repository.authenticate(payload)
+    except PasswordHashingBusy as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Response
+
+from app.core.metrics import REGISTRY, format_histogram, gauge_lines
+from app.db.session import POOL_WAIT_BUCKETS, async_pool_stats, pool_stats
+from app.services.llm_cache import cache_stats, get_llm_cache
+from app.services.llm_limiter import get_llm_limiter
+from app.services.llm_resilience import BREAKER_STATE_VALUES, get_llm_resilience
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+CACHE_COUNTERS = ("hits", "misses", "evictions", "sets", "bypasses")
+
+
+def _llm_cache_lines() -> List[str]:
+    """요약 캐시 통계. shared 백엔드(sqlite/redis)를 쓰면 L2 조회 결과를 tier="shared" 로 따로 노출."""
+    stats = cache_stats(get_llm_cache())
+    tiers = [("all", stats)]
+    if isinstance(stats.get("shared"), dict):
+        tiers.append(("shared", stats["shared"]))
+    lines: List[str] = []
+    for name in CACHE_COUNTERS:
+        lines.extend(
+            gauge_lines(
+                f"llm_cache_{name}_total",
+                f"LLM summary cache {name}.",
+                [({"tier": tier}, values.get(name, 0)) for tier, values in tiers],
+                kind="counter",
+            )
+        )
+    lines.extend(
+        gauge_lines(
+            "llm_cache_hit_ratio",
+            "LLM summary cache hits / lookups since start.",
+            [({"tier": tier}, values.get("hit_rate", 0.0)) for tier, values in tiers],
+        )
+    )
+    return lines
+
+
+def _db_pool_lines() -> List[str]:
+    engines: List[tuple] = [("sync", pool_stats())]
+    async_stats: Optional[Dict[str, object]] = async_pool_stats()
+    if async_stats is not None:
+        engines.append(("async", async_stats))
+
+    lines: List[str] = []
+    for key, name, doc in (
+        ("size", "db_pool_size", "Configured pool size."),
+        ("checked_out", "db_pool_checked_out", "Connections currently checked out."),
+        ("overflow", "db_pool_overflow", "Current overflow connections (negative while under pool size)."),
+    ):
+        samples = [({"engine": engine}, stats[key]) for engine, stats in engines if key in stats]
+        if samples:
+            lines.extend(gauge_lines(name, doc, samples))
+    samples = [({"engine": engine}, stats["timeouts"]) for engine, stats in engines if "timeouts" in stats]
+    if samples:
+        lines.extend(gauge_lines("db_pool_checkout_timeouts_total", "Checkouts that failed or timed out.", samples, kind="counter"))
+
+    waits = [(engine, stats) for engine, stats in engines if "wait_buckets" in stats]
+    if waits:
+        lines.extend(
+            [
+                "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.",
+                "# TYPE db_pool_checkout_wait_seconds histogram",
+            ]
+        )
+        for engine, stats in waits:
+            lines.extend(
+                format_histogram(
+                    "db_pool_checkout_wait_seconds",
+                    {"engine": engine},
+                    POOL_WAIT_BUCKETS,
+                    list(stats["wait_buckets"].values()),
+                    stats["wait_seconds_total"],
+                )
+            )
+    return lines
+
+
+def _llm_limiter_lines() -> List[str]:
+    stats = get_llm_limiter().stats()
+    lines: List[str] = []
+    lines.extend(gauge_lines("llm_limiter_limit", "Configured global LLM concurrency (0 = unlimited).", [({}, stats["global_limit"])]))
+    lines.extend(
+        gauge_lines(
+            "llm_limiter_active",
+            "LLM calls currently holding a slot.",
+            [({"scope": "global"}, stats["global_active"]), ({"scope": "user"}, stats["user_active"])],
+        )
+    )
+    lines.extend(
+        gauge_lines(
+            "llm_limiter_waiting",
+            "LLM calls queued for a slot.",
+            [({"scope": "global"}, stats["global_waiting"]), ({"scope": "user"}, stats["user_waiting"])],
+        )
+    )
+    lines.extend(gauge_lines("llm_limiter_tracked_callers", "Callers with per-caller limit state.", [({}, stats["tracked_callers"])]))
+    return lines
+
+
+def _llm_circuit_lines() -> List[str]:
+    states = get_llm_resilience().stats()
+    return gauge_lines(
+        "llm_circuit_state",
+        "LLM circuit breaker state per chain (0 = closed, 1 = half_open, 2 = open).",
+        [({"chain": chain}, BREAKER_STATE_VALUES[state]) for chain, state in sorted(states.items())],
+    )
+
+
+def _llm_executor_lines() -> List[str]:
+    stats = get_llm_resilience().executor_stats()
+    lines = gauge_lines("llm_call_executor_workers", "Threads in the sync LLM call pool.", [({}, stats["workers"])])
+    lines.extend(
+        gauge_lines(
+            "llm_call_abandoned_attempts",
+            "Sync LLM attempts given up on (deadline or lost hedge) that still hold a pool thread.",
+            [({}, stats["abandoned"])],
+        )
+    )
+    return lines
+
+
+REGISTRY.add_collector(_llm_cache_lines)
+REGISTRY.add_collector(_db_pool_lines)
+REGISTRY.add_collector(_llm_limiter_lines)
+REGISTRY.add_collector(_llm_circuit_lines)
+REGISTRY.add_collector(_llm_executor_lines)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 스크레이프 엔드포인트."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -1,39 +1,330 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.api.dependencies import get_langchain_service
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.api.dependencies import (
+    get_async_conversation_repository,
+    get_batch_deadline,
+    get_langchain_service,
+    get_llm_caller,
+    get_llm_deadline,
+    get_settings_dependency,
+)
+from app.core.config import Settings
+from app.core.deadline import ClientDisconnected, RequestDeadlineExceeded, run_with_deadline
+from app.models.conversation import Conversation
+from app.repositories.conversation_repository import AsyncConversationRepository
 from app.schemas.reflection import (
+    ConversationCreateRequest,
+    ConversationCreateResponse,
+    ConversationMessageRequest,
+    ConversationMessageResponse,
+    ReflectionSummaryBatchItem,
+    ReflectionSummaryBatchRequest,
+    ReflectionSummaryBatchResponse,
     ReflectionSummaryRequest,
     ReflectionSummaryResponse,
     ReflectionChatRequest,
     ReflectionChatResponse,
 )
+from app.services.conversation_service import fold_conversation, needs_fold, prepare_turn, record_turn
 from app.services.langchain import LangChainService
+from app.services.llm_cache import cache_stats
+from app.services.llm_limiter import LLMRateLimited
+from app.services.tokens import PromptBudgetExceeded
 
 router = APIRouter()
 
+CACHE_BYPASS_HEADER = "X-LLM-Cache"
+
+
+def _use_cache(cache_header: Optional[str]) -> bool:
+    """`X-LLM-Cache: bypass` 이면 캐시를 건너뛰고 LLM 을 직접 호출한다 (결과는 캐시에 갱신)."""
+    return (cache_header or "").strip().lower() != "bypass"
+
+
+def _too_large(exc: PromptBudgetExceeded) -> HTTPException:
+    """필수 입력만으로 프롬프트 토큰 예산을 넘음 → LLM 을 부르기 전에 413."""
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc))
+
+
+def _deadline_exceeded(exc: RequestDeadlineExceeded) -> HTTPException:
+    """요청 deadline(X-Request-Timeout 또는 라우트 기본값)이 지나 LLM 작업을 취소함 → 504."""
+    return HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(exc))
+
+
+# nginx 관례. 클라이언트는 이미 떠났으므로 응답은 버려지고 메트릭/로그에만 남는다.
+CLIENT_CLOSED_REQUEST = 499
+
+
+def _client_closed(exc: ClientDisconnected) -> HTTPException:
+    return HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=str(exc))
+
+
+def _rate_limited(exc: LLMRateLimited) -> HTTPException:
+    """LLM 호출 한도 초과 → 429 + Retry-After."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(exc),
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
+
+def _llm_error(exc: Exception, failure_detail: str) -> HTTPException:
+    """
+    LLM 을 부르는 라우트의 공통 예외 → HTTP 매핑 (라우트는 except Exception 한 곳에서 이 함수만 부른다).
+    413 프롬프트 예산 초과, 429 호출 한도, 504 deadline, 499 클라이언트 끊김,
+    503 설정/LLM 오류(RuntimeError), 그 외는 failure_detail 로 500.
+    """
+    if isinstance(exc, PromptBudgetExceeded):
+        return _too_large(exc)
+    if isinstance(exc, LLMRateLimited):
+        return _rate_limited(exc)
+    if isinstance(exc, RequestDeadlineExceeded):
+        return _deadline_exceeded(exc)
+    if isinstance(exc, ClientDisconnected):
+        return _client_closed(exc)
+    if isinstance(exc, RuntimeError):
+        return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc))
+    return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=failure_detail)
+
 
 @router.post("/summary", response_model=ReflectionSummaryResponse, summary="요약 인사이트 생성")
-def summarize_reflection(
+async def summarize_reflection(
     payload: ReflectionSummaryRequest,
+    request: Request,
     service: LangChainService = Depends(get_langchain_service),
+    caller: str = Depends(get_llm_caller),
+    deadline: Optional[float] = Depends(get_llm_deadline),
+    cache_header: Optional[str] = Header(default=None, alias=CACHE_BYPASS_HEADER),
 ):
     try:
-        summary = service.summarize_reflection(payload.to_chain_payload())
-    except RuntimeError as exc:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+        summary = await run_with_deadline(
+            service.asummarize_reflection(
+                payload.to_chain_payload(),
+                use_cache=_use_cache(cache_header),
+                caller=caller,
+                deadline=deadline,
+            ),
+            deadline,
+            request.receive,
+        )
     except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate reflection summary.") from exc
+        raise _llm_error(exc, "Failed to generate reflection summary.") from exc
     return ReflectionSummaryResponse(**summary)
 
 
+@router.post("/summary:batch", response_model=ReflectionSummaryBatchResponse, summary="요약 인사이트 일괄 생성")
+async def summarize_reflections(
+    payload: ReflectionSummaryBatchRequest,
+    request: Request,
+    service: LangChainService = Depends(get_langchain_service),
+    settings: Settings = Depends(get_settings_dependency),
+    caller: str = Depends(get_llm_caller),
+    deadline: Optional[float] = Depends(get_batch_deadline),
+    cache_header: Optional[str] = Header(default=None, alias=CACHE_BYPASS_HEADER),
+):
+    if len(payload.items) > settings.SUMMARY_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.SUMMARY_BATCH_MAX_ITEMS} items per batch.",
+        )
+    try:
+        results = await run_with_deadline(
+            service.asummarize_reflections(
+                [item.to_chain_payload() for item in payload.items],
+                use_cache=_use_cache(cache_header),
+                caller=caller,
+                deadline=deadline,
+            ),
+            deadline,
+            request.receive,
+        )
+    except Exception as exc:
+        raise _llm_error(exc, "Failed to generate reflection summaries.") from exc
+    return ReflectionSummaryBatchResponse(
+        results=[
+            ReflectionSummaryBatchItem(index=i, result=r["result"], error=r["error"])
+            for i, r in enumerate(results)
+        ]
+    )
+
+
+@router.get("/summary/cache", summary="요약 캐시 통계")
+async def summary_cache_stats(service: LangChainService = Depends(get_langchain_service)):
+    return cache_stats(service.cache)
+
+
 @router.post("/chat", response_model=ReflectionChatResponse, summary="시뮬레이션 대화 응답 생성")
-def chat_reflection(
+async def chat_reflection(
     payload: ReflectionChatRequest,
+    request: Request,
     service: LangChainService = Depends(get_langchain_service),
+    caller: str = Depends(get_llm_caller),
+    deadline: Optional[float] = Depends(get_llm_deadline),
 ):
     try:
-        reply = service.generate_chat_reply(payload.to_chat_payload())
-    except RuntimeError as exc:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+        reply = await run_with_deadline(
+            service.agenerate_chat_reply(payload.to_chat_payload(), caller=caller, deadline=deadline),
+            deadline,
+            request.receive,
+        )
     except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate chat response.") from exc
+        raise _llm_error(exc, "Failed to generate chat response.") from exc
     return ReflectionChatResponse(reply=reply)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _chat_event_stream(first: dict, events: AsyncIterator[dict]) -> AsyncIterator[str]:
+    try:
+        kind = first.pop("type")
+        yield _sse(kind, first)
+        async for event in events:
+            kind = event.pop("type")
+            yield _sse(kind, event)
+    except RequestDeadlineExceeded as exc:
+        yield _sse("error", {"detail": str(exc)})
+    except Exception:
+        yield _sse("error", {"detail": "Failed to generate chat response."})
+
+
+@router.post("/chat/stream", summary="시뮬레이션 대화 응답 스트리밍 (SSE)")
+async def chat_reflection_stream(
+    payload: ReflectionChatRequest,
+    request: Request,
+    service: LangChainService = Depends(get_langchain_service),
+    caller: str = Depends(get_llm_caller),
+    deadline: Optional[float] = Depends(get_llm_deadline),
+):
+    """
+    `event: token` (data: {"text"}) 을 생성되는 대로 보내고,
+    마지막에 `event: done` (data: {"reply", "usage"}) 을 보낸다.
+    첫 이벤트까지는 응답 전에 받아 두므로 키 누락 등 즉시 실패는 503/500, 호출 한도 초과는 429,
+    첫 토큰 전에 deadline 이 지나면 504, 스트리밍 중에 지나면 `event: error` 로 끝난다.
+    LLM 자리는 스트림이 끝날 때까지 유지되며, 스트리밍 중 클라이언트가 끊으면 StreamingResponse 가 스트림을 취소한다.
+    """
+    events = service.astream_chat_reply(payload.to_chat_payload(), caller=caller, deadline=deadline)
+    try:
+        first = await run_with_deadline(events.__anext__(), deadline, request.receive)
+    except Exception as exc:
+        raise _llm_error(exc, "Failed to generate chat response.") from exc
+    return StreamingResponse(
+        _chat_event_stream(first, events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _get_conversation(
+    repository: AsyncConversationRepository, conversation_id: str, caller: str
+) -> Conversation:
+    """다른 호출자가 만든 대화는 존재 여부를 드러내지 않도록 없는 대화와 같은 404 로 응답한다."""
+    conversation = await repository.get(conversation_id)
+    if conversation is None or conversation.owner != caller:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
+    return conversation
+
+
+@router.post(
+    "/conversations",
+    response_model=ConversationCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="서버 측 시뮬레이션 대화 생성",
+)
+async def create_conversation(
+    payload: ConversationCreateRequest,
+    repository: AsyncConversationRepository = Depends(get_async_conversation_repository),
+    caller: str = Depends(get_llm_caller),
+):
+    """회고/페르소나 정보는 여기서 한 번만 받는다. 이후 턴은 /conversations/{id}/messages 로 새 메시지만 보낸다."""
+    conversation = await repository.create(payload.to_context(), owner=caller)
+    return ConversationCreateResponse(conversationId=conversation.id)
+
+
+@router.post(
+    "/conversations/{conversation_id}/messages",
+    response_model=ConversationMessageResponse,
+    summary="서버 측 대화에 메시지 보내기",
+)
+async def send_conversation_message(
+    conversation_id: str,
+    payload: ConversationMessageRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    repository: AsyncConversationRepository = Depends(get_async_conversation_repository),
+    service: LangChainService = Depends(get_langchain_service),
+    caller: str = Depends(get_llm_caller),
+    deadline: Optional[float] = Depends(get_llm_deadline),
+):
+    """
+    프롬프트에는 접힌 이전 대화 요약 + 최근 턴만 들어간다.
+    저장된 턴이 예산을 넘으면 응답 후 백그라운드에서 오래된 턴을 요약에 접는다.
+    """
+    conversation = await _get_conversation(repository, conversation_id, caller)
+    chat_payload, turns = await prepare_turn(repository, conversation, payload.message)
+    try:
+        reply = await run_with_deadline(
+            service.agenerate_chat_reply(chat_payload, caller=caller, deadline=deadline),
+            deadline,
+            request.receive,
+        )
+    except Exception as exc:
+        raise _llm_error(exc, "Failed to generate chat response.") from exc
+
+    turn_count = conversation.turn_count + 2
+    await record_turn(conversation_id, payload.message, reply, repository)
+    if needs_fold(turns, (payload.message, reply)):
+        background_tasks.add_task(fold_conversation, conversation_id, service)
+    return ConversationMessageResponse(reply=reply, conversationId=conversation_id, turnCount=turn_count)
+
+
+@router.post(
+    "/conversations/{conversation_id}/messages/stream",
+    summary="서버 측 대화에 메시지 보내기 (SSE)",
+)
+async def stream_conversation_message(
+    conversation_id: str,
+    payload: ConversationMessageRequest,
+    request: Request,
+    repository: AsyncConversationRepository = Depends(get_async_conversation_repository),
+    service: LangChainService = Depends(get_langchain_service),
+    caller: str = Depends(get_llm_caller),
+    deadline: Optional[float] = Depends(get_llm_deadline),
+):
+    """
+    /chat/stream 과 같은 이벤트 형식. 턴은 `event: done` 을 보내기 직전에 저장되므로,
+    done 을 받은 클라이언트의 다음 메시지는 항상 이번 턴을 본다.
+    """
+    conversation = await _get_conversation(repository, conversation_id, caller)
+    chat_payload, turns = await prepare_turn(repository, conversation, payload.message)
+    recorded = {"fold": False}
+
+    async def recording(events: AsyncIterator[dict]) -> AsyncIterator[dict]:
+        async for event in events:
+            if event["type"] == "done":
+                # 요청 세션은 스트리밍 중 사용할 수 없으므로 자체 세션으로 저장한다.
+                await record_turn(conversation_id, payload.message, event["reply"])
+                recorded["fold"] = needs_fold(turns, (payload.message, event["reply"]))
+            yield event
+
+    async def fold_if_needed() -> None:
+        if recorded["fold"]:
+            await fold_conversation(conversation_id, service)
+
+    events = recording(service.astream_chat_reply(chat_payload, caller=caller, deadline=deadline))
+    try:
+        first = await run_with_deadline(events.__anext__(), deadline, request.receive)
+    except Exception as exc:
+        raise _llm_error(exc, "Failed to generate chat response.") from exc
+    return StreamingResponse(
+        _chat_event_stream(first, events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(fold_if_needed),
+    )
@@ -1,37 +1,166 @@
-import json
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
 
-from app.api.dependencies import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.api.dependencies import get_async_report_repository, get_settings_dependency
+from app.core.config import Settings
 from app.models.report import Report
+from app.repositories.report_repository import AsyncReportRepository
+from app.schemas.report import ReportListItem, ReportPage
+from app.services.report_export import ExportFilter, aiter_export_chunks, naive_utc
+from app.services.report_storage import accepts_encoding, decoded_body, rendered_body
 
 router = APIRouter()
 
 
+@router.get("/reports", response_model=ReportPage, summary="리포트 목록 조회 (커서 페이지네이션)")
+async def list_reports(
+    session_id: Optional[str] = Query(default=None, alias="sessionId"),
+    requestor: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    repository: AsyncReportRepository = Depends(get_async_report_repository),
+):
+    if session_id is None and requestor is None:
+        raise HTTPException(status_code=400, detail="sessionId or requestor is required")
+    try:
+        rows, next_cursor = await repository.list_page(
+            session_id=session_id,
+            requestor=requestor,
+            status=status,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return ReportPage(items=[ReportListItem.model_validate(r) for r in rows], next_cursor=next_cursor)
+
+
+# /reports/{report_id} 보다 먼저 등록해야 "export" 가 report_id 로 해석되지 않는다.
+@router.get("/reports/export", summary="리포트 NDJSON 내보내기 (스트리밍)")
+async def export_reports(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    status: Optional[str] = None,
+    session_id: Optional[str] = Query(default=None, alias="sessionId"),
+    after: Optional[int] = Query(default=None, ge=0),
+    settings: Settings = Depends(get_settings_dependency),
+):
+    """
+    report_id 순으로 한 줄에 리포트 하나(GET /reports/{id} 와 같은 문서)를 스트리밍한다.
+    REPORT_EXPORT_BATCH_SIZE 행마다 체크포인트 줄이 오며, 끊기면 마지막 체크포인트의 after 를 넘겨 이어 받는다.
+    since/until 은 created_at 범위 (since 이상, until 미만, 시간대 없으면 UTC).
+    """
+    since, until = naive_utc(since), naive_utc(until)
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(status_code=400, detail="since must be earlier than until")
+    filters = ExportFilter(since=since, until=until, status=status, session_id=session_id, after=after)
+    return StreamingResponse(
+        aiter_export_chunks(filters, settings.REPORT_EXPORT_BATCH_SIZE),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+def _etag(report: Report, fmt: str, encoding: Optional[str]) -> str:
+    # 완료된 리포트는 processed_at 이후 바뀌지 않으므로 (id, processed_at, 표현 형식, 인코딩)으로 충분하다.
+    version = int(report.processed_at.replace(tzinfo=timezone.utc).timestamp() * 1_000_000)
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"{report.report_id}-{version}-{fmt}{suffix}"'
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def _cache_headers(report: Report, fmt: str, encoding: Optional[str], settings: Settings) -> dict:
+    if report.status != "finished" or report.processed_at is None:
+        return {"Cache-Control": "no-cache"}
+    last_modified = report.processed_at.replace(tzinfo=timezone.utc)
+    headers = {
+        "ETag": _etag(report, fmt, encoding),
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": f"public, max-age={settings.REPORT_CACHE_MAX_AGE_SECONDS}",
+    }
+    if report.body_encoding:
+        headers["Vary"] = "Accept-Encoding"
+    return headers
+
+
 @router.get("/reports/{report_id}", summary="리포트 상세 조회")
-def get_report(report_id: int, db: Session = Depends(get_db), format: str | None = None):
-    report = db.query(Report).filter(Report.report_id == report_id).first()
+async def get_report(
+    report_id: int,
+    request: Request,
+    repository: AsyncReportRepository = Depends(get_async_report_repository),
+    settings: Settings = Depends(get_settings_dependency),
+    format: str | None = None,
+):
+    """
+    - 요청 형식에 필요 없는 본문 컬럼(md 또는 json)은 읽지 않는다.
+    - 완료된 리포트는 ETag/Last-Modified 를 붙이고, If-None-Match / If-Modified-Since 가 맞으면 304.
+    - 저장된 report_json 문자열은 검증만 하고(깨졌으면 {}) 재직렬화 없이 응답 본문에 이어 붙인다.
+    - 압축 저장된 리포트는 클라이언트가 해당 인코딩을 받으면 저장된 바이트를 그대로 보낸다.
+    """
+    fmt = "md" if format == "md" else "json"
+    if fmt == "md":
+        unused = (Report.report_json, Report.report_json_body)
+    else:
+        unused = (Report.report_md, Report.report_md_body)
+    report = await repository.get(report_id, unused)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    if format == "md":
-        if report.status != "finished":
-            raise HTTPException(status_code=400, detail="Report not finished")
-        return report.report_md or ""
+    if fmt == "md" and report.status != "finished":
+        raise HTTPException(status_code=400, detail="Report not finished")
 
-    parsed_json = {}
-    if report.report_json and report.status == "finished":
-        try:
-            parsed_json = json.loads(report.report_json)
-        except Exception:
-            parsed_json = {}
+    encoding = None
+    if report.body_encoding and accepts_encoding(request.headers.get("accept-encoding"), report.body_encoding):
+        encoding = report.body_encoding
+
+    headers = _cache_headers(report, fmt, encoding, settings)
+    if "ETag" in headers and _not_modified(request, headers["ETag"], report.processed_at.replace(tzinfo=timezone.utc)):
+        return Response(status_code=304, headers=headers)
 
+    if encoding:
+        body, _ = rendered_body(report, fmt)
+        headers["Content-Encoding"] = encoding
+    else:
+        body = decoded_body(report, fmt)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/reports/{report_id}/status", summary="리포트 처리 상태 조회")
+async def get_report_status(
+    report_id: int,
+    repository: AsyncReportRepository = Depends(get_async_report_repository),
+):
+    # 폴링 응답에 본문은 필요 없다.
+    report = await repository.get(
+        report_id,
+        (Report.report_md, Report.report_json, Report.report_md_body, Report.report_json_body),
+    )
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
     return {
         "report_id": report.report_id,
-        "session_id": report.session_id,
         "status": report.status,
         "failure_reason": report.failure_reason if report.status == "failed" else None,
         "created_at": report.created_at,
         "processed_at": report.processed_at,
-        "report_json": parsed_json if report.status == "finished" else None,
     }
@@ -1,72 +1,83 @@
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
 
-from app.api.dependencies import get_db, get_langchain_service
-from app.services.langchain import LangChainService
-from app.services.report_service import generate_report_for_session
+from app.api.dependencies import (
+    get_async_report_repository,
+    get_report_deadline,
+    get_settings_dependency,
+)
+from app.core.config import Settings
+from app.core.metrics import stage_timer
 from app.models.report import Report
+from app.repositories.report_repository import AsyncReportRepository, report_dedupe_key
+from app.services.report_queue import LocalReportQueue, QueueFullError, ReportQueue, get_report_queue
 
 router = APIRouter()
 
 
-@router.post("/reports", summary="세션 리포트 동기 생성")
-def create_report(
+@router.post("/reports", status_code=status.HTTP_202_ACCEPTED, summary="세션 리포트 비동기 생성 요청")
+async def create_report(
     body: dict,
-    db: Session = Depends(get_db),
-    service: LangChainService = Depends(get_langchain_service),
+    repository: AsyncReportRepository = Depends(get_async_report_repository),
+    report_queue: ReportQueue = Depends(get_report_queue),
+    settings: Settings = Depends(get_settings_dependency),
+    deadline: Optional[float] = Depends(get_report_deadline),
 ):
+    """
+    같은 sessionId(+ 선택 contentVersion)로 이미 생성 중인 리포트가 있으면 새로 만들지 않고
+    그 report_id 를 돌려준다 (coalesced=true). 더블클릭·여러 탭의 중복 요청이 LLM 호출 한 번으로 끝난다.
+    deadline(X-Request-Timeout 또는 REPORT_DEADLINE_SECONDS, 큐 대기 포함)까지 끝나지 않은 생성은 워커가 취소하고
+    failed 로 남긴다.
+    """
     session_id = body.get("sessionId")
     if session_id is None:
         raise HTTPException(status_code=400, detail="sessionId is required")
 
     requestor = body.get("requestor")
+    content_version = body.get("contentVersion")
+    deadline_at = datetime.utcfromtimestamp(deadline) if deadline is not None else None
+
+    with stage_timer("persist"):
+        if settings.REPORT_COALESCE_ENABLED:
+            report, coalesced = await repository.claim_pending(
+                str(session_id),
+                requestor,
+                report_dedupe_key(str(session_id), None if content_version is None else str(content_version)),
+                datetime.utcnow() - timedelta(seconds=settings.REPORT_COALESCE_STALE_SECONDS),
+                deadline_at,
+            )
+        else:
+            report, coalesced = await repository.create_pending(str(session_id), requestor, deadline_at), False
 
-    report = Report(
-        session_id=str(session_id),
-        requestor=requestor,
-        status="pending",
-        created_at=datetime.utcnow(),
-    )
-    db.add(report)
-    db.commit()
-    db.refresh(report)
+    if coalesced:
+        # 이미 큐에 들어간 생성에 합류했으므로 다시 넣지 않는다.
+        return _accepted(report, coalesced=True)
 
     try:
-        generated = generate_report_for_session(db, session_id, service, requestor)
-        report.report_md = generated["report_md"]
-        report.report_json = json.dumps(generated["report_json"], ensure_ascii=False)
-        report.status = "finished"
-        report.processed_at = datetime.utcnow()
-        db.commit()
-        db.refresh(report)
-    except RuntimeError as exc:
-        report.status = "failed"
-        report.failure_reason = str(exc)
-        report.processed_at = datetime.utcnow()
-        db.commit()
+        # local 큐는 put_nowait 라 바로 끝나지만, rq 는 Redis 왕복이므로 스레드풀에서 호출한다.
+        if isinstance(report_queue, LocalReportQueue):
+            report_queue.enqueue(report.report_id)
+        else:
+            await run_in_threadpool(report_queue.enqueue, report.report_id)
+    except QueueFullError as exc:
+        await repository.mark_failed(report, str(exc))
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(exc),
         ) from exc
-    except Exception as exc:
-        report.status = "failed"
-        report.failure_reason = "Unexpected error"
-        report.processed_at = datetime.utcnow()
-        db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate report.",
-        ) from exc
 
+    return _accepted(report, coalesced=False)
+
+
+def _accepted(report: Report, coalesced: bool) -> dict:
     return {
+        "queued": True,
+        "coalesced": coalesced,
         "report_id": report.report_id,
         "session_id": report.session_id,
         "status": report.status,
-        "failure_reason": report.failure_reason,
         "created_at": report.created_at,
-        "processed_at": report.processed_at,
-        "report_json": generated["report_json"],
-        "report_md": generated["report_md"],
     }
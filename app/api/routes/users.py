@@ -1,11 +1,11 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
-from app.api.dependencies import get_current_user, get_user_repository
-from app.repositories.user_repository import UserRepository
+from app.api.dependencies import get_async_user_repository, get_current_user
+from app.core.security import PasswordHashingBusy
+from app.repositories.user_repository import AsyncUserRepository
 from app.schemas.user import User, UserCreate, UserUpdate
-from app.models.user import User as UserModel
 
 router = APIRouter()
 
@@ -16,24 +16,48 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     summary="Create a new user",
 )
-def create_user_endpoint(
+async def create_user_endpoint(
     payload: UserCreate,
-    repository: UserRepository = Depends(get_user_repository),
+    repository: AsyncUserRepository = Depends(get_async_user_repository),
 ):
-    if repository.get_by_email(payload.email):
+    if await repository.get_by_email(payload.email):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    if repository.get_by_login_id(payload.loginId):
+    if await repository.get_by_login_id(payload.loginId):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Login ID already registered")
-    return repository.create(payload)
+    try:
+        return await repository.create(payload)
+    except PasswordHashingBusy as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 @router.get("/", response_model=List[User], summary="List users")
-def read_users(
+async def read_users(
+    response: Response,
     skip: int = 0,
-    limit: int = 10,
-    repository: UserRepository = Depends(get_user_repository),
+    limit: int = Query(default=10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    repository: AsyncUserRepository = Depends(get_async_user_repository),
 ):
-    return repository.list(skip=skip, limit=limit)
+    """커서 페이지네이션: 직전 응답의 `X-Next-Cursor` 헤더 값을 `cursor` 로 넘긴다.
+
+    `skip`(offset 페이지네이션)은 기존 클라이언트를 위해 남겨 두며, `cursor` 가 있으면 무시한다.
+    """
+    if skip and not cursor:
+        return await repository.list(skip=skip, limit=limit)
+    try:
+        users, next_cursor = await repository.list_page(cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return users
 
 
 @router.get(
@@ -41,8 +65,8 @@ def read_users(
     response_model=User,
     summary="Get a single user by id",
 )
-def read_user(user_id: int, repository: UserRepository = Depends(get_user_repository)):
-    user = repository.get(user_id)
+async def read_user(user_id: int, repository: AsyncUserRepository = Depends(get_async_user_repository)):
+    user = await repository.get(user_id)
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return user
@@ -53,15 +77,22 @@ def read_user(user_id: int, repository: UserRepository = Depends(get_user_reposi
     response_model=User,
     summary="Update user",
 )
-def update_user(
+async def update_user(
     user_id: int,
     payload: UserUpdate,
-    repository: UserRepository = Depends(get_user_repository),
-    current_user: UserModel = Depends(get_current_user),
+    repository: AsyncUserRepository = Depends(get_async_user_repository),
+    current_user: User = Depends(get_current_user),
 ):
     if current_user.id != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    user = repository.update(user_id, payload)
+    try:
+        user = await repository.update(user_id, payload)
+    except PasswordHashingBusy as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return user
@@ -72,14 +103,14 @@ def update_user(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete user",
 )
-def delete_user(
+async def delete_user(
     user_id: int,
-    repository: UserRepository = Depends(get_user_repository),
-    current_user: UserModel = Depends(get_current_user),
+    repository: AsyncUserRepository = Depends(get_async_user_repository),
+    current_user: User = Depends(get_current_user),
 ):
     if current_user.id != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    deleted = repository.delete(user_id)
+    deleted = await repository.delete(user_id)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
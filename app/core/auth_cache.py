@@ -0,0 +1,95 @@
+"""
+인증 결과 캐시.
+
+- claims: access token -> 검증된 TokenPayload (JWT 서명 검증 생략). 토큰 만료 시각을 넘기지 않는다.
+- principals: user id -> 사용자 스냅샷(schemas.User). UserRepository.update/delete 시 무효화.
+
+프로세스 단위 캐시이므로 다른 워커에서 일어난 변경은 TTL 이 지나야 반영된다. TTL 은 짧게 유지할 것.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.core.config import get_settings
+from app.schemas.token import TokenPayload
+from app.schemas.user import User
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: V, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class PrincipalCache:
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 30):
+        self.claims: TTLCache[TokenPayload] = TTLCache(max_entries, ttl_seconds)
+        self.principals: TTLCache[User] = TTLCache(max_entries, ttl_seconds)
+        # 조회 도중 무효화된 사용자를 오래된 값으로 다시 채우지 않도록 세대 번호를 둔다.
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get_claims(self, token: str) -> Optional[TokenPayload]:
+        return self.claims.get(token)
+
+    def set_claims(self, token: str, payload: TokenPayload) -> None:
+        self.claims.set(token, payload, ttl_seconds=payload.exp - time.time())
+
+    def generation(self, user_id: int) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def get_principal(self, user_id: int) -> Optional[User]:
+        return self.principals.get(user_id)
+
+    def set_principal(self, user: User, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(user.id, 0) != generation:
+                return
+            self.principals.set(user.id, user)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self.principals.pop(user_id)
+
+
+@lru_cache
+def get_principal_cache() -> PrincipalCache:
+    settings = get_settings()
+    return PrincipalCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
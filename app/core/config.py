@@ -9,14 +9,110 @@ class Settings(BaseSettings):
     API_PREFIX: str = "/api"
 
     DATABASE_URL: str = "sqlite:///./app/data/app.db"
+    # async 라우트용 URL. 비우면 DATABASE_URL 의 드라이버를 async 드라이버로 바꿔 사용 (sqlite -> aiosqlite)
+    ASYNC_DATABASE_URL: str | None = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800  # 초. 서버 측 idle 끊김 이전에 커넥션을 교체
+    DB_POOL_PRE_PING: bool = True
+    # SQLite 파일 DB 전용 PRAGMA (빈 값이면 적용하지 않음)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
 
     GEMINI_MODEL: str = "gemini-2.0-flash"
     # GEMINI_API_KEY: str | None = None
+    LLM_WARMUP_ON_STARTUP: bool = True
+
+    SUMMARY_BATCH_MAX_ITEMS: int = 100
+    SUMMARY_BATCH_MAX_CONCURRENCY: int = 8
+
+    # 서버 측 대화(/conversations): 요약되지 않은 턴이 MAX 를 넘으면 최근 KEEP 만 남기고 rolling summary 에 접는다 (추정 토큰)
+    CHAT_HISTORY_MAX_TOKENS: int = 2000
+    CHAT_HISTORY_KEEP_TOKENS: int = 1000
+
+    # 체인 입력 토큰 예산(오프라인 추정). 넘으면 우선순위 낮은 필드부터 줄이고, 필수 필드만으로 넘치면 413. 0 이면 제한 없음
+    LLM_SUMMARY_MAX_INPUT_TOKENS: int = 8000
+    LLM_CHAT_MAX_INPUT_TOKENS: int = 6000
+
+    # LLM 호출 admission control. 0 이면 해당 제한 없음
+    LLM_MAX_CONCURRENCY: int = 32  # 프로세스 전체 동시 체인 호출 수
+    LLM_MAX_WAITING: int = 128  # 자리 대기열 길이 (가득 차면 즉시 429)
+    LLM_RATE_PER_SECOND: float = 0
+    LLM_RATE_BURST: int = 0
+    # 호출자별. 기본은 인증 사용자에게만 적용하고, 익명(IP) 호출자는 프록시 뒤에서 신뢰 프록시의
+    # X-Forwarded-For 를 클라이언트 주소로 쓰도록 설정한 뒤에만 LLM_USER_LIMIT_ANONYMOUS 로 켠다 (README 참고).
+    LLM_USER_MAX_CONCURRENCY: int = 4
+    LLM_USER_MAX_WAITING: int = 8
+    LLM_USER_RATE_PER_SECOND: float = 0
+    LLM_USER_RATE_BURST: int = 0
+    LLM_USER_LIMIT_ANONYMOUS: bool = False
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 10
+
+    # LLM 호출 복원력: 호출 기한(재시도 포함, 0 이면 없음), 일시적 오류 재시도, p95 초과 시 헤지, 서킷 브레이커
+    LLM_CALL_TIMEOUT_SECONDS: float = 30
+    LLM_RETRY_ATTEMPTS: int = 2
+    LLM_RETRY_BACKOFF_SECONDS: float = 0.2
+    LLM_RETRY_BACKOFF_MAX_SECONDS: float = 2.0
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    # 동기 경로(리포트 워커)의 기한·헤지용 스레드풀 크기. 0 이면 REPORT_QUEUE_WORKERS × REPORT_CHUNK_MAX_CONCURRENCY
+    # × (헤지면 2) × 2 (기한이 지나 버려졌지만 아직 도는 시도 몫)
+    LLM_CALL_EXECUTOR_WORKERS: int = 0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5  # 연속 실패 수 (0 이면 브레이커 끔)
+    LLM_BREAKER_RESET_SECONDS: float = 30
+    LLM_FALLBACK_ENABLED: bool = True  # 브레이커 열림/기한 초과 시 요약을 키워드 결과로 대체
+
+    # 요청 deadline (초). X-Request-Timeout 헤더로 줄일 수 있고 REQUEST_MAX_TIMEOUT_SECONDS 를 넘지 않는다. 0 이면 없음
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 60  # /summary, /chat*, /conversations/*/messages*
+    LLM_BATCH_REQUEST_TIMEOUT_SECONDS: float = 120  # /summary:batch
+    REPORT_DEADLINE_SECONDS: float = 600  # 리포트 요청부터 생성 완료까지 (큐 대기 포함)
+    REQUEST_MAX_TIMEOUT_SECONDS: float = 900
+
+    # LLM 결과 캐시: "none" | "memory" | "sqlite" | "redis" (sqlite/redis 는 memory 를 L1 으로 사용)
+    LLM_CACHE_BACKEND: str = "memory"
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    LLM_CACHE_SHARED_MAX_ENTRIES: int = 10000
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_SQLITE_PATH: str = "./app/data/llm_cache.db"
+
+    # 감정/결정/액션 키워드 표 JSON ({카테고리: {라벨: [키워드]}}). 비우면 내장 기본값 사용
+    KEYWORD_TABLES_PATH: str | None = None
 
 
     JWT_SECRET_KEY: str = "change-me"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # 검증된 토큰 claims / 인증 사용자 캐시 (워커 프로세스 단위)
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # 비밀번호 해싱: 반복 횟수를 바꾸면 기존 해시는 다음 로그인 때 새 정책으로 재해싱된다.
+    PASSWORD_HASH_ITERATIONS: int = 390000
+    PASSWORD_HASH_WORKERS: int = 2  # 0 이면 요청 스레드에서 직접 계산
+    PASSWORD_HASH_MAX_PENDING: int = 16
+
+    # 리포트 생성 큐: "local"(프로세스 내 워커 스레드) | "rq"(Redis + RQ 워커)
+    REPORT_QUEUE_BACKEND: str = "local"
+    REPORT_QUEUE_WORKERS: int = 2
+    REPORT_QUEUE_MAX_SIZE: int = 100
+    REPORT_JOB_TIMEOUT_SECONDS: int = 300
+    # 세션 기록이 이 토큰 수(추정)를 넘으면 청크로 나눠 병렬 요약 후 합친다 (map-reduce)
+    REPORT_CHUNK_MAX_TOKENS: int = 3000
+    REPORT_CHUNK_MAX_CONCURRENCY: int = 4
+    # 세션별 누적 요약 + 마지막 메시지 watermark 를 저장해 재생성 시 새 메시지만 요약
+    REPORT_INCREMENTAL_ENABLED: bool = True
+    # 같은 세션(+ contentVersion)의 진행 중 리포트 요청은 하나로 합친다. 이보다 오래된 진행 중(pending/running) 행은 버리고 새로 만든다.
+    REPORT_COALESCE_ENABLED: bool = True
+    REPORT_COALESCE_STALE_SECONDS: int = 900
+    REDIS_URL: str = "redis://localhost:6379/0"
+    # 완료된 리포트 응답의 Cache-Control max-age (CDN/브라우저 캐시)
+    REPORT_CACHE_MAX_AGE_SECONDS: int = 300
+    # 완료 리포트 본문 저장 형식: "none"(텍스트) | "gzip" | "zstd"(zstandard 설치 시)
+    REPORT_STORAGE_COMPRESSION: str = "none"
+    # GET /reports/export · worker.export_reports 가 DB 에서 한 번에 가져오는 행 수 (= 체크포인트 간격)
+    REPORT_EXPORT_BATCH_SIZE: int = 1000
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
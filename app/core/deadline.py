@@ -0,0 +1,80 @@
+"""
+요청 deadline 과 클라이언트 연결 끊김 시 취소.
+
+deadline 은 절대 시각(time.time() 기준 초)이라 리포트와 함께 저장해 다른 스레드/프로세스의 워커가 확인할 수 있다.
+라우트별 기본값은 X-Request-Timeout: <초> 헤더로 바꿀 수 있다 (REQUEST_MAX_TIMEOUT_SECONDS 를 넘길 수는 없음).
+
+async 라우트는 LLM 작업을 run_with_deadline 으로 기다린다. deadline 이 지나거나 클라이언트가 연결을 끊으면
+작업을 취소하므로, limiter 자리와 provider 할당량이 아직 성공할 수 있는 요청에 돌아간다.
+"""
+import asyncio
+import time
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEADLINE_HEADER = "X-Request-Timeout"
+
+
+class RequestDeadlineExceeded(Exception):
+    """작업이 끝나기 전에 요청 deadline 이 지났을 때. 라우트에서 504 로 응답한다."""
+
+    def __init__(self, message: str = "Request deadline exceeded"):
+        super().__init__(message)
+
+
+class ClientDisconnected(Exception):
+    """요청을 처리하는 동안 클라이언트가 연결을 끊었을 때."""
+
+
+def deadline_after(seconds: Optional[float]) -> Optional[float]:
+    """지금부터 seconds 뒤의 절대 deadline. None 이나 0 이하이면 deadline 없음(None)."""
+    if seconds is None or seconds <= 0:
+        return None
+    return time.time() + seconds
+
+
+def remaining(deadline: Optional[float]) -> Optional[float]:
+    """deadline 까지 남은 초 (음수 없음). deadline 이 없으면 None."""
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.time())
+
+
+def check_deadline(deadline: Optional[float]) -> None:
+    if deadline is not None and time.time() >= deadline:
+        raise RequestDeadlineExceeded()
+
+
+async def _wait_for_disconnect(receive) -> None:
+    # 라우트가 실행될 때는 요청 본문을 이미 다 읽었으므로 다음 메시지는 연결 끊김뿐이다.
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def run_with_deadline(awaitable: Awaitable[T], deadline: Optional[float], receive=None) -> T:
+    """
+    awaitable 을 기다린다. deadline 이 지나면 취소하고 RequestDeadlineExceeded,
+    receive(ASGI receive 채널, 예: request.receive)가 연결 끊김을 알리면 취소하고 ClientDisconnected.
+    취소한 작업은 끝까지 기다려 정리(limiter 자리 반환)가 먼저 끝나게 한다.
+    """
+    task = asyncio.ensure_future(awaitable)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(receive)) if receive is not None else None
+    waiting = {task} if watcher is None else {task, watcher}
+    try:
+        done, _ = await asyncio.wait(waiting, timeout=remaining(deadline), return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        done = set()
+        raise
+    finally:
+        for pending in waiting - done:
+            pending.cancel()
+        if task not in done:
+            await asyncio.gather(task, return_exceptions=True)
+    if task in done:
+        return task.result()
+    if watcher is not None and watcher in done:
+        raise ClientDisconnected("Client closed the connection")
+    raise RequestDeadlineExceeded()
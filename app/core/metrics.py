@@ -0,0 +1,336 @@
+"""
+프로세스 내 메트릭 + Prometheus 텍스트 노출 형식(0.0.4).
+
+기록은 dict 조회 한 번, bisect 한 번, 시리즈별 락 안의 증가 두 번이라 요청/LLM 핫패스에 둬도 된다.
+다른 곳에 이미 있는 값(LLM 캐시 통계, DB 풀 통계)은 호출마다 복사하지 않고 스크레이프 때 collector 가 읽는다.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+TOKEN_BUCKETS = (32, 128, 512, 1024, 2048, 4096, 8192, 16384, 32768, 131072)
+RATIO_BUCKETS = (0.25, 0.5, 0.75, 0.9, 1.0, 1.1, 1.25, 1.5, 2.0, 4.0)
+
+LabelValues = Tuple[str, ...]
+# 메트릭 하나의 (라벨, 값) 샘플. 스크레이프 때 만든다
+Samples = Iterable[Tuple[Dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_histogram(
+    name: str,
+    labels: Dict[str, str],
+    bounds: Sequence[float],
+    counts: Sequence[int],
+    total: float,
+) -> List[str]:
+    """히스토그램 시리즈 하나의 노출 줄. counts 는 버킷별 개수(누적 아님)이고 마지막이 +Inf."""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(list(bounds) + [float("inf")], counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+    lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return lines
+
+
+class _HistogramSeries:
+    __slots__ = ("_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class _Timer:
+    """경과 시간을 기록하는 컨텍스트 매니저 (@contextmanager 보다 일반 클래스가 ~3배 싸다)."""
+
+    __slots__ = ("_series", "_started")
+
+    def __init__(self, series: _HistogramSeries):
+        self._series = series
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._series.observe(time.perf_counter() - self._started)
+
+
+class _CounterSeries:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def value(self) -> float:
+        return self._value
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_series(self):
+        """라벨 값 조합 하나의 시리즈 객체를 만든다."""
+
+    def labels(self, *values: str):
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    def _items(self) -> List[Tuple[Dict[str, str], object]]:
+        with self._lock:
+            items = list(self._series.items())
+        return [(dict(zip(self.labelnames, values)), series) for values, series in sorted(items)]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """이 메트릭의 노출 줄 (HELP/TYPE 헤더 포함)."""
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self) -> _HistogramSeries:
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        self.labels(*labelvalues).observe(value)
+
+    def time(self, *labelvalues: str):
+        return self.labels(*labelvalues).time()
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for labels, series in self._items():
+            counts, total = series.snapshot()
+            lines.extend(format_histogram(self.name, labels, self.buckets, counts, total))
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_series(self) -> _CounterSeries:
+        return _CounterSeries()
+
+    def inc(self, amount: float = 1, *labelvalues: str) -> None:
+        self.labels(*labelvalues).inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for labels, series in self._items():
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(series.value())}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        """collector() 는 노출 줄을 반환하며, 스크레이프마다 호출된다."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics, collectors = list(self._metrics), list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def gauge_lines(name: str, documentation: str, samples: Samples, kind: str = "gauge") -> List[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return lines
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response body is fully sent.",
+    ("method", "route", "status"),
+)
+PIPELINE_STAGE_SECONDS = REGISTRY.histogram(
+    "pipeline_stage_duration_seconds",
+    "Time spent per pipeline stage (fetch, llm, parse, extract, render, persist).",
+    ("stage",),
+)
+LLM_PROMPT_CHARS = REGISTRY.histogram(
+    "llm_prompt_chars",
+    "Characters sent to an LLM chain per call.",
+    ("chain",),
+    SIZE_BUCKETS,
+)
+LLM_RESPONSE_CHARS = REGISTRY.histogram(
+    "llm_response_chars",
+    "Characters returned by an LLM chain per call.",
+    ("chain",),
+    SIZE_BUCKETS,
+)
+LLM_PROMPT_TOKENS = REGISTRY.histogram(
+    "llm_prompt_tokens",
+    "Prompt tokens per LLM call: offline estimate of the chain inputs vs. the model's reported usage.",
+    ("chain", "source"),
+    TOKEN_BUCKETS,
+)
+LLM_TOKEN_ESTIMATE_RATIO = REGISTRY.histogram(
+    "llm_prompt_token_estimate_ratio",
+    "Actual / estimated prompt tokens per LLM call (only when the model reports usage).",
+    ("chain",),
+    RATIO_BUCKETS,
+)
+
+
+def stage_timer(stage: str):
+    """`with stage_timer("llm"): ...` 로 pipeline_stage_duration_seconds 에 기록한다."""
+    return PIPELINE_STAGE_SECONDS.time(stage)
+
+
+def observe_llm_call(chain: str, inputs: Dict[str, object], response: Optional[object]) -> None:
+    LLM_PROMPT_CHARS.observe(sum(len(str(v)) for v in inputs.values()), chain)
+    if response is not None:
+        LLM_RESPONSE_CHARS.observe(len(str(response)), chain)
+
+
+def observe_prompt_tokens(chain: str, estimated: int, actual: Optional[int]) -> None:
+    LLM_PROMPT_TOKENS.observe(estimated, chain, "estimated")
+    if actual:
+        LLM_PROMPT_TOKENS.observe(actual, chain, "actual")
+        if estimated:
+            LLM_TOKEN_ESTIMATE_RATIO.observe(actual / estimated, chain)
+
+
+class MetricsMiddleware:
+    """
+    요청 지연을 매칭된 라우트 템플릿 라벨로 기록하는 순수 ASGI 미들웨어 (BaseHTTPMiddleware 버퍼링 없음).
+    경로 파라미터 대신 템플릿을 쓰므로 라벨 카디널리티가 늘지 않는다.
+    스트리밍 응답은 마지막 본문 청크까지의 시간을 잰다.
+    """
+
+    def __init__(self, app, excluded_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = frozenset(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        recorded = False
+
+        def record() -> None:
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                scope.get("method", ""),
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            record()
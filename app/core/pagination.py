@@ -0,0 +1,22 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """keyset 값을 클라이언트가 해석할 필요 없는 URL-safe 커서 문자열로 인코딩한다."""
+    payload = {k: v.isoformat() if isinstance(v, datetime) else v for k, v in values.items()}
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid pagination cursor")
+    return payload
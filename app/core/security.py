@@ -1,19 +1,28 @@
+import asyncio
 import base64
 import hashlib
 import hmac
+import multiprocessing
 import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Tuple, Union
+from functools import lru_cache
+from typing import Optional, Tuple, Union
 
 from jose import JWTError, jwt
 
+from app.core.config import get_settings
 from app.schemas.token import TokenPayload
 
 ALGORITHM = "pbkdf2_sha256"
-ITERATIONS = 390000
 SALT_SIZE = 16
 
 
+class PasswordHashingBusy(RuntimeError):
+    """해싱 풀 대기열이 가득 찼을 때. 라우트에서 503 + Retry-After 로 응답한다."""
+
+
 def _b64encode(value: bytes) -> str:
     return base64.b64encode(value).decode("ascii")
 
@@ -27,36 +36,134 @@ def _split_hash(stored_hash: str) -> Tuple[str, int, bytes, bytes]:
     return algo, int(iter_str), _b64decode(salt_b64), _b64decode(hash_b64)
 
 
+def _pbkdf2(plain_password: str, salt: bytes, iterations: int) -> bytes:
+    # 프로세스 풀에서 실행되므로 모듈 최상위 함수여야 한다 (pickle 가능).
+    return hashlib.pbkdf2_hmac("sha256", plain_password.encode("utf-8"), salt, iterations)
+
+
+class PasswordHasherPool:
+    """
+    PBKDF2 계산을 별도 프로세스 풀에서 수행해 요청 스레드와 GIL 을 점유하지 않게 한다.
+    실행 중 + 대기 중 작업 수가 max_pending 을 넘으면 즉시 PasswordHashingBusy 를 던진다.
+    workers=0 이면 호출 스레드에서 직접 계산한다.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = max(0, workers)
+        self.max_pending = max(1, max_pending)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def submit(self, plain_password: str, salt: bytes, iterations: int) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusy("Password hashing is saturated, try again shortly")
+        try:
+            if self.workers == 0:
+                future: Future = Future()
+                future.set_result(_pbkdf2(plain_password, salt, iterations))
+            else:
+                future = self._get_executor().submit(_pbkdf2, plain_password, salt, iterations)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def derive(self, plain_password: str, salt: bytes, iterations: int) -> bytes:
+        """결과가 나올 때까지 호출 스레드를 막는다. 요청 경로에서는 aderive 를 쓴다."""
+        return self.submit(plain_password, salt, iterations).result()
+
+    async def aderive(self, plain_password: str, salt: bytes, iterations: int) -> bytes:
+        return await asyncio.wrap_future(self.submit(plain_password, salt, iterations))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasherPool:
+    settings = get_settings()
+    return PasswordHasherPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+
+def current_iterations() -> int:
+    return get_settings().PASSWORD_HASH_ITERATIONS
+
+
+def _format_hash(iterations: int, salt: bytes, dk: bytes) -> str:
+    return f"{ALGORITHM}${iterations}${_b64encode(salt)}${_b64encode(dk)}"
+
+
 def hash_password(plain_password: str) -> str:
+    """
+    동기 버전 — 스크립트·벤치마크·sync 워커 전용. 해싱이 끝날 때까지 호출 스레드를 막으므로
+    요청 경로(라우트/의존성)에서는 ahash_password 를 쓴다.
+    """
     if not plain_password:
         raise ValueError("Password must not be empty")
     salt = os.urandom(SALT_SIZE)
-    dk = hashlib.pbkdf2_hmac(
-        "sha256",
-        plain_password.encode("utf-8"),
-        salt,
-        ITERATIONS,
-    )
-    return f"{ALGORITHM}${ITERATIONS}${_b64encode(salt)}${_b64encode(dk)}"
+    iterations = current_iterations()
+    dk = get_password_hasher().derive(plain_password, salt, iterations)
+    return _format_hash(iterations, salt, dk)
+
+
+async def ahash_password(plain_password: str) -> str:
+    if not plain_password:
+        raise ValueError("Password must not be empty")
+    salt = os.urandom(SALT_SIZE)
+    iterations = current_iterations()
+    dk = await get_password_hasher().aderive(plain_password, salt, iterations)
+    return _format_hash(iterations, salt, dk)
 
 
 def verify_password(plain_password: str, stored_hash: str) -> bool:
-    """Verify a password against the stored hash."""
+    """
+    평문 비밀번호가 저장된 해시와 일치하는지 확인한다. 해시 형식이 깨졌거나 알고리즘이 다르면 False.
+    동기 버전 — 스크립트·벤치마크·sync 워커 전용. 요청 경로에서는 averify_password 를 쓴다.
+    """
+    try:
+        algo, iterations, salt, hash_bytes = _split_hash(stored_hash)
+    except ValueError:
+        return False
+    if algo != ALGORITHM:
+        return False
+    computed = get_password_hasher().derive(plain_password, salt, iterations)
+    return hmac.compare_digest(computed, hash_bytes)
+
+
+async def averify_password(plain_password: str, stored_hash: str) -> bool:
     try:
         algo, iterations, salt, hash_bytes = _split_hash(stored_hash)
     except ValueError:
         return False
     if algo != ALGORITHM:
         return False
-    computed = hashlib.pbkdf2_hmac(
-        "sha256",
-        plain_password.encode("utf-8"),
-        salt,
-        iterations,
-    )
+    computed = await get_password_hasher().aderive(plain_password, salt, iterations)
     return hmac.compare_digest(computed, hash_bytes)
 
 
+def needs_rehash(stored_hash: str) -> bool:
+    """저장된 해시의 알고리즘/반복 횟수가 현재 정책과 다르면 True (로그인 성공 시 재해싱)."""
+    try:
+        algo, iterations, _, _ = _split_hash(stored_hash)
+    except ValueError:
+        return True
+    return algo != ALGORITHM or iterations != current_iterations()
+
+
 def create_access_token(
     subject: Union[str, int],
     *,
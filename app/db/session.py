@@ -1,17 +1,183 @@
-from collections.abc import Generator
+import threading
+import time
+from collections.abc import AsyncGenerator, Generator
+from functools import lru_cache
+from typing import Dict, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 
 settings = get_settings()
 
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args["check_same_thread"] = False
+# 체크아웃 대기 시간 히스토그램 버킷 (초)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+
+class PoolMetrics:
+    """커넥션 풀 체크아웃 대기 시간 / 사용 중 커넥션 수 집계."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets = [0] * (len(POOL_WAIT_BUCKETS) + 1)
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            for i, bound in enumerate(POOL_WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_buckets": dict(
+                    zip([str(b) for b in POOL_WAIT_BUCKETS] + ["+Inf"], self.wait_buckets)
+                ),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool + 체크아웃 대기 시간 측정."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            self.metrics.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - started)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool + 체크아웃 대기 시간 측정 (AsyncEngine 용)."""
+
+
+# 백엔드별 기본 async 드라이버
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+ASYNC_DRIVER_NAMES = {"aiosqlite", "asyncpg", "aiomysql", "asyncmy", "psycopg"}
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and (url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url)
+
+
+def _apply_sqlite_pragmas(engine: Engine, cfg: Settings) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        try:
+            # WAL: 쓰기 중에도 읽기가 막히지 않는다. NORMAL 은 WAL 에서 안전한 fsync 수준.
+            if cfg.SQLITE_JOURNAL_MODE:
+                cursor.execute(f"PRAGMA journal_mode={cfg.SQLITE_JOURNAL_MODE}")
+            if cfg.SQLITE_SYNCHRONOUS:
+                cursor.execute(f"PRAGMA synchronous={cfg.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA busy_timeout={int(cfg.SQLITE_BUSY_TIMEOUT_MS)}")
+        finally:
+            cursor.close()
+
+
+def _pool_kwargs(url: str, cfg: Settings, poolclass: type) -> Dict[str, object]:
+    if _is_sqlite_memory(url):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": cfg.DB_POOL_SIZE,
+        "max_overflow": cfg.DB_MAX_OVERFLOW,
+        "pool_timeout": cfg.DB_POOL_TIMEOUT,
+        "pool_recycle": cfg.DB_POOL_RECYCLE,
+        "pool_pre_ping": cfg.DB_POOL_PRE_PING,
+    }
+
+
+def build_engine(url: str, cfg: Settings, metrics: Optional[PoolMetrics] = None) -> Engine:
+    connect_args = {}
+    if _is_sqlite(url):
+        connect_args["check_same_thread"] = False
+    eng = create_engine(url, connect_args=connect_args, **_pool_kwargs(url, cfg, InstrumentedQueuePool))
+    if isinstance(eng.pool, InstrumentedQueuePool):
+        eng.pool.metrics = metrics or PoolMetrics()
+    if _is_sqlite(url) and not _is_sqlite_memory(url):
+        _apply_sqlite_pragmas(eng, cfg)
+    return eng
+
+
+def async_database_url(url: str) -> str:
+    """동기 드라이버 URL 을 같은 DB 의 async 드라이버 URL 로 바꾼다. 이미 async 드라이버면 그대로."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or ("+" in parsed.drivername and parsed.get_driver_name() in ASYNC_DRIVER_NAMES):
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def build_async_engine(url: str, cfg: Settings, metrics: Optional[PoolMetrics] = None) -> AsyncEngine:
+    """build_engine 과 같은 풀 설정/SQLite PRAGMA 를 적용한 AsyncEngine."""
+    eng = create_async_engine(url, **_pool_kwargs(url, cfg, InstrumentedAsyncQueuePool))
+    if isinstance(eng.sync_engine.pool, InstrumentedQueuePool):
+        eng.sync_engine.pool.metrics = metrics or PoolMetrics()
+    if _is_sqlite(url) and not _is_sqlite_memory(url):
+        _apply_sqlite_pragmas(eng.sync_engine, cfg)
+    return eng
+
+
+def pool_stats(eng: Optional[Engine] = None) -> Dict[str, object]:
+    """풀 크기/사용 중 커넥션 수와 체크아웃 대기 시간 통계."""
+    pool = (eng or engine).pool
+    stats: Dict[str, object] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
+
+
+engine = build_engine(settings.DATABASE_URL, settings)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -22,3 +188,32 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+# async 경로: 드라이버(aiosqlite 등)를 처음 쓸 때 만든다. 워커/스크립트는 동기 엔진만 사용.
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    return build_async_engine(async_database_url(settings.ASYNC_DATABASE_URL or settings.DATABASE_URL), settings)
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    # commit 후 속성 접근이 암묵적 I/O(lazy refresh)가 되지 않도록 expire_on_commit=False
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def async_pool_stats() -> Optional[Dict[str, object]]:
+    """async 엔진이 아직 만들어지지 않았으면 None."""
+    if get_async_engine.cache_info().currsize == 0:
+        return None
+    return pool_stats(get_async_engine().sync_engine)
+
+
+async def dispose_async_engine() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
@@ -1,22 +1,66 @@
 from fastapi import FastAPI
 
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.reflections import router as reflections_router
 from app.api.routes.report_write_routes import router as report_write_router
 from app.api.routes.report_read_routes import router as report_read_router
 
-from app.db.session import engine
-from app.startup.ensure_schema import ensure_reports_failure_reason_column
+from app.core.config import get_settings
+from app.core.metrics import MetricsMiddleware
+from app.core.security import get_password_hasher
+from app.db.session import async_pool_stats, dispose_async_engine, engine, pool_stats
+from app.services.langchain import get_shared_langchain_service
+from app.services.report_queue import get_report_queue
+from app.startup.ensure_schema import (
+    ensure_conversation_tables,
+    ensure_report_session_states_table,
+    ensure_reports_body_columns,
+    ensure_reports_deadline_column,
+    ensure_reports_dedupe_key,
+    ensure_reports_failure_reason_column,
+    ensure_reports_indexes,
+    ensure_reports_started_at_column,
+)
 
 app = FastAPI(title="Reflection Reports API", version="1.0.0")
 
 app.include_router(reflections_router, prefix="/api/reflections", tags=["reflections"])
 app.include_router(report_write_router, prefix="/api/reflections", tags=["reports"])
 app.include_router(report_read_router, prefix="/api/reflections", tags=["reports"])
+app.include_router(metrics_router)
+app.add_middleware(MetricsMiddleware)
 
 @app.on_event("startup")
 def _startup():
     ensure_reports_failure_reason_column(engine)
+    ensure_reports_indexes(engine)
+    ensure_reports_body_columns(engine)
+    ensure_reports_dedupe_key(engine)
+    ensure_reports_deadline_column(engine)
+    ensure_reports_started_at_column(engine)
+    ensure_report_session_states_table(engine)
+    ensure_conversation_tables(engine)
+    service = get_shared_langchain_service()
+    if get_settings().LLM_WARMUP_ON_STARTUP:
+        service.warm_up()
+    get_report_queue().start()
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    get_report_queue().stop()
+    get_password_hasher().shutdown()
+    await dispose_async_engine()
 
 @app.get("/health")
 def health():
     return {"ok": True}
+
+
+@app.get("/health/db-pool")
+def health_db_pool():
+    stats = pool_stats()
+    async_stats = async_pool_stats()
+    if async_stats is not None:
+        stats["async"] = async_stats
+    return stats
@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from app.db.session import Base
+
+
+class Conversation(Base):
+    """
+    서버 측 시뮬레이션 대화. 회고/페르소나 정보(context_json)는 생성 시 한 번만 받고,
+    오래된 턴은 summary 에 접어 넣은 뒤 conversation_turns 에서 지운다.
+    summarized_until 은 summary 에 반영된 마지막 턴 id (그 이후 턴만 원문으로 남아 있음).
+    """
+
+    __tablename__ = "conversations"
+
+    id = Column(String(32), primary_key=True)
+    owner = Column(String, nullable=True)  # 생성한 호출자 키 (user:<id> / ip:<주소>)
+    context_json = Column(Text, nullable=False)
+    summary = Column(Text, nullable=True)
+    summarized_until = Column(Integer, nullable=False, default=0)
+    turn_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ConversationTurn(Base):
+    __tablename__ = "conversation_turns"
+    __table_args__ = (Index("ix_conversation_turns_conversation_id_id", "conversation_id", "id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    conversation_id = Column(String(32), nullable=False)
+    sender = Column(String(8), nullable=False)  # user | ai
+    text = Column(Text, nullable=False)
+    tokens = Column(Integer, nullable=False)  # 추정 토큰 수 (app.services.tokens)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
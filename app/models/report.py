@@ -1,21 +1,54 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, LargeBinary
 from app.db.session import Base
 
 
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        # GET /reports keyset 페이지네이션 (필터 + created_at 정렬)
+        Index("ix_reports_session_id_created_at", "session_id", "created_at"),
+        Index("ix_reports_requestor_created_at", "requestor", "created_at"),
+        # 진행 중(pending/running) 생성의 single-flight 클레임. 완료/실패 시 NULL 로 풀린다 (NULL 은 중복 허용)
+        Index("ux_reports_dedupe_key", "dedupe_key", unique=True),
+    )
 
     report_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     session_id = Column(String, index=True, nullable=False)
     requestor = Column(String, nullable=True)
+    dedupe_key = Column(String(64), nullable=True)
 
-    status = Column(String, default="pending", nullable=False)  # pending | finished | failed
+    status = Column(String, default="pending", nullable=False)  # pending | running | finished | failed
     report_md = Column(Text, nullable=True)
     report_json = Column(Text, nullable=True)
 
+    # 압축 저장 모드: 미리 렌더링·압축한 응답 문서. body_encoding 이 NULL 이면 위 텍스트 컬럼 사용
+    body_encoding = Column(String, nullable=True)  # gzip | zstd
+    report_md_body = Column(LargeBinary, nullable=True)
+    report_json_body = Column(LargeBinary, nullable=True)
+
     failure_reason = Column(Text, nullable=True)
+    # 이 시각(UTC)까지 생성을 끝내지 못하면 워커가 취소하고 failed 로 남긴다 (X-Request-Timeout / REPORT_DEADLINE_SECONDS)
+    deadline_at = Column(DateTime, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # 워커가 pending → running 으로 클레임한 시각. 오래된 running 행(워커 중단)은 다시 클레임할 수 있다
+    started_at = Column(DateTime, nullable=True)
     processed_at = Column(DateTime, nullable=True)
 
+
+
+class ReportSessionState(Base):
+    """
+    세션별 증분 리포트 상태. 마지막으로 요약에 반영한 메시지 id(watermark)와 그때까지의 누적 요약.
+    리포트 재생성 시 watermark 이후 메시지만 요약해 summary_json 에 합친다.
+    """
+
+    __tablename__ = "report_session_states"
+
+    session_id = Column(String, primary_key=True)
+    watermark = Column(Integer, nullable=False)
+    summary_json = Column(Text, nullable=False)  # LangChainService.summarize_transcript 반환값
+    prompt_version = Column(String, nullable=False)  # 다르면 처음부터 다시 요약
+    message_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
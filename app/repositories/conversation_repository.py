@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.conversation import Conversation, ConversationTurn
+from app.services.tokens import estimate_tokens
+
+
+class AsyncConversationRepository:
+    """서버 측 시뮬레이션 대화 데이터 접근 계층 (AsyncSession)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, context: dict, owner: Optional[str] = None) -> Conversation:
+        now = datetime.utcnow()
+        conversation = Conversation(
+            id=uuid.uuid4().hex,
+            owner=owner,
+            context_json=json.dumps(context, ensure_ascii=False),
+            summarized_until=0,
+            turn_count=0,
+            created_at=now,
+            updated_at=now,
+        )
+        self.session.add(conversation)
+        await self.session.commit()
+        return conversation
+
+    async def get(self, conversation_id: str) -> Optional[Conversation]:
+        return await self.session.get(Conversation, conversation_id)
+
+    async def unsummarized_turns(self, conversation: Conversation) -> List[ConversationTurn]:
+        """summary 에 아직 접히지 않은 턴 (오래된 순)."""
+        result = await self.session.execute(
+            select(ConversationTurn)
+            .where(
+                ConversationTurn.conversation_id == conversation.id,
+                ConversationTurn.id > conversation.summarized_until,
+            )
+            .order_by(ConversationTurn.id)
+        )
+        return list(result.scalars())
+
+    async def append_turns(self, conversation_id: str, turns: Sequence[Tuple[str, str]]) -> None:
+        """(sender, text) 턴들을 덧붙인다. 턴은 행 단위 INSERT 라 동시 요청끼리 덮어쓰지 않는다."""
+        now = datetime.utcnow()
+        self.session.add_all(
+            ConversationTurn(
+                conversation_id=conversation_id,
+                sender=sender,
+                text=text,
+                tokens=estimate_tokens(text),
+                created_at=now,
+            )
+            for sender, text in turns
+        )
+        await self.session.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(turn_count=Conversation.turn_count + len(turns), updated_at=now)
+        )
+        await self.session.commit()
+
+    async def fold(self, conversation_id: str, expected_until: int, new_until: int, summary: str) -> bool:
+        """
+        summary 를 갱신하고 new_until 까지의 턴을 지운다.
+        summarized_until 이 expected_until 일 때만 적용하는 compare-and-set 이라,
+        다른 워커가 먼저 접었으면 False 를 반환하고 아무것도 바꾸지 않는다.
+        """
+        result = await self.session.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id, Conversation.summarized_until == expected_until)
+            .values(summary=summary, summarized_until=new_until, updated_at=datetime.utcnow())
+        )
+        if result.rowcount != 1:
+            await self.session.rollback()
+            return False
+        await self.session.execute(
+            delete(ConversationTurn).where(
+                ConversationTurn.conversation_id == conversation_id,
+                ConversationTurn.id <= new_until,
+            )
+        )
+        await self.session.commit()
+        return True
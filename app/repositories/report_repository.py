@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from sqlalchemy import Select, and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, defer, load_only
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.report import Report
+
+# 목록 조회에서는 본문(report_md/report_json)을 읽지 않는다.
+LIST_COLUMNS = (
+    Report.report_id,
+    Report.session_id,
+    Report.requestor,
+    Report.status,
+    Report.failure_reason,
+    Report.created_at,
+    Report.processed_at,
+    Report.body_encoding,
+)
+
+
+def _page_statement(
+    session_id: Optional[str],
+    requestor: Optional[str],
+    status: Optional[str],
+    cursor: Optional[str],
+    limit: int,
+) -> Select:
+    """
+    최신순 keyset 페이지네이션. (created_at, report_id) 내림차순이며,
+    커서는 직전 페이지 마지막 행의 정렬 키이므로 페이지 깊이와 무관하게 인덱스 범위 조회로 끝난다.
+    커서 형식이 잘못되면 ValueError.
+    """
+    statement = select(Report).options(load_only(*LIST_COLUMNS))
+    if session_id is not None:
+        statement = statement.where(Report.session_id == session_id)
+    if requestor is not None:
+        statement = statement.where(Report.requestor == requestor)
+    if status is not None:
+        statement = statement.where(Report.status == status)
+
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            created_at = datetime.fromisoformat(values["created_at"])
+            report_id = int(values["report_id"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError("Invalid pagination cursor") from exc
+        statement = statement.where(
+            or_(
+                Report.created_at < created_at,
+                and_(Report.created_at == created_at, Report.report_id < report_id),
+            )
+        )
+    return statement.order_by(Report.created_at.desc(), Report.report_id.desc()).limit(limit + 1)
+
+
+def _split_page(rows: List[Report], limit: int) -> Tuple[List[Report], Optional[str]]:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor({"created_at": last.created_at, "report_id": last.report_id})
+    return rows, None
+
+
+# 내보내기(NDJSON)는 json 응답 문서만 만들므로 Markdown 본문은 읽지 않는다.
+EXPORT_UNUSED_COLUMNS = (Report.report_md, Report.report_md_body, Report.dedupe_key, Report.deadline_at)
+
+
+def _export_statement(
+    since: Optional[datetime],
+    until: Optional[datetime],
+    status: Optional[str],
+    session_id: Optional[str],
+    after: Optional[int],
+    batch_size: int,
+) -> Select:
+    """
+    report_id 오름차순 전체 조회. 기본 키 순서라 정렬 없이 인덱스 범위로 읽고, after(마지막으로 받은 report_id)
+    부터 이어 받을 수 있다. yield_per 로 batch_size 행씩 (서버 측 커서가 있는 드라이버는 커서로) 가져온다.
+    since 이상, until 미만의 created_at (naive UTC) 으로 거른다.
+    """
+    statement = select(Report).options(*(defer(column) for column in EXPORT_UNUSED_COLUMNS))
+    if since is not None:
+        statement = statement.where(Report.created_at >= since)
+    if until is not None:
+        statement = statement.where(Report.created_at < until)
+    if status is not None:
+        statement = statement.where(Report.status == status)
+    if session_id is not None:
+        statement = statement.where(Report.session_id == session_id)
+    if after is not None:
+        statement = statement.where(Report.report_id > after)
+    return statement.order_by(Report.report_id).execution_options(yield_per=max(1, batch_size))
+
+
+def _get_statement(report_id: int, unused_columns: Iterable = ()) -> Select:
+    return (
+        select(Report)
+        .options(*(defer(column) for column in unused_columns))
+        .where(Report.report_id == report_id)
+    )
+
+
+# 클레임 경합(다른 요청이 먼저 넣은 행이 커밋 직후 끝나는 경우 등)에서 재시도할 최대 횟수
+CLAIM_ATTEMPTS = 3
+SUPERSEDED_REASON = "Superseded by a newer request"
+
+
+def report_dedupe_key(session_id: str, content_version: Optional[str] = None) -> str:
+    """같은 세션 내용에 대한 리포트 생성을 하나로 묶는 키 (고정 길이 해시)."""
+    raw = json.dumps([str(session_id), content_version or ""], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _pending_report(
+    session_id: str,
+    requestor: Optional[str],
+    dedupe_key: Optional[str] = None,
+    deadline_at: Optional[datetime] = None,
+) -> Report:
+    return Report(
+        session_id=str(session_id),
+        requestor=requestor,
+        dedupe_key=dedupe_key,
+        status="pending",
+        created_at=datetime.utcnow(),
+        deadline_at=deadline_at,
+    )
+
+
+# 생성이 아직 끝나지 않은 상태 (큐 대기 / 워커 처리 중)
+IN_FLIGHT_STATUSES = ("pending", "running")
+
+
+def _in_flight_statement(dedupe_key: str) -> Select:
+    return (
+        select(Report)
+        .options(load_only(*LIST_COLUMNS, Report.deadline_at))
+        .where(Report.dedupe_key == dedupe_key, Report.status.in_(IN_FLIGHT_STATUSES))
+    )
+
+
+def _claimable(stale_before: datetime):
+    """워커가 가져갈 수 있는 행: pending, 또는 stale_before 전에 클레임된 뒤 끝나지 않은 running (워커 중단)."""
+    return or_(
+        Report.status == "pending",
+        and_(Report.status == "running", Report.started_at < stale_before),
+    )
+
+
+def _joinable(existing: Report, stale_before: datetime) -> bool:
+    """진행 중인 생성에 합류할 수 있는지. 너무 오래됐거나 deadline 이 지난 행은 새로 만든다."""
+    if existing.created_at < stale_before:
+        return False
+    return existing.deadline_at is None or existing.deadline_at > datetime.utcnow()
+
+
+def _mark_failed(report: Report, reason: str) -> None:
+    report.status = "failed"
+    report.failure_reason = reason
+    report.processed_at = datetime.utcnow()
+    report.dedupe_key = None
+
+
+class ReportRepository:
+    """Report 엔티티 데이터 접근 계층."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get(self, report_id: int, unused_columns: Iterable = ()) -> Optional[Report]:
+        """unused_columns 로 지정한 (본문) 컬럼은 읽지 않는다."""
+        return self.session.execute(_get_statement(report_id, unused_columns)).scalars().first()
+
+    def create_pending(
+        self,
+        session_id: str,
+        requestor: Optional[str] = None,
+        deadline_at: Optional[datetime] = None,
+    ) -> Report:
+        report = _pending_report(session_id, requestor, deadline_at=deadline_at)
+        self.session.add(report)
+        self.session.commit()
+        self.session.refresh(report)
+        return report
+
+    def claim_pending(
+        self,
+        session_id: str,
+        requestor: Optional[str],
+        dedupe_key: str,
+        stale_before: datetime,
+        deadline_at: Optional[datetime] = None,
+    ) -> Tuple[Report, bool]:
+        """
+        dedupe_key 로 진행 중인 생성이 있으면 그 행을, 없으면 새 pending 행을 반환한다 (행, 합류 여부).
+        유니크 인덱스가 프로세스 간 클레임 역할을 한다. stale_before 보다 오래됐거나 deadline 이 지난 pending/running 행은
+        실패 처리하고 새로 만든다.
+        """
+        for _ in range(CLAIM_ATTEMPTS):
+            existing = self.session.execute(_in_flight_statement(dedupe_key)).scalars().first()
+            if existing is not None:
+                if _joinable(existing, stale_before):
+                    return existing, True
+                self.mark_failed(existing, SUPERSEDED_REASON)
+            report = _pending_report(session_id, requestor, dedupe_key, deadline_at)
+            self.session.add(report)
+            try:
+                self.session.commit()
+            except IntegrityError:
+                self.session.rollback()
+                continue
+            self.session.refresh(report)
+            return report, False
+        return self.create_pending(session_id, requestor, deadline_at), False
+
+    def mark_failed(self, report: Report, reason: str) -> None:
+        _mark_failed(report, reason)
+        self.session.commit()
+
+    def claim_job(self, report_id: int, stale_before: datetime) -> Optional[datetime]:
+        """
+        워커의 작업 클레임. 조건부 UPDATE(pending → running) 한 번이라 여러 프로세스/재시작 후 재큐잉으로
+        같은 id 가 두 번 들어와도 한 워커만 클레임한다.
+        클레임했으면 DB 에 저장된 started_at(클레임 토큰, complete_claimed 에 넘긴다)을, 아니면 None 을 반환한다.
+        """
+        result = self.session.execute(
+            update(Report)
+            .where(Report.report_id == report_id, _claimable(stale_before))
+            .values(status="running", started_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        claimed_at = None
+        if result.rowcount == 1:
+            # DB 가 저장한 값을 다시 읽는다 (DATETIME 정밀도가 마이크로초보다 낮은 DB 대비).
+            claimed_at = self.session.execute(
+                select(Report.started_at).where(Report.report_id == report_id)
+            ).scalar_one()
+        self.session.commit()
+        return claimed_at
+
+    def complete_claimed(self, report_id: int, claimed_at: datetime, values: Mapping[str, object]) -> bool:
+        """
+        claim_job 으로 클레임한 행이 아직 그 클레임 그대로(running, 같은 started_at)일 때만 values 를 쓰고 commit 한다.
+        그 사이 다른 워커가 다시 클레임했거나 claim_pending 이 행을 실패 처리했으면 아무것도 쓰지 않고 False.
+        """
+        result = self.session.execute(
+            update(Report)
+            .where(Report.report_id == report_id, Report.status == "running", Report.started_at == claimed_at)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return result.rowcount == 1
+
+    def claimable_ids(self, stale_before: datetime, limit: int = 1000) -> List[int]:
+        """재시작 시 다시 큐에 넣을 id (pending + 중단된 running)."""
+        statement = (
+            select(Report.report_id)
+            .where(_claimable(stale_before))
+            .order_by(Report.report_id)
+            .limit(limit)
+        )
+        return list(self.session.execute(statement).scalars())
+
+    def list_page(
+        self,
+        *,
+        session_id: Optional[str] = None,
+        requestor: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Tuple[List[Report], Optional[str]]:
+        """최신순 keyset 페이지네이션 (_page_statement 참고). Raises ValueError for a malformed cursor."""
+        statement = _page_statement(session_id, requestor, status, cursor, limit)
+        return _split_page(list(self.session.execute(statement).scalars()), limit)
+
+    def iter_export(
+        self,
+        *,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        status: Optional[str] = None,
+        session_id: Optional[str] = None,
+        after: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Report]:
+        """report_id 순으로 batch_size 행씩 읽어 하나씩 내보낸다 (_export_statement 참고). 메모리는 행 수와 무관하다."""
+        statement = _export_statement(since, until, status, session_id, after, batch_size)
+        yield from self.session.execute(statement).scalars()
+
+
+class AsyncReportRepository:
+    """AsyncSession 용 ReportRepository. async 라우트에서 사용."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, report_id: int, unused_columns: Iterable = ()) -> Optional[Report]:
+        """unused_columns 로 지정한 (본문) 컬럼은 읽지 않는다."""
+        result = await self.session.execute(_get_statement(report_id, unused_columns))
+        return result.scalars().first()
+
+    async def create_pending(
+        self,
+        session_id: str,
+        requestor: Optional[str] = None,
+        deadline_at: Optional[datetime] = None,
+    ) -> Report:
+        report = _pending_report(session_id, requestor, deadline_at=deadline_at)
+        self.session.add(report)
+        await self.session.commit()
+        await self.session.refresh(report)
+        return report
+
+    async def claim_pending(
+        self,
+        session_id: str,
+        requestor: Optional[str],
+        dedupe_key: str,
+        stale_before: datetime,
+        deadline_at: Optional[datetime] = None,
+    ) -> Tuple[Report, bool]:
+        """ReportRepository.claim_pending 의 async 버전."""
+        for _ in range(CLAIM_ATTEMPTS):
+            result = await self.session.execute(_in_flight_statement(dedupe_key))
+            existing = result.scalars().first()
+            if existing is not None:
+                if _joinable(existing, stale_before):
+                    return existing, True
+                await self.mark_failed(existing, SUPERSEDED_REASON)
+            report = _pending_report(session_id, requestor, dedupe_key, deadline_at)
+            self.session.add(report)
+            try:
+                await self.session.commit()
+            except IntegrityError:
+                await self.session.rollback()
+                continue
+            await self.session.refresh(report)
+            return report, False
+        return await self.create_pending(session_id, requestor, deadline_at), False
+
+    async def mark_failed(self, report: Report, reason: str) -> None:
+        _mark_failed(report, reason)
+        await self.session.commit()
+
+    async def list_page(
+        self,
+        *,
+        session_id: Optional[str] = None,
+        requestor: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Tuple[List[Report], Optional[str]]:
+        """최신순 keyset 페이지네이션 (_page_statement 참고). Raises ValueError for a malformed cursor."""
+        statement = _page_statement(session_id, requestor, status, cursor, limit)
+        result = await self.session.execute(statement)
+        return _split_page(list(result.scalars()), limit)
+
+    async def iter_export(
+        self,
+        *,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        status: Optional[str] = None,
+        session_id: Optional[str] = None,
+        after: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Report]:
+        """ReportRepository.iter_export 의 async 버전 (AsyncSession.stream_scalars)."""
+        statement = _export_statement(since, until, status, session_id, after, batch_size)
+        result = await self.session.stream_scalars(statement)
+        try:
+            async for report in result:
+                yield report
+        finally:
+            await result.close()
@@ -1,16 +1,49 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import hash_password, verify_password
+from app.core.auth_cache import get_principal_cache
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import (
+    ahash_password,
+    averify_password,
+    hash_password,
+    needs_rehash,
+    verify_password,
+)
 from app.models.user import User
 from app.schemas.user import LoginRequest, UserCreate, UserUpdate
 
 
+def _page_statement(cursor: Optional[str], limit: int) -> Select:
+    """기본 키 기준 keyset 페이지 쿼리 (다음 페이지 여부를 알려고 한 행을 더 읽는다)."""
+    statement = select(User)
+    if cursor:
+        try:
+            after_id = int(decode_cursor(cursor)["id"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError("Invalid pagination cursor") from exc
+        statement = statement.where(User.id > after_id)
+    return statement.order_by(User.id).limit(limit + 1)
+
+
+def _split_page(users: List[User], limit: int) -> Tuple[List[User], Optional[str]]:
+    if len(users) > limit:
+        users = users[:limit]
+        return users, encode_cursor({"id": users[-1].id})
+    return users, None
+
+
 class UserRepository:
-    """Data access layer for User entities."""
+    """User 엔티티 데이터 접근 계층.
+
+    create/update/authenticate 는 블로킹 hash_password/verify_password 로 비밀번호를 해싱하므로
+    스크립트·sync 워커 전용이다. 라우트 핸들러는 AsyncUserRepository 를 쓴다.
+    """
 
     def __init__(self, session: Session):
         self.session = session
@@ -30,6 +63,14 @@ class UserRepository:
     def list(self, skip: int = 0, limit: int = 10) -> List[User]:
         return self.session.query(User).offset(skip).limit(limit).all()
 
+    def list_page(self, cursor: Optional[str] = None, limit: int = 10) -> Tuple[List[User], Optional[str]]:
+        """기본 키 기준 keyset 페이지네이션. 페이지 깊이가 깊어져도 비용이 늘지 않는다.
+
+        커서 형식이 잘못되면 ValueError.
+        """
+        users = list(self.session.execute(_page_statement(cursor, limit)).scalars())
+        return _split_page(users, limit)
+
     def create(self, payload: UserCreate) -> User:
         hashed_password = hash_password(payload.password)
         db_user = User(
@@ -56,6 +97,7 @@ class UserRepository:
             user.password_hash = hash_password(payload.password)
 
         self.session.commit()
+        get_principal_cache().invalidate_user(user_id)
         self.session.refresh(user)
         return user
 
@@ -65,6 +107,7 @@ class UserRepository:
             return False
         self.session.delete(user)
         self.session.commit()
+        get_principal_cache().invalidate_user(user_id)
         return True
 
     def authenticate(self, credentials: LoginRequest) -> Optional[User]:
@@ -73,4 +116,93 @@ class UserRepository:
             return None
         if not verify_password(credentials.password, user.password_hash):
             return None
+        if needs_rehash(user.password_hash):
+            user.password_hash = hash_password(credentials.password)
+            self.session.commit()
+            self.session.refresh(user)
+        return user
+
+
+class AsyncUserRepository:
+    """async 라우트 핸들러용 UserRepository (AsyncSession).
+
+    비밀번호 해싱은 해셔 프로세스 풀에서 await 하므로 PBKDF2 가 도는 동안 이벤트 루프도 스레드풀 스레드도 잡지 않는다.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _first(self, statement: Select) -> Optional[User]:
+        return (await self.session.execute(statement.limit(1))).scalars().first()
+
+    async def get(self, user_id: int) -> Optional[User]:
+        return await self.session.get(User, user_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._first(select(User).where(User.email == email))
+
+    async def get_by_login_id(self, login_id: str) -> Optional[User]:
+        return await self._first(select(User).where(User.loginId == login_id))
+
+    async def get_by_username(self, username: str) -> List[User]:
+        return list((await self.session.execute(select(User).where(User.username == username))).scalars())
+
+    async def list(self, skip: int = 0, limit: int = 10) -> List[User]:
+        statement = select(User).offset(skip).limit(limit)
+        return list((await self.session.execute(statement)).scalars())
+
+    async def list_page(self, cursor: Optional[str] = None, limit: int = 10) -> Tuple[List[User], Optional[str]]:
+        """UserRepository.list_page 참고. 커서 형식이 잘못되면 ValueError."""
+        users = list((await self.session.execute(_page_statement(cursor, limit))).scalars())
+        return _split_page(users, limit)
+
+    async def create(self, payload: UserCreate) -> User:
+        hashed_password = await ahash_password(payload.password)
+        db_user = User(
+            username=payload.username,
+            email=payload.email,
+            loginId=payload.loginId,
+            password_hash=hashed_password,
+        )
+        self.session.add(db_user)
+        await self.session.commit()
+        await self.session.refresh(db_user)
+        return db_user
+
+    async def update(self, user_id: int, payload: UserUpdate) -> Optional[User]:
+        user = await self.get(user_id)
+        if user is None:
+            return None
+
+        if payload.username is not None:
+            user.username = payload.username
+        if payload.email is not None:
+            user.email = payload.email
+        if payload.password:
+            user.password_hash = await ahash_password(payload.password)
+
+        await self.session.commit()
+        get_principal_cache().invalidate_user(user_id)
+        await self.session.refresh(user)
+        return user
+
+    async def delete(self, user_id: int) -> bool:
+        user = await self.get(user_id)
+        if user is None:
+            return False
+        await self.session.delete(user)
+        await self.session.commit()
+        get_principal_cache().invalidate_user(user_id)
+        return True
+
+    async def authenticate(self, credentials: LoginRequest) -> Optional[User]:
+        user = await self.get_by_login_id(credentials.loginId)
+        if user is None:
+            return None
+        if not await averify_password(credentials.password, user.password_hash):
+            return None
+        if needs_rehash(user.password_hash):
+            user.password_hash = await ahash_password(credentials.password)
+            await self.session.commit()
+            await self.session.refresh(user)
         return user
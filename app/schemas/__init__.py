@@ -1,6 +1,8 @@
 from .reflection import (
     ReflectionChatRequest,
     ReflectionChatResponse,
+    ReflectionSummaryBatchRequest,
+    ReflectionSummaryBatchResponse,
     ReflectionSummaryRequest,
     ReflectionSummaryResponse,
 )
@@ -12,6 +14,8 @@ __all__ = [
     "UserCreate",
     "ReflectionSummaryRequest",
     "ReflectionSummaryResponse",
+    "ReflectionSummaryBatchRequest",
+    "ReflectionSummaryBatchResponse",
     "ReflectionChatRequest",
     "ReflectionChatResponse",
 ]
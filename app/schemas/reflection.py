@@ -32,25 +32,51 @@ class ReflectionSummaryResponse(BaseModel):
     confidence: float = 0.5
 
 
+class ReflectionSummaryBatchRequest(BaseModel):
+    items: List[ReflectionSummaryRequest] = Field(..., min_length=1)
+
+
+class ReflectionSummaryBatchItem(BaseModel):
+    index: int
+    result: Optional[ReflectionSummaryResponse] = None
+    error: Optional[str] = None
+
+
+class ReflectionSummaryBatchResponse(BaseModel):
+    results: List[ReflectionSummaryBatchItem] = Field(default_factory=list)
+
+
 class ReflectionChatMessage(BaseModel):
     sender: Literal["user", "ai"]
     text: str
 
 
-class ReflectionChatRequest(ReflectionSummaryRequest):
+class ReflectionPersonaContext(ReflectionSummaryRequest):
     persona_name: str = Field(..., alias="personaName")
     persona_tone: str = Field(..., alias="personaTone")
     persona_personality: str = Field(..., alias="personaPersonality")
-    conversation: List[ReflectionChatMessage] = Field(default_factory=list)
-    message: str
 
-    def to_chat_payload(self) -> dict:
+    def to_context(self) -> dict:
+        """대화 내내 바뀌지 않는 체인 입력 (회고 + 페르소나)."""
         payload = self.to_chain_payload()
         payload.update(
             {
                 "persona_name": self.persona_name,
                 "persona_tone": self.persona_tone,
                 "persona_personality": self.persona_personality,
+            }
+        )
+        return payload
+
+
+class ReflectionChatRequest(ReflectionPersonaContext):
+    conversation: List[ReflectionChatMessage] = Field(default_factory=list)
+    message: str
+
+    def to_chat_payload(self) -> dict:
+        payload = self.to_context()
+        payload.update(
+            {
                 "conversation": [m.model_dump() for m in self.conversation],
                 "message": self.message,
             }
@@ -60,3 +86,20 @@ class ReflectionChatRequest(ReflectionSummaryRequest):
 
 class ReflectionChatResponse(BaseModel):
     reply: str
+
+
+class ConversationCreateRequest(ReflectionPersonaContext):
+    """서버 측 대화 생성. 이후 턴은 ConversationMessageRequest 로 새 메시지만 보낸다."""
+
+
+class ConversationCreateResponse(BaseModel):
+    conversationId: str
+
+
+class ConversationMessageRequest(BaseModel):
+    message: str
+
+
+class ConversationMessageResponse(ReflectionChatResponse):
+    conversationId: str
+    turnCount: int
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Any
 from datetime import datetime
 
@@ -36,3 +36,18 @@ class ReportResponse(BaseModel):
     report_json: Optional[Any]
     created_at: datetime
     processed_at: Optional[datetime]
+
+class ReportListItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    report_id: int
+    session_id: str
+    requestor: Optional[str]
+    status: str
+    failure_reason: Optional[str]
+    created_at: datetime
+    processed_at: Optional[datetime]
+
+class ReportPage(BaseModel):
+    items: List[ReportListItem]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,119 @@
+"""
+서버 측 대화 저장 + rolling summary.
+
+클라이언트는 대화 생성 시 회고/페르소나 정보를 한 번 보내고, 이후에는 새 message 만 보낸다.
+프롬프트에는 (접힌 이전 대화 요약 + CHAT_HISTORY_MAX_TOKENS 안에 드는 최근 턴 원문) 만 들어가므로
+턴 수가 늘어도 요청 크기·프롬프트 토큰·지연이 일정하다.
+
+요약되지 않은 턴이 CHAT_HISTORY_MAX_TOKENS 를 넘으면 응답을 보낸 뒤(백그라운드) 오래된 턴을
+CHAT_HISTORY_KEEP_TOKENS 만 남기고 요약에 접는다. 접기가 끝나기 전의 턴도 최근 턴만 프롬프트에 넣으므로 크기는 유지된다.
+"""
+import json
+import logging
+import threading
+from typing import List, Optional, Sequence, Set, Tuple
+
+from app.core.config import get_settings
+from app.db.session import get_async_sessionmaker
+from app.models.conversation import Conversation, ConversationTurn
+from app.repositories.conversation_repository import AsyncConversationRepository
+from app.services.langchain import LangChainService
+from app.services.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 같은 프로세스에서 한 대화를 동시에 두 번 접지 않도록 (프로세스 간 중복은 repository.fold 의 CAS 가 막음)
+_folding: Set[str] = set()
+_folding_lock = threading.Lock()
+
+
+def split_history(
+    turns: Sequence[ConversationTurn],
+    max_tokens: int,
+) -> Tuple[List[ConversationTurn], List[ConversationTurn]]:
+    """(오래된 턴, max_tokens 안에 드는 최근 턴) — 둘 다 오래된 순."""
+    total = 0
+    start = len(turns)
+    for i in range(len(turns) - 1, -1, -1):
+        total += turns[i].tokens
+        if total > max_tokens:
+            break
+        start = i
+    return list(turns[:start]), list(turns[start:])
+
+
+def chat_payload(conversation: Conversation, recent: Sequence[ConversationTurn], message: str) -> dict:
+    """ReflectionChatRequest.to_chat_payload 와 같은 형태 + conversation_summary."""
+    payload = json.loads(conversation.context_json)
+    payload.update(
+        {
+            "conversation_summary": conversation.summary or "",
+            "conversation": [{"sender": t.sender, "text": t.text} for t in recent],
+            "message": message,
+        }
+    )
+    return payload
+
+
+def needs_fold(turns: Sequence[ConversationTurn], new_texts: Sequence[str] = ()) -> bool:
+    """요약되지 않은 턴(+ 방금 저장한 턴의 new_texts)이 CHAT_HISTORY_MAX_TOKENS 를 넘는지."""
+    total = sum(t.tokens for t in turns) + sum(estimate_tokens(text) for text in new_texts)
+    return total > get_settings().CHAT_HISTORY_MAX_TOKENS
+
+
+async def prepare_turn(
+    repository: AsyncConversationRepository,
+    conversation: Conversation,
+    message: str,
+) -> Tuple[dict, List[ConversationTurn]]:
+    """이번 턴의 체인 입력과, 프롬프트 구성에 쓴 요약되지 않은 턴 목록."""
+    turns = await repository.unsummarized_turns(conversation)
+    _, recent = split_history(turns, get_settings().CHAT_HISTORY_MAX_TOKENS)
+    return chat_payload(conversation, recent, message), turns
+
+
+async def fold_conversation(conversation_id: str, service: LangChainService) -> None:
+    """
+    오래된 턴을 summary 에 접는다. 응답 후 백그라운드에서 호출되므로 자체 세션을 쓰고 예외는 로그만 남긴다.
+    """
+    with _folding_lock:
+        if conversation_id in _folding:
+            return
+        _folding.add(conversation_id)
+    try:
+        async with get_async_sessionmaker()() as db:
+            repository = AsyncConversationRepository(db)
+            conversation = await repository.get(conversation_id)
+            if conversation is None:
+                return
+            turns = await repository.unsummarized_turns(conversation)
+            if not needs_fold(turns):
+                return
+            older, _ = split_history(turns, get_settings().CHAT_HISTORY_KEEP_TOKENS)
+            if not older:
+                return
+            summary = await service.afold_conversation(
+                conversation.summary,
+                [{"sender": t.sender, "text": t.text} for t in older],
+            )
+            await repository.fold(conversation_id, conversation.summarized_until, older[-1].id, summary)
+    except Exception:
+        logger.warning("Folding conversation %s failed", conversation_id, exc_info=True)
+    finally:
+        with _folding_lock:
+            _folding.discard(conversation_id)
+
+
+async def record_turn(
+    conversation_id: str,
+    message: str,
+    reply: str,
+    repository: Optional[AsyncConversationRepository] = None,
+) -> None:
+    """사용자 메시지와 응답을 저장한다. repository 가 없으면(스트리밍 응답 중) 자체 세션을 연다."""
+    turns = [("user", message), ("ai", reply)]
+    if repository is not None:
+        await repository.append_turns(conversation_id, turns)
+        return
+    async with get_async_sessionmaker()() as db:
+        await AsyncConversationRepository(db).append_turns(conversation_id, turns)
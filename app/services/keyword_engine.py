@@ -0,0 +1,222 @@
+"""
+키워드 기반 fallback 추출기 (감정/결정/액션).
+
+카테고리(감정/결정/액션)마다 키워드를 긴 것부터 나열한 alternation 정규식을 프로세스당 한 번 컴파일한다.
+scan 은 문장 분리만 한 번 하고, 카테고리별 결과는 물어볼 때 정규식 엔진(C) 안에서 구한다.
+- 문장 인덱스: 문장 목록에 pattern.search 를 map/compress 로 적용 — 문장·매칭마다 파이썬 코드가 돌지 않고,
+  limit 만큼 찾으면 나머지 문장은 보지 않는다
+- 라벨: 텍스트 전체에 findall 한 번
+비용은 텍스트 길이에 선형이며 키워드 수 × 문장 수로 늘지 않는다.
+키워드 표는 DEFAULT_KEYWORD_TABLES 이며, KEYWORD_TABLES_PATH(JSON)로 교체할 수 있다.
+"""
+import json
+import re
+from functools import lru_cache
+from itertools import compress, islice
+from operator import attrgetter
+from typing import Dict, List, Mapping, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+# {카테고리: {라벨: [키워드, ...]}} — 라벨 순서가 곧 우선순위 (dict 순서 유지)
+DEFAULT_KEYWORD_TABLES: Dict[str, Dict[str, List[str]]] = {
+    "emotion": {
+        "불안": ["불안", "걱정", "초조", "anx"],
+        "당황": ["당황", "황당", "embarrass", "awkward"],
+        "화남": ["화나", "짜증", "분노", "angry"],
+        "슬픔": ["슬픔", "우울", "sad"],
+        "기쁨": ["기쁨", "행복", "즐거", "happy"],
+        "죄책감": ["죄책", "미안", "guilt"],
+    },
+    "decision": {
+        "decision": ["결정", "하기로", "선택", "결론", "합의", "정하기"],
+    },
+    "action": {
+        "action": ["해야", "준비", "정리", "확인", "작성", "검토", "추가"],
+    },
+}
+
+# 감정은 소문자화한 텍스트에서 찾고(대소문자 무시), 결정/액션은 원문 그대로 찾는다(대소문자 구분).
+CASE_INSENSITIVE_CATEGORIES = frozenset({"emotion"})
+
+
+def _lower_preserving_offsets(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # 소문자화로 길이가 바뀌는 문자(예: "İ")는 그대로 두어 원문 오프셋을 유지한다.
+    return "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+
+
+def _segments(text: str) -> List[str]:
+    return text.replace("!", ".").replace("?", ".").split(".")
+
+
+def _sentence_offsets(text: str) -> List[int]:
+    """ScanResult.sentences 각각의 원문 시작 오프셋."""
+    offsets: List[int] = []
+    start = 0
+    for seg in _segments(text):
+        stripped = seg.lstrip()
+        if stripped.rstrip():
+            offsets.append(start + len(seg) - len(stripped))
+        start += len(seg) + 1
+    return offsets
+
+
+class KeywordHit(NamedTuple):
+    category: str
+    label: str
+    keyword: str
+    start: int  # 원문 기준 오프셋
+    end: int
+    sentence: int  # ScanResult.sentences 인덱스
+
+
+class _Category(NamedTuple):
+    name: str
+    ignore_case: bool
+    pattern: Optional[Pattern[str]]
+    labels: Tuple[str, ...]  # 표에 적힌 순서 (= 우선순위)
+    keywords: Dict[str, Tuple[Tuple[str, str], ...]]  # 찾는 문자열 → ((라벨, 표에 적힌 키워드), ...)
+    hidden: Dict[str, Tuple[str, ...]]  # 매칭된 문자열 → 그 매칭에 가려질 수 있는 다른 찾는 문자열
+
+
+def _related_keys(key: str, keys: Sequence[str]) -> List[str]:
+    """
+    key 가 매칭된 자리에 함께 있을 수 있는 키워드: 같은 위치에서 시작하는 접두사 키워드와
+    매칭 안쪽(1..len-1)에서 시작해 key 와 겹치는 키워드.
+    """
+    related = [other for other in keys if key.startswith(other)]
+    for j in range(1, len(key)):
+        tail = key[j:]
+        related.extend(other for other in keys if tail.startswith(other) or other.startswith(tail))
+    return [other for other in dict.fromkeys(related) if other != key]
+
+
+class ScanResult:
+    """
+    KeywordEngine.scan 결과. 문장 목록만 미리 만들고, 카테고리별 문장 인덱스/라벨/hits 는 읽을 때 계산한다.
+    """
+
+    __slots__ = ("sentences", "_text", "_categories", "_indexes", "_lowered_text", "_lowered_sentences")
+
+    def __init__(self, text: str, sentences: List[str], categories: Mapping[str, _Category]):
+        self.sentences = sentences
+        self._text = text
+        self._categories = categories
+        self._indexes: Dict[str, List[int]] = {}
+        self._lowered_text: Optional[str] = None
+        self._lowered_sentences: Optional[List[str]] = None
+
+    def _sentence_sources(self, category: _Category) -> List[str]:
+        if not category.ignore_case:
+            return self.sentences
+        if self._lowered_sentences is None:
+            self._lowered_sentences = [_lower_preserving_offsets(s) for s in self.sentences]
+        return self._lowered_sentences
+
+    def sentence_indexes(self, category: str, limit: Optional[int] = None) -> List[int]:
+        """category 키워드가 있는 문장 인덱스 (오름차순). limit 개를 찾으면 나머지 문장은 보지 않는다."""
+        found = self._indexes.get(category)
+        if found is None:
+            spec = self._categories.get(category)
+            if spec is None or spec.pattern is None:
+                return []
+            matching = compress(range(len(self.sentences)), map(spec.pattern.search, self._sentence_sources(spec)))
+            if limit is not None:
+                return list(islice(matching, limit))
+            found = self._indexes[category] = list(matching)
+        return found[:limit]
+
+    def labels(self, category: str) -> List[str]:
+        """텍스트에 키워드가 하나라도 있는 라벨 (표에 적힌 순서)."""
+        spec = self._categories.get(category)
+        if spec is None or spec.pattern is None:
+            return []
+        source = self._text
+        if spec.ignore_case:
+            if self._lowered_text is None:
+                self._lowered_text = self._text.lower()
+            source = self._lowered_text
+        matched = set(spec.pattern.findall(source))
+        # findall 매칭은 서로 겹치지 않으므로, 매칭에 가려질 수 있는 키워드(접두사/겹침)만 따로 확인한다.
+        for key in {other for key in matched for other in spec.hidden[key]} - matched:
+            if key in source:
+                matched.add(key)
+        present = {label for key in matched for label, _ in spec.keywords[key]}
+        return [label for label in spec.labels if label in present]
+
+    @property
+    def hits(self) -> List[KeywordHit]:
+        """모든 매칭 (위치 순). 같은 문장 안에서 같은 키워드는 첫 매칭만. 조회·디버깅용이라 읽을 때 계산한다."""
+        offsets = _sentence_offsets(self._text)
+        hits: List[KeywordHit] = []
+        for spec in self._categories.values():
+            sources = self._sentence_sources(spec)
+            for index in self.sentence_indexes(spec.name):
+                sentence = sources[index]
+                for key, entries in spec.keywords.items():
+                    pos = sentence.find(key)
+                    if pos >= 0:
+                        start = offsets[index] + pos
+                        hits.extend(
+                            KeywordHit(spec.name, label, keyword, start, start + len(keyword), index)
+                            for label, keyword in entries
+                        )
+        hits.sort(key=attrgetter("start"))
+        return hits
+
+
+class KeywordEngine:
+    """
+    키워드 표를 한 번 컴파일해 두고 텍스트를 스캔한다.
+    카테고리마다 정규식 하나를 쓰므로 매칭 결과를 다시 확인하는 단계가 없다.
+    """
+
+    def __init__(self, tables: Optional[Mapping[str, Mapping[str, Sequence[str]]]] = None):
+        self.tables = tables or DEFAULT_KEYWORD_TABLES
+        self._categories: Dict[str, _Category] = {}
+        for category, labels in self.tables.items():
+            ignore_case = category in CASE_INSENSITIVE_CATEGORIES
+            entries: Dict[str, List[Tuple[str, str]]] = {}
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    if keyword:
+                        key = keyword.lower() if ignore_case else keyword
+                        entries.setdefault(key, []).append((label, keyword))
+            keys = sorted(entries, key=len, reverse=True)
+            self._categories[category] = _Category(
+                name=category,
+                ignore_case=ignore_case,
+                pattern=re.compile("|".join(map(re.escape, keys))) if keys else None,
+                labels=tuple(labels),
+                keywords={key: tuple(dict.fromkeys(pairs)) for key, pairs in entries.items()},
+                hidden={key: tuple(_related_keys(key, keys)) for key in keys},
+            )
+
+    def scan(self, text: str) -> ScanResult:
+        """
+        문장(., !, ? 기준, 공백 제거 후 빈 문장 제외)을 나누고 카테고리별 조회를 준비한다.
+        감정 키워드는 대소문자를 무시하고, 결정/액션 키워드는 구분한다 (CASE_INSENSITIVE_CATEGORIES).
+        키워드에는 문장 구분자가 없다고 가정하므로 매칭이 문장 경계를 넘지 않는다.
+        """
+        sentences = [s for s in map(str.strip, _segments(text)) if s]
+        return ScanResult(text, sentences, self._categories)
+
+    def ranked_labels(self, result: ScanResult, category: str) -> List[str]:
+        """표에 정의된 라벨 순서대로의 매칭 라벨."""
+        return result.labels(category)
+
+
+def load_keyword_tables(path: Optional[str]) -> Dict[str, Dict[str, List[str]]]:
+    if not path:
+        return DEFAULT_KEYWORD_TABLES
+    with open(path, encoding="utf-8") as fp:
+        tables = json.load(fp)
+    if not isinstance(tables, dict):
+        raise ValueError("Keyword tables must be a JSON object of {category: {label: [keywords]}}")
+    return {str(c): {str(l): [str(k) for k in ks] for l, ks in labels.items()} for c, labels in tables.items()}
+
+
+@lru_cache
+def get_keyword_engine(path: Optional[str] = None) -> KeywordEngine:
+    return KeywordEngine(load_keyword_tables(path))
@@ -1,16 +1,213 @@
 import json
-from typing import List, Mapping
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from langchain_core.messages.ai import add_usage
+from langchain_core.runnables import RunnableLambda
+
+from app.core.config import get_settings
+from app.core.deadline import check_deadline
+from app.core.metrics import observe_llm_call, observe_prompt_tokens, stage_timer
+from app.services.keyword_engine import KeywordEngine, ScanResult, get_keyword_engine
+from app.services.llm_cache import LLMCache, get_llm_cache, make_cache_key
+from app.services.llm_limiter import LLMLimiter, get_llm_limiter
+from app.services.llm_resilience import FALLBACK_TOTAL, LLMResilience, fallback_reason, get_llm_resilience
+from app.services.tokens import (
+    PromptBudgetExceeded,
+    chat_budget,
+    estimate_inputs_tokens,
+    estimate_tokens,
+    split_by_tokens,
+    summary_budget,
+)
+
+# 프롬프트(체인) 구성이 바뀌면 올려서 기존 캐시 항목을 무효화한다.
+SUMMARY_PROMPT_VERSION = "summary-v1"
+
+logger = logging.getLogger(__name__)
+
+DUE_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# map-reduce 로 합칠 때 결정/액션 항목 상한 (단일 호출 추출 상한 5/10 보다 넉넉히)
+MAX_MERGED_DECISIONS = 10
+MAX_MERGED_ACTION_ITEMS = 20
+
+# LLM 대신 키워드 규칙으로 만든 요약의 confidence (LLM 결과의 기본값 0.5 보다 낮게)
+FALLBACK_CONFIDENCE = 0.1
+
+
+class _TokenUsage(BaseCallbackHandler):
+    """체인 실행 중 모델이 보고한 입력 토큰 수를 모은다 (usage 를 주지 않는 모델/더미 체인이면 0)."""
+
+    run_inline = True  # async 실행에서도 executor 로 넘기지 않는다
+
+    def __init__(self):
+        self.input_tokens = 0
+
+    def on_llm_end(self, response, **kwargs) -> None:
+        reported = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    reported += usage.get("input_tokens", 0)
+        if not reported:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            reported = token_usage.get("prompt_tokens") or token_usage.get("input_tokens") or 0
+        self.input_tokens += reported
 
 
 class LangChainService:
     """
     LLM/체인 초기화는 실제 프로젝트 환경에 맞게 구성하세요.
     여기서는 동작 확인용 더미 체인(_summary_chain)과, 감정/결정/액션 추출 로직을 제공합니다.
+
+    async 라우트는 a* 메서드(체인의 ainvoke/abatch/astream)를 사용해 LLM 대기 중 스레드를 점유하지 않는다.
+    동기 메서드는 워커 스레드/스크립트용이며, 입력 준비·캐시·후처리를 async 메서드와 공유하고
+    체인 호출만 invoke/batch/stream 으로 한다.
+
+    모든 체인 호출은 _invoke/_ainvoke/_stream/_astream 을 거쳐 LLMLimiter 의 전역·호출자별 한도를 통과한다.
+    caller 는 호출자 키("user:<id>" / "ip:<주소>")이며 None 이면 전역 한도만 적용한다.
+    deadline 은 요청 deadline(app.core.deadline, time.time() 기준)이며, 지나면 새 호출을 시작하지 않고
+    진행 중인 호출은 그때까지만 기다린 뒤 RequestDeadlineExceeded 를 던진다.
+
+    체인 입력은 체인별 토큰 예산(LLM_*_MAX_INPUT_TOKENS)에 맞춰 우선순위 낮은 필드부터 줄이고,
+    줄일 수 없는 필드만으로 넘치면 체인을 부르기 전에 PromptBudgetExceeded 를 던진다.
+
+    체인 호출은 LLMResilience 의 기한·재시도·헤지·서킷 브레이커를 거친다. 브레이커가 열렸거나 기한/재시도를
+    넘긴 요약은 (fallback=True 이면) 키워드 기반 결과를 FALLBACK_CONFIDENCE 로 돌려준다.
     """
 
-    def __init__(self, settings=None):
+    def __init__(
+        self,
+        settings=None,
+        cache: Optional[LLMCache] = None,
+        keywords: Optional[KeywordEngine] = None,
+        limiter: Optional[LLMLimiter] = None,
+        resilience: Optional[LLMResilience] = None,
+    ):
         self.settings = settings
+        self.cache = cache if cache is not None else get_llm_cache()
+        self.limiter = limiter if limiter is not None else get_llm_limiter()
+        self.resilience = resilience if resilience is not None else get_llm_resilience()
+        self.keywords = keywords or get_keyword_engine(self._setting("KEYWORD_TABLES_PATH", None))
+        self._summary_budget = summary_budget(self._setting("LLM_SUMMARY_MAX_INPUT_TOKENS", 8000))
+        self._chat_budget = chat_budget(self._setting("LLM_CHAT_MAX_INPUT_TOKENS", 6000))
+        # 체인(모델 클라이언트/프롬프트 포함)은 한 번만 만들고 요청 간에 공유한다.
+        # Runnable 은 호출 간 상태가 없으므로 여러 스레드/코루틴에서 동시에 써도 안전하다.
+        self._summary = self._build_summary_chain()
+        self._chat = self._build_chat_chain()
+
+    def _summary_chain(self):
+        return self._summary
+
+    def _chat_chain(self):
+        return self._chat
+
+    def _attempt(self, name: str, chain, inputs: dict, caller: Optional[str]):
+        """체인 호출 한 번 (재시도/헤지마다 자리를 따로 잡는다)."""
+        usage = _TokenUsage()
+        held = self.limiter.acquire(caller)
+        try:
+            started = time.perf_counter()
+            with stage_timer("llm"):
+                response = chain.invoke(inputs, config={"callbacks": [usage]})
+            self.resilience.observe_latency(name, time.perf_counter() - started)
+        finally:
+            self.limiter.release(held)
+        observe_prompt_tokens(name, estimate_inputs_tokens(inputs), usage.input_tokens)
+        return response
+
+    async def _aattempt(self, name: str, chain, inputs: dict, caller: Optional[str]):
+        usage = _TokenUsage()
+        held = await self.limiter.aacquire(caller)
+        try:
+            started = time.perf_counter()
+            with stage_timer("llm"):
+                response = await chain.ainvoke(inputs, config={"callbacks": [usage]})
+            self.resilience.observe_latency(name, time.perf_counter() - started)
+        finally:
+            self.limiter.release(held)
+        observe_prompt_tokens(name, estimate_inputs_tokens(inputs), usage.input_tokens)
+        return response
+
+    def _invoke(self, name: str, chain, inputs: dict, caller: Optional[str] = None, deadline: Optional[float] = None):
+        return self.resilience.call(name, lambda: self._attempt(name, chain, inputs, caller), deadline)
+
+    async def _ainvoke(
+        self, name: str, chain, inputs: dict, caller: Optional[str] = None, deadline: Optional[float] = None
+    ):
+        return await self.resilience.acall(name, lambda: self._aattempt(name, chain, inputs, caller), deadline)
+
+    def _stream(
+        self, name: str, chain, inputs: dict, caller: Optional[str] = None, deadline: Optional[float] = None
+    ) -> Iterator[Any]:
+        # 스트림이 끝날(또는 소비자가 닫을) 때까지 자리를 잡고 있는다. 스트림은 재시도/헤지하지 않는다.
+        # deadline 은 청크마다 확인하므로, 이미 보낸 토큰 뒤에 기한이 지나면 스트림이 중간에 끝난다.
+        usage = _TokenUsage()
+        finish = self.resilience.guard(name, deadline)
+        try:
+            held = self.limiter.acquire(caller)
+            try:
+                for chunk in chain.stream(inputs, config={"callbacks": [usage]}):
+                    check_deadline(deadline)
+                    yield chunk
+            finally:
+                self.limiter.release(held)
+        except BaseException as exc:
+            finish(exc)
+            raise
+        finish(None)
+        observe_prompt_tokens(name, estimate_inputs_tokens(inputs), usage.input_tokens)
+
+    async def _astream(
+        self, name: str, chain, inputs: dict, caller: Optional[str] = None, deadline: Optional[float] = None
+    ) -> AsyncIterator[Any]:
+        usage = _TokenUsage()
+        finish = self.resilience.guard(name, deadline)
+        try:
+            held = await self.limiter.aacquire(caller)
+            try:
+                async for chunk in chain.astream(inputs, config={"callbacks": [usage]}):
+                    check_deadline(deadline)
+                    yield chunk
+            finally:
+                self.limiter.release(held)
+        except BaseException as exc:
+            finish(exc)
+            raise
+        finish(None)
+        observe_prompt_tokens(name, estimate_inputs_tokens(inputs), usage.input_tokens)
+
+    def _limited_chain(self, name: str, chain, caller: Optional[str], deadline: Optional[float] = None) -> RunnableLambda:
+        """batch/abatch 의 항목별 호출에도 한도·복원력·deadline 을 적용하기 위한 래퍼."""
+
+        def invoke(inputs):
+            return self._invoke(name, chain, inputs, caller, deadline)
+
+        async def ainvoke(inputs):
+            return await self._ainvoke(name, chain, inputs, caller, deadline)
+
+        return RunnableLambda(invoke, afunc=ainvoke)
+
+    def warm_up(self) -> None:
+        """
+        앱 시작 시 체인을 한 번씩 호출해 모델 클라이언트의 연결을 미리 연다.
+        실패해도 앱 기동은 계속되며, 결과는 캐시에 저장하지 않는다.
+        """
+        probes = [
+            (self._summary, {"what_happened": "", "emotions": "", "what_you_did": "", "desired_outcome": ""}),
+            (self._chat, {"message": ""}),
+        ]
+        for chain, inputs in probes:
+            try:
+                chain.invoke(inputs)
+            except Exception:
+                logger.warning("LLM warm-up call failed", exc_info=True)
 
     def _safe_parse_json(self, raw: str) -> dict:
         try:
@@ -32,74 +229,91 @@ class LangChainService:
         1) (선택) LLM 시도: JSON 배열만 반환하도록 프롬프트 (프로젝트에 맞게 연결)
         2) 실패 시: 키워드 기반 fallback
         """
-
-        lowered = text.lower()
-        rules = [
-            ("불안", ["불안", "걱정", "초조", "anx"]),
-            ("당황", ["당황", "황당", "embarrass", "awkward"]),
-            ("화남", ["화나", "짜증", "분노", "angry"]),
-            ("슬픔", ["슬픔", "우울", "sad"]),
-            ("기쁨", ["기쁨", "행복", "즐거", "happy"]),
-            ("죄책감", ["죄책", "미안", "guilt"]),
-        ]
-        found = []
-        for label, keys in rules:
-            if any(k in lowered for k in keys):
-                found.append(label)
+        found = self.keywords.ranked_labels(self.keywords.scan(text), "emotion")
         if not found:
             found = ["불안"]
-        dedup, seen = [], set()
-        for f in found:
-            if f not in seen:
-                dedup.append(f)
-                seen.add(f)
-        return dedup[:max_items]
+        return found[:max_items]
+
+    def _decisions_from_scan(self, scan: ScanResult) -> List[str]:
+        return [scan.sentences[i][:150] for i in scan.sentence_indexes("decision", limit=5)]
+
+    def _action_items_from_scan(self, scan: ScanResult) -> List[dict]:
+        items = []
+        for i in scan.sentence_indexes("action", limit=10):
+            s = scan.sentences[i]
+            item = {"text": s[:150], "owner": None, "due": None}
+            if "@" in s:
+                owner_part = s.split("@", 1)[1].split(" ", 1)[0]
+                if owner_part:
+                    item["owner"] = owner_part[:30]
+            m = DUE_DATE_PATTERN.search(s)
+            if m:
+                item["due"] = m.group(0)
+            items.append(item)
+        return items
 
     def _extract_decisions(self, base_text: str) -> List[str]:
-        sentences = self._split_sentences(base_text)
-        keywords = ["결정", "하기로", "선택", "결론", "합의", "정하기"]
-        result = []
-        for s in sentences:
-            if any(k in s for k in keywords):
-                result.append(s[:150])
-        return result[:5]
+        return self._decisions_from_scan(self.keywords.scan(base_text))
 
     def _extract_action_items(self, base_text: str) -> List[dict]:
-        sentences = self._split_sentences(base_text)
-        keywords = ["해야", "준비", "정리", "확인", "작성", "검토", "추가"]
-        items = []
-        import re
-        for s in sentences:
-            if any(k in s for k in keywords):
-                item = {"text": s[:150], "owner": None, "due": None}
-                if "@" in s:
-                    owner_part = s.split("@", 1)[1].split(" ", 1)[0]
-                    if owner_part:
-                        item["owner"] = owner_part[:30]
-                m = re.search(r"\d{4}-\d{2}-\d{2}", s)
-                if m:
-                    item["due"] = m.group(0)
-                items.append(item)
-        return items[:10]
+        return self._action_items_from_scan(self.keywords.scan(base_text))
 
-    def _summary_chain(self):
+    def _keyword_summary(self, payload: Mapping[str, object], emotions: List[str]) -> dict:
+        """LLM 없이 원문 앞 문장과 키워드 규칙만으로 만든 요약 (summarize_reflection 과 같은 형식)."""
+        what_happened = str(payload.get("what_happened", ""))
+        base_text = " ".join(
+            [what_happened, str(payload.get("what_you_did", "")), str(payload.get("desired_outcome", ""))]
+        )
+        sentences = self._split_sentences(what_happened)
+        with stage_timer("extract"):
+            scan = self.keywords.scan(base_text)
+            return {
+                "summary": (". ".join(sentences[:2]) + ".")[:200] if sentences else "",
+                "keyInsights": [],
+                "suggestedPhrases": [],
+                "emotions": emotions,
+                "decisionPoints": self._decisions_from_scan(scan),
+                "actionItems": self._action_items_from_scan(scan),
+                "confidence": FALLBACK_CONFIDENCE,
+            }
+
+    def _falls_back(self, chain: str, exc: BaseException, fallback: bool) -> bool:
+        """exc 대신 키워드 결과를 돌려줄지. 입력 오류·호출 한도(429) 등은 그대로 올린다."""
+        if not fallback or not self._setting("LLM_FALLBACK_ENABLED", True):
+            return False
+        reason = fallback_reason(exc)
+        if reason is None:
+            return False
+        FALLBACK_TOTAL.inc(1, chain, reason)
+        if reason != "open":
+            logger.warning("LLM %s call failed, serving keyword fallback: %s", chain, exc)
+        return True
+
+    def _build_summary_chain(self):
         """
-        실제 LangChain 체인을 구성해 반환하세요.
-        여기서는 동작 확인용 더미 체인을 반환합니다.
-        """
-        class DummyChain:
-            def invoke(self, vars):
-                return json.dumps(
-                    {
-                        "summary": f"{vars.get('what_happened','')[:80]} 요약",
-                        "keyInsights": ["인사이트 예시"],
-                        "suggestedPhrases": ["표현 예시"],
-                    },
-                    ensure_ascii=False,
-                )
-        return DummyChain()
-
-    def summarize_reflection(self, payload: Mapping[str, object]) -> dict:
+        실제 LangChain 체인을 구성해 반환하세요. (서비스 생성 시 한 번만 호출됨)
+        여기서는 동작 확인용 더미 체인을 반환합니다. (Runnable 이므로 batch/stream 지원)
+        """
+        def dummy_summary(vars):
+            return json.dumps(
+                {
+                    "summary": f"{vars.get('what_happened','')[:80]} 요약",
+                    "keyInsights": ["인사이트 예시"],
+                    "suggestedPhrases": ["표현 예시"],
+                },
+                ensure_ascii=False,
+            )
+
+        # afunc 가 없으면 RunnableLambda.ainvoke 는 func 를 스레드풀에서 실행한다.
+        async def adummy_summary(vars):
+            return dummy_summary(vars)
+
+        return RunnableLambda(dummy_summary, afunc=adummy_summary)
+
+    def _setting(self, name: str, default):
+        return getattr(self.settings, name, default) if self.settings is not None else default
+
+    def _resolve_emotions(self, payload: Mapping[str, object]) -> List[str]:
         emotions: List[str] = list(payload.get("emotions", []) or [])
         if not emotions:
             base_text = " ".join(
@@ -109,27 +323,50 @@ class LangChainService:
                     str(payload.get("desired_outcome", "")),
                 ]
             )
-            emotions = self.detect_emotions(base_text)
-
-        chain = self._summary_chain()
-        raw_response = chain.invoke(
-            {
-                "what_happened": payload.get("what_happened", ""),
-                "emotions": ", ".join(emotions),
-                "what_you_did": payload.get("what_you_did", ""),
-                "desired_outcome": payload.get("desired_outcome", ""),
-            }
+            with stage_timer("extract"):
+                emotions = self.detect_emotions(base_text)
+        return emotions
+
+    def _summary_inputs(self, payload: Mapping[str, object], emotions: List[str]) -> dict:
+        inputs = {
+            "what_happened": payload.get("what_happened", ""),
+            "emotions": ", ".join(emotions),
+            "what_you_did": payload.get("what_you_did", ""),
+            "desired_outcome": payload.get("desired_outcome", ""),
+        }
+        return self._summary_budget.apply(inputs)[0]
+
+    def _summary_cache_key(self, inputs: Mapping[str, object]) -> str:
+        return make_cache_key(
+            inputs,
+            model=self._setting("GEMINI_MODEL", ""),
+            prompt_version=SUMMARY_PROMPT_VERSION,
         )
+
+    def _store_summary(self, key: str, raw_response) -> str:
+        text = str(raw_response)
+        # 파싱 불가능한 응답은 캐시하지 않는다 (다음 요청에서 다시 시도).
+        if self._safe_parse_json(text):
+            self.cache.set(key, text)
+        return text
+
+    def _build_summary(self, raw_response, emotions: List[str]) -> dict:
         text = str(raw_response)
-        parsed = self._safe_parse_json(text)
+        with stage_timer("parse"):
+            parsed = self._safe_parse_json(text)
+        with stage_timer("extract"):
+            return self._summary_fields(parsed, emotions)
 
+    def _summary_fields(self, parsed: dict, emotions: List[str]) -> dict:
         summary = str(parsed.get("summary", "")).strip()
         key_insights = self._normalize_array(parsed.get("keyInsights"))
         suggested_phrases = self._normalize_array(parsed.get("suggestedPhrases"))
 
+        scan: Optional[ScanResult] = None
         decision_points = self._normalize_array(parsed.get("decisionPoints"))
         if not decision_points:
-            decision_points = self._extract_decisions(" ".join([summary] + key_insights))
+            scan = self.keywords.scan(" ".join([summary] + key_insights))
+            decision_points = self._decisions_from_scan(scan)
 
         action_items_raw = parsed.get("actionItems", [])
         action_items: List[dict] = []
@@ -146,7 +383,9 @@ class LangChainService:
                 elif isinstance(ai, str):
                     action_items.append({"text": ai[:150], "owner": None, "due": None})
         if not action_items:
-            action_items = self._extract_action_items(" ".join([summary] + key_insights))
+            if scan is None:
+                scan = self.keywords.scan(" ".join([summary] + key_insights))
+            action_items = self._action_items_from_scan(scan)
 
         confidence = parsed.get("confidence", 0.5)
         try:
@@ -164,6 +403,443 @@ class LangChainService:
             "confidence": confidence,
         }
 
-    def generate_chat_reply(self, payload: Mapping[str, object]) -> str:
-        last_user = payload.get("message") or ""
-        return f"반영해 볼게요: {last_user}"
+    def _prepare_summary(self, payload: Mapping[str, object]) -> Tuple[List[str], dict, str]:
+        emotions = self._resolve_emotions(payload)
+        inputs = self._summary_inputs(payload, emotions)
+        return emotions, inputs, self._summary_cache_key(inputs)
+
+    def summarize_reflection(
+        self,
+        payload: Mapping[str, object],
+        use_cache: bool = True,
+        caller: Optional[str] = None,
+        fallback: bool = True,
+        deadline: Optional[float] = None,
+    ) -> dict:
+        emotions, inputs, key = self._prepare_summary(payload)
+
+        raw_response = self.cache.get(key) if use_cache else None
+        if raw_response is None:
+            if not use_cache:
+                self.cache.stats.incr("bypasses")
+            try:
+                raw_response = self._invoke("summary", self._summary_chain(), inputs, caller, deadline)
+            except Exception as exc:
+                if not self._falls_back("summary", exc, fallback):
+                    raise
+                return self._keyword_summary(payload, emotions)
+            observe_llm_call("summary", inputs, raw_response)
+            raw_response = self._store_summary(key, raw_response)
+        return self._build_summary(raw_response, emotions)
+
+    async def _astore_summary(self, key: str, raw_response) -> str:
+        text = str(raw_response)
+        if self._safe_parse_json(text):
+            await self.cache.aset(key, text)
+        return text
+
+    async def asummarize_reflection(
+        self,
+        payload: Mapping[str, object],
+        use_cache: bool = True,
+        caller: Optional[str] = None,
+        fallback: bool = True,
+        deadline: Optional[float] = None,
+    ) -> dict:
+        """summarize_reflection 의 async 버전 (chain.ainvoke)."""
+        emotions, inputs, key = self._prepare_summary(payload)
+
+        raw_response = await self.cache.aget(key) if use_cache else None
+        if raw_response is None:
+            if not use_cache:
+                self.cache.stats.incr("bypasses")
+            try:
+                raw_response = await self._ainvoke("summary", self._summary_chain(), inputs, caller, deadline)
+            except Exception as exc:
+                if not self._falls_back("summary", exc, fallback):
+                    raise
+                return self._keyword_summary(payload, emotions)
+            observe_llm_call("summary", inputs, raw_response)
+            raw_response = await self._astore_summary(key, raw_response)
+        return self._build_summary(raw_response, emotions)
+
+    def _prepare_batch(
+        self, payloads: Sequence[Mapping[str, object]]
+    ) -> Tuple[List[List[str]], List[Optional[dict]], List[Optional[str]], Dict[int, PromptBudgetExceeded]]:
+        """예산을 넘는 항목은 배치 전체를 실패시키지 않고 rejected 로 돌려 그 항목의 error 로 보고한다."""
+        emotions_list = [self._resolve_emotions(p) for p in payloads]
+        inputs: List[Optional[dict]] = []
+        rejected: Dict[int, PromptBudgetExceeded] = {}
+        for i, (payload, emotions) in enumerate(zip(payloads, emotions_list)):
+            try:
+                inputs.append(self._summary_inputs(payload, emotions))
+            except PromptBudgetExceeded as exc:
+                inputs.append(None)
+                rejected[i] = exc
+        keys = [None if i is None else self._summary_cache_key(i) for i in inputs]
+        return emotions_list, inputs, keys, rejected
+
+    def _batch_config(self, max_concurrency: Optional[int]) -> dict:
+        if max_concurrency is None:
+            max_concurrency = self._setting("SUMMARY_BATCH_MAX_CONCURRENCY", 8)
+        return {"max_concurrency": max(1, max_concurrency)}
+
+    def _observe_batch(self, inputs: Sequence[dict], missing: Sequence[int], fresh: Sequence[Any]) -> None:
+        for i, raw in zip(missing, fresh):
+            observe_llm_call("summary", inputs[i], None if isinstance(raw, Exception) else raw)
+
+    def _batch_results(self, raw_responses: Sequence[Any], emotions_list: Sequence[List[str]]) -> List[dict]:
+        results: List[dict] = []
+        for raw_response, emotions in zip(raw_responses, emotions_list):
+            if isinstance(raw_response, Exception):
+                results.append({"result": None, "error": str(raw_response) or type(raw_response).__name__})
+                continue
+            try:
+                results.append({"result": self._build_summary(raw_response, emotions), "error": None})
+            except Exception as exc:
+                results.append({"result": None, "error": str(exc) or type(exc).__name__})
+        return results
+
+    def _batch_fallbacks(
+        self,
+        results: List[dict],
+        raw_responses: Sequence[Any],
+        payloads: Sequence[Mapping[str, object]],
+        emotions_list: Sequence[List[str]],
+        fallback: bool,
+    ) -> List[dict]:
+        for i, raw_response in enumerate(raw_responses):
+            if isinstance(raw_response, Exception) and self._falls_back("summary", raw_response, fallback):
+                results[i] = {"result": self._keyword_summary(payloads[i], emotions_list[i]), "error": None}
+        return results
+
+    def summarize_reflections(
+        self,
+        payloads: Sequence[Mapping[str, object]],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+        caller: Optional[str] = None,
+        fallback: bool = True,
+        deadline: Optional[float] = None,
+    ) -> List[dict]:
+        """
+        여러 회고를 체인 batch 경로로 동시에 요약한다.
+        - 감정 추출은 모든 입력에 대해 체인 호출 전에 한 번에 수행
+        - 캐시에 있는 항목은 체인을 거치지 않고, 나머지만 batch 로 호출
+        - 결과는 입력 순서대로 {"result": dict | None, "error": str | None}
+        - 입력 토큰 예산을 넘는 항목은 LLM 을 부르지 않고 그 항목만 error 로 보고
+        - fallback 이면 브레이커 열림/기한 초과로 실패한 항목은 키워드 결과로 채운다
+        """
+        if not payloads:
+            return []
+        emotions_list, inputs, keys, rejected = self._prepare_batch(payloads)
+
+        raw_responses: List[object] = [
+            rejected.get(i) or (self.cache.get(k) if use_cache else None) for i, k in enumerate(keys)
+        ]
+        missing = [i for i, raw in enumerate(raw_responses) if raw is None]
+        if missing:
+            if not use_cache:
+                self.cache.stats.incr("bypasses", len(missing))
+            chain = self._limited_chain("summary", self._summary_chain(), caller, deadline)
+            fresh = chain.batch(
+                [inputs[i] for i in missing],
+                config=self._batch_config(max_concurrency),
+                return_exceptions=True,
+            )
+            self._observe_batch(inputs, missing, fresh)
+            for i, raw in zip(missing, fresh):
+                raw_responses[i] = raw if isinstance(raw, Exception) else self._store_summary(keys[i], raw)
+        results = self._batch_results(raw_responses, emotions_list)
+        return self._batch_fallbacks(results, raw_responses, payloads, emotions_list, fallback)
+
+    async def asummarize_reflections(
+        self,
+        payloads: Sequence[Mapping[str, object]],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+        caller: Optional[str] = None,
+        fallback: bool = True,
+        deadline: Optional[float] = None,
+    ) -> List[dict]:
+        """summarize_reflections 의 async 버전 (chain.abatch)."""
+        if not payloads:
+            return []
+        emotions_list, inputs, keys, rejected = self._prepare_batch(payloads)
+
+        raw_responses: List[object] = [
+            rejected.get(i) or ((await self.cache.aget(k)) if use_cache else None) for i, k in enumerate(keys)
+        ]
+        missing = [i for i, raw in enumerate(raw_responses) if raw is None]
+        if missing:
+            if not use_cache:
+                self.cache.stats.incr("bypasses", len(missing))
+            chain = self._limited_chain("summary", self._summary_chain(), caller, deadline)
+            fresh = await chain.abatch(
+                [inputs[i] for i in missing],
+                config=self._batch_config(max_concurrency),
+                return_exceptions=True,
+            )
+            self._observe_batch(inputs, missing, fresh)
+            for i, raw in zip(missing, fresh):
+                raw_responses[i] = raw if isinstance(raw, Exception) else await self._astore_summary(keys[i], raw)
+        results = self._batch_results(raw_responses, emotions_list)
+        return self._batch_fallbacks(results, raw_responses, payloads, emotions_list, fallback)
+
+    def _transcript_settings(self, chunk_tokens: Optional[int], max_concurrency: Optional[int]) -> Tuple[int, int]:
+        if chunk_tokens is None:
+            chunk_tokens = self._setting("REPORT_CHUNK_MAX_TOKENS", 3000)
+        if max_concurrency is None:
+            max_concurrency = self._setting("REPORT_CHUNK_MAX_CONCURRENCY", 4)
+        return max(1, chunk_tokens), max(1, max_concurrency)
+
+    def _transcript_emotions(self, text: str, previous: Optional[Mapping[str, Any]]) -> List[str]:
+        emotions = self._resolve_emotions({"what_happened": text})
+        if previous:
+            # 이전 요약의 감정을 앞에 두고 새 기록에서 찾은 감정을 덧붙인다 (detect_emotions 와 같은 상한).
+            emotions = list(dict.fromkeys(list(previous.get("emotions") or []) + emotions))[:3]
+        return emotions
+
+    def _transcript_chunks(self, text: str, chunk_tokens: int) -> List[str]:
+        return split_by_tokens(text, chunk_tokens) if estimate_tokens(text) > chunk_tokens else [text]
+
+    def _transcript_payload(self, text: str, emotions: List[str]) -> dict:
+        return {"what_happened": text, "emotions": emotions, "what_you_did": "", "desired_outcome": ""}
+
+    def _render_partial(self, partial: Mapping[str, Any]) -> str:
+        lines = [str(partial["summary"])]
+        lines.extend(f"- {insight}" for insight in partial["keyInsights"])
+        return "\n".join(lines)
+
+    def _reduce_groups(self, partials: List[dict], chunk_tokens: int) -> List[List[dict]]:
+        """부분 요약을 순서대로 한 번의 reduce 호출에 들어갈 만큼씩 묶는다 (묶음마다 최소 2개)."""
+        groups: List[List[dict]] = []
+        current: List[dict] = []
+        current_tokens = 0
+        for partial in partials:
+            tokens = estimate_tokens(self._render_partial(partial)) + 1
+            if len(current) >= 2 and current_tokens + tokens > chunk_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(partial)
+            current_tokens += tokens
+        if current:
+            if len(current) == 1 and groups:
+                groups[-1].append(current[0])
+            else:
+                groups.append(current)
+        return groups
+
+    def _merge_partials(self, reduced: dict, group: Sequence[dict]) -> dict:
+        """
+        결정/액션 항목은 reduce 입력(부분 요약문)이 아니라 원문 청크에서 뽑은 부분 결과의 항목을
+        순서대로 중복 없이 합친다. confidence 는 가장 낮은 값을 쓴다.
+        """
+        decisions: List[str] = []
+        actions: List[dict] = []
+        seen_actions = set()
+        for partial in group:
+            for decision in partial["decisionPoints"]:
+                if decision not in decisions:
+                    decisions.append(decision)
+            for item in partial["actionItems"]:
+                if item["text"] not in seen_actions:
+                    seen_actions.add(item["text"])
+                    actions.append(item)
+        merged = dict(reduced)
+        merged["decisionPoints"] = decisions[:MAX_MERGED_DECISIONS]
+        merged["actionItems"] = actions[:MAX_MERGED_ACTION_ITEMS]
+        merged["confidence"] = min([reduced["confidence"]] + [p["confidence"] for p in group])
+        return merged
+
+    def _raise_on_failed(self, results: Sequence[dict], stage: str, deadline: Optional[float]) -> List[dict]:
+        for i, result in enumerate(results):
+            if result["error"] is not None:
+                check_deadline(deadline)  # deadline 때문에 실패한 항목이면 그 예외로 알린다
+                raise RuntimeError(f"Failed to summarize transcript ({stage} {i + 1}/{len(results)}): {result['error']}")
+        return [result["result"] for result in results]
+
+    def summarize_transcript(
+        self,
+        text: str,
+        caller: Optional[str] = None,
+        chunk_tokens: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        previous: Optional[Mapping[str, Any]] = None,
+        deadline: Optional[float] = None,
+    ) -> dict:
+        """
+        긴 세션 기록을 map-reduce 로 요약한다. 반환 형식은 summarize_reflection 과 같다.
+        - chunk_tokens(REPORT_CHUNK_MAX_TOKENS) 이하이면 summarize_reflection 한 번 (기존과 같은 입력·캐시 키)
+        - 넘으면 청크로 나눠 batch 로 병렬 요약(map, 동시성 REPORT_CHUNK_MAX_CONCURRENCY)한 뒤,
+          부분 요약들을 한 호출에 들어갈 만큼씩 묶어 다시 요약(reduce)하기를 하나가 남을 때까지 반복
+        지연은 기록 길이가 아니라 (청크 지연 × reduce 깊이) 에 비례한다.
+        저장되는 결과이므로 키워드 결과로 대체하지 않고, LLM 실패는 RuntimeError 로 올린다.
+        감정은 전체 기록에서 한 번 추출해 모든 호출에 같게 넘기고, 결정/액션 항목은 부분 요약에서 합친다.
+
+        previous 에 이전까지의 요약(이 메서드의 반환값)을 주면 text 는 그 이후 새로 추가된 기록으로 보고,
+        새 기록의 부분 요약들 앞에 previous 를 두고 reduce 해 합친다 (증분 갱신, 비용은 새 기록 길이에 비례).
+        """
+        chunk_tokens, max_concurrency = self._transcript_settings(chunk_tokens, max_concurrency)
+        emotions = self._transcript_emotions(text, previous)
+        chunks = self._transcript_chunks(text, chunk_tokens)
+        if previous is None and len(chunks) == 1:
+            return self.summarize_reflection(
+                self._transcript_payload(text, emotions), caller=caller, fallback=False, deadline=deadline
+            )
+
+        level = self._raise_on_failed(
+            self.summarize_reflections(
+                [self._transcript_payload(chunk, emotions) for chunk in chunks],
+                max_concurrency=max_concurrency,
+                caller=caller,
+                fallback=False,
+                deadline=deadline,
+            ),
+            "chunk",
+            deadline,
+        )
+        if previous is not None:
+            level.insert(0, dict(previous))
+        while len(level) > 1:
+            groups = self._reduce_groups(level, chunk_tokens)
+            reduced = self._raise_on_failed(
+                self.summarize_reflections(
+                    [self._transcript_payload("\n".join(map(self._render_partial, g)), emotions) for g in groups],
+                    max_concurrency=max_concurrency,
+                    caller=caller,
+                    fallback=False,
+                    deadline=deadline,
+                ),
+                "reduce",
+                deadline,
+            )
+            level = [self._merge_partials(r, g) for r, g in zip(reduced, groups)]
+        return level[0]
+
+    def _conversation_fold_payload(self, previous_summary: Optional[str], turns: Sequence[Mapping[str, str]]) -> dict:
+        lines = [previous_summary] if previous_summary else []
+        lines.extend(f"{'사용자' if t['sender'] == 'user' else '상대'}: {t['text']}" for t in turns)
+        return {"what_happened": "\n".join(lines), "emotions": [], "what_you_did": "", "desired_outcome": ""}
+
+    async def afold_conversation(
+        self,
+        previous_summary: Optional[str],
+        turns: Sequence[Mapping[str, str]],
+        caller: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> str:
+        """이전 대화 요약 + 오래된 턴들을 하나의 요약문으로 접는다 (서버 측 대화의 rolling summary)."""
+        summary = await self.asummarize_reflection(
+            self._conversation_fold_payload(previous_summary, turns), caller=caller, fallback=False, deadline=deadline
+        )
+        return self._render_partial(summary)
+
+    def _build_chat_chain(self):
+        """
+        실제 대화 체인(prompt | model | parser)을 구성해 반환하세요. (서비스 생성 시 한 번만 호출됨)
+        여기서는 토큰 단위로 응답을 흘려보내는 더미 체인을 반환합니다.
+        """
+        def dummy_reply(vars):
+            reply = f"반영해 볼게요: {vars.get('message') or ''}"
+            for token in re.findall(r"\S+\s*", reply):
+                yield token
+
+        async def adummy_reply(vars):
+            for token in dummy_reply(vars):
+                yield token
+
+        return RunnableLambda(dummy_reply, afunc=adummy_reply)
+
+    def _chat_inputs(self, payload: Mapping[str, object]) -> dict:
+        return self._chat_budget.apply(payload)[0]
+
+    def generate_chat_reply(
+        self,
+        payload: Mapping[str, object],
+        caller: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> str:
+        inputs = self._chat_inputs(payload)
+        reply = str(self._invoke("chat", self._chat_chain(), inputs, caller, deadline))
+        observe_llm_call("chat", inputs, reply)
+        return reply
+
+    async def agenerate_chat_reply(
+        self,
+        payload: Mapping[str, object],
+        caller: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> str:
+        """generate_chat_reply 의 async 버전 (chain.ainvoke)."""
+        inputs = self._chat_inputs(payload)
+        reply = str(await self._ainvoke("chat", self._chat_chain(), inputs, caller, deadline))
+        observe_llm_call("chat", inputs, reply)
+        return reply
+
+    def _chunk_text(self, chunk) -> Tuple[str, Optional[dict]]:
+        chunk_usage = getattr(chunk, "usage_metadata", None)
+        text = chunk.content if hasattr(chunk, "content") else chunk
+        return str(text), (dict(chunk_usage) if chunk_usage else None)
+
+    def _done_event(self, inputs: Mapping[str, object], parts: List[str], usage: Optional[dict]) -> dict:
+        reply = "".join(parts)
+        observe_llm_call("chat", inputs, reply)
+        if usage is None:
+            usage = {
+                "input_chars": sum(len(str(v)) for v in inputs.values()),
+                "output_chars": len(reply),
+                "chunks": len(parts),
+            }
+        return {"type": "done", "reply": reply, "usage": usage}
+
+    def stream_chat_reply(
+        self,
+        payload: Mapping[str, object],
+        caller: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> Iterator[dict]:
+        """
+        체인의 stream 경로로 응답을 흘려보낸다.
+        - {"type": "token", "text": str} 를 생성 순서대로
+        - 마지막에 {"type": "done", "reply": 전체 응답, "usage": 사용량}
+        usage 는 모델 청크들의 usage_metadata 를 add_usage 로 합산한 값이고, 하나도 없으면 글자 수 기반 추정치다.
+        """
+        inputs = self._chat_inputs(payload)
+        parts: List[str] = []
+        usage: Optional[dict] = None
+        for chunk in self._stream("chat", self._chat_chain(), inputs, caller, deadline):
+            text, chunk_usage = self._chunk_text(chunk)
+            if chunk_usage:
+                usage = dict(add_usage(usage, chunk_usage))
+            if not text:
+                continue
+            parts.append(text)
+            yield {"type": "token", "text": text}
+        yield self._done_event(inputs, parts, usage)
+
+    async def astream_chat_reply(
+        self,
+        payload: Mapping[str, object],
+        caller: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[dict]:
+        """stream_chat_reply 의 async 버전 (chain.astream). 이벤트 형식은 같다."""
+        inputs = self._chat_inputs(payload)
+        parts: List[str] = []
+        usage: Optional[dict] = None
+        async for chunk in self._astream("chat", self._chat_chain(), inputs, caller, deadline):
+            text, chunk_usage = self._chunk_text(chunk)
+            if chunk_usage:
+                usage = dict(add_usage(usage, chunk_usage))
+            if not text:
+                continue
+            parts.append(text)
+            yield {"type": "token", "text": text}
+        yield self._done_event(inputs, parts, usage)
+
+
+@lru_cache
+def get_shared_langchain_service() -> LangChainService:
+    """프로세스 전역 LangChainService. 앱 시작 시 생성·워밍업되고 모든 요청/워커가 공유한다."""
+    return LangChainService(settings=get_settings())
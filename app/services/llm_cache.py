@@ -0,0 +1,318 @@
+"""
+LLM 결과 캐시.
+
+키는 정규화된 체인 입력 + 모델명 + 프롬프트 버전의 sha256 이며, 값은 체인의 원본 응답 문자열.
+- memory: 프로세스 내 LRU + TTL
+- sqlite: 파일 기반 공유 캐시 (같은 호스트의 uvicorn 워커끼리 공유)
+- redis: Redis 공유 캐시
+shared 백엔드(sqlite/redis)는 memory 캐시를 앞단(L1)에 두고 사용한다.
+async 경로(aget/aset)에서 memory 는 이벤트 루프에서 바로 처리하고, 블로킹 I/O 가 있는 shared 백엔드만 스레드로 넘긴다.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Mapping, Optional, Tuple
+
+from app.core.config import Settings, get_settings
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(unicodedata.normalize("NFC", value).split())
+    if isinstance(value, Mapping):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_cache_key(inputs: Mapping[str, object], *, model: str, prompt_version: str) -> str:
+    body = json.dumps(
+        {"model": model, "prompt": prompt_version, "inputs": _normalize(inputs)},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.sets = 0
+        self.bypasses = 0
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "sets": self.sets,
+                "bypasses": self.bypasses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+class LLMCache(ABC):
+    """캐시 백엔드 인터페이스. get/set 은 예외를 던지지 않는 것이 원칙."""
+
+    def __init__(self, stats: Optional[CacheStats] = None):
+        self.stats = stats or CacheStats()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """없거나 만료됐으면 None."""
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """저장 실패는 조용히 무시한다."""
+
+    async def aget(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+
+class NullLLMCache(LLMCache):
+    def get(self, key: str) -> Optional[str]:
+        self.stats.incr("misses")
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        pass
+
+    async def aget(self, key: str) -> Optional[str]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: str) -> None:
+        pass
+
+
+class MemoryLLMCache(LLMCache):
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, stats: Optional[CacheStats] = None):
+        super().__init__(stats)
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.stats.incr("evictions")
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def _store(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats.incr("evictions")
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._lookup(key)
+        self.stats.incr("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._store(key, value)
+        self.stats.incr("sets")
+
+    async def aget(self, key: str) -> Optional[str]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: str) -> None:
+        self.set(key, value)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteLLMCache(LLMCache):
+    """여러 프로세스가 공유하는 파일 캐시. 최대 건수를 넘으면 오래 안 쓰인 항목부터 지운다."""
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl_seconds: float = 3600, stats: Optional[CacheStats] = None):
+        super().__init__(stats)
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_used_at ON llm_cache(used_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[1] < now:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self.stats.incr("evictions")
+                    row = None
+                elif row is not None:
+                    conn.execute("UPDATE llm_cache SET used_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            row = None
+        self.stats.incr("hits" if row is not None else "misses")
+        return row[0] if row is not None else None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+                    (key, value, now + self.ttl_seconds, now),
+                )
+                cur = conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+                evicted = cur.rowcount
+                cur = conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                evicted += cur.rowcount
+        except sqlite3.Error:
+            return
+        self.stats.incr("sets")
+        if evicted > 0:
+            self.stats.incr("evictions", evicted)
+
+
+class RedisLLMCache(LLMCache):
+    """Redis 공유 캐시. 만료는 Redis TTL 에 맡긴다."""
+
+    def __init__(self, redis_url: str, ttl_seconds: float = 3600, prefix: str = "llm-cache:", stats: Optional[CacheStats] = None):
+        super().__init__(stats)
+        from redis import Redis
+
+        self._redis = Redis.from_url(redis_url)
+        self.ttl_seconds = int(ttl_seconds)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            raw = self._redis.get(self.prefix + key)
+        except Exception:
+            raw = None
+        self.stats.incr("hits" if raw is not None else "misses")
+        if raw is None:
+            return None
+        return raw.decode("utf-8") if isinstance(raw, bytes) else raw
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self._redis.setex(self.prefix + key, self.ttl_seconds, value)
+        except Exception:
+            return
+        self.stats.incr("sets")
+
+
+class TieredLLMCache(LLMCache):
+    """memory(L1) + shared(L2). 통계는 L1/L2 를 합친 최종 결과 기준."""
+
+    def __init__(self, front: MemoryLLMCache, back: LLMCache):
+        super().__init__(front.stats)
+        self.front = front
+        self.back = back
+        # L2 의 조회 결과는 별도로 집계해 전체 hit/miss 에 중복 반영되지 않게 한다.
+        self.back.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.front._lookup(key)
+        if value is None:
+            value = self.back.get(key)
+            if value is not None:
+                self.front._store(key, value)
+        self.stats.incr("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.front.set(key, value)
+        self.back.set(key, value)
+
+    async def aget(self, key: str) -> Optional[str]:
+        value = self.front._lookup(key)
+        if value is None:
+            value = await self.back.aget(key)
+            if value is not None:
+                self.front._store(key, value)
+        self.stats.incr("hits" if value is not None else "misses")
+        return value
+
+    async def aset(self, key: str, value: str) -> None:
+        self.front.set(key, value)
+        await self.back.aset(key, value)
+
+    def snapshot(self) -> Dict[str, float]:
+        stats = self.stats.snapshot()
+        stats["shared"] = self.back.stats.snapshot()
+        return stats
+
+
+def build_llm_cache(settings: Settings) -> LLMCache:
+    backend = settings.LLM_CACHE_BACKEND.lower()
+    if backend == "none":
+        return NullLLMCache()
+    memory = MemoryLLMCache(settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL_SECONDS)
+    if backend == "memory":
+        return memory
+    if backend == "sqlite":
+        shared: LLMCache = SQLiteLLMCache(
+            settings.LLM_CACHE_SQLITE_PATH,
+            max_entries=settings.LLM_CACHE_SHARED_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        )
+    elif backend == "redis":
+        shared = RedisLLMCache(settings.REDIS_URL, ttl_seconds=settings.LLM_CACHE_TTL_SECONDS)
+    else:
+        raise ValueError(f"Unknown LLM_CACHE_BACKEND: {settings.LLM_CACHE_BACKEND}")
+    return TieredLLMCache(memory, shared)
+
+
+def cache_stats(cache: LLMCache) -> Dict[str, float]:
+    if isinstance(cache, TieredLLMCache):
+        return cache.snapshot()
+    return cache.stats.snapshot()
+
+
+@lru_cache
+def get_llm_cache() -> LLMCache:
+    return build_llm_cache(get_settings())
@@ -0,0 +1,327 @@
+"""
+LLM 호출 admission control.
+
+모든 체인 호출은 (호출자별 → 전역) 순서로 두 가지 제한을 통과해야 한다.
+- 토큰 버킷: 초당 호출 수. 토큰이 없으면 기다리지 않고 바로 거절 (Retry-After = 다음 토큰까지 남은 시간)
+- 동시 실행 수: 자리가 없으면 제한된 대기열에서 기다린다. 대기열이 가득 찼거나 대기 시간이
+  LLM_QUEUE_TIMEOUT_SECONDS 를 넘으면 거절
+거절은 LLMRateLimited (라우트에서 429 + Retry-After) 로 알린다.
+
+async 라우트와 리포트 워커 스레드가 같은 한도를 공유하므로, 대기는 스레드/코루틴 모두에서 동작한다.
+호출자 키는 인증 사용자면 "user:<id>", 아니면 "ip:<주소>" (dependencies.get_llm_caller).
+호출자별 한도는 기본으로 인증 사용자에게만 적용한다. 주소는 request.client 이므로 프록시 뒤에서는
+uvicorn --proxy-headers/--forwarded-allow-ips 로 신뢰 프록시의 X-Forwarded-For 를 반영한 뒤에만
+limit_anonymous_callers 를 켠다 — 그렇지 않으면 익명 호출자 전체가 프록시 IP 하나의 한도를 나눠 쓴다.
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Deque, Dict, Optional, Tuple
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY
+
+ADMISSION_TOTAL = REGISTRY.counter(
+    "llm_admission_total",
+    "LLM call admission decisions by scope (global/user) and result.",
+    ("scope", "result"),
+)
+ADMISSION_WAIT_SECONDS = REGISTRY.histogram(
+    "llm_admission_wait_seconds",
+    "Time LLM calls spent queued for a concurrency slot.",
+    ("scope",),
+)
+
+
+class LLMRateLimited(RuntimeError):
+    """LLM 호출 한도 초과. retry_after 초 뒤 재시도하라는 의미 (라우트에서 429)."""
+
+    def __init__(self, message: str, retry_after: float = 1.0, scope: str = "global"):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.scope = scope
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.capacity = max(1.0, float(burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_take(self) -> float:
+        """토큰을 하나 가져오면 0, 없으면 다음 토큰까지 남은 초."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def refund(self) -> None:
+        """try_take 로 가져간 토큰을 돌려준다."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+
+class _Waiter:
+    __slots__ = ("granted", "event", "loop", "future")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.granted = False
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future: Optional[asyncio.Future] = loop.create_future() if loop is not None else None
+
+    def wake(self) -> None:
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ConcurrencyLimiter:
+    """
+    동시 실행 수 제한 + 제한된 FIFO 대기열. 스레드(acquire)와 코루틴(aacquire)이 같은 자리를 나눠 쓴다.
+    release 시 자리를 대기 중인 첫 호출자에게 바로 넘겨 새로 온 호출이 끼어들지 못하게 한다.
+    """
+
+    def __init__(self, limit: int, max_waiting: int, scope: str = "global"):
+        self.limit = max(1, limit)
+        self.max_waiting = max(0, max_waiting)
+        self.scope = scope
+        self.active = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def idle(self) -> bool:
+        return self.active == 0 and not self._waiters
+
+    def _try_enter(self, waiter_factory) -> Optional[_Waiter]:
+        """자리가 있으면 None(바로 입장), 없으면 대기열에 넣은 waiter. 대기열이 가득 차면 거절."""
+        with self._lock:
+            if self.active < self.limit and not self._waiters:
+                self.active += 1
+                ADMISSION_TOTAL.inc(1, self.scope, "admitted")
+                return None
+            if len(self._waiters) >= self.max_waiting:
+                ADMISSION_TOTAL.inc(1, self.scope, "rejected_queue_full")
+                raise LLMRateLimited("Too many concurrent LLM requests, try again shortly", 1.0, self.scope)
+            waiter = waiter_factory()
+            self._waiters.append(waiter)
+            ADMISSION_TOTAL.inc(1, self.scope, "queued")
+            return waiter
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """대기를 포기한다. 이미 자리를 넘겨받았으면 False (호출자가 release 해야 함)."""
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._waiters.remove(waiter)
+            return True
+
+    def acquire(self, timeout: float) -> None:
+        waiter = self._try_enter(_Waiter)
+        if waiter is None:
+            return
+        started = time.perf_counter()
+        waiter.event.wait(timeout)
+        ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - started, self.scope)
+        if not waiter.granted and self._abandon(waiter):
+            ADMISSION_TOTAL.inc(1, self.scope, "rejected_timeout")
+            raise LLMRateLimited("Timed out waiting for an LLM slot", 1.0, self.scope)
+
+    async def aacquire(self, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = self._try_enter(lambda: _Waiter(loop))
+        if waiter is None:
+            return
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            if not self._abandon(waiter):
+                self.release()
+            raise
+        finally:
+            ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - started, self.scope)
+        if not waiter.granted and self._abandon(waiter):
+            ADMISSION_TOTAL.inc(1, self.scope, "rejected_timeout")
+            raise LLMRateLimited("Timed out waiting for an LLM slot", 1.0, self.scope)
+
+    def release(self) -> None:
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.granted = True  # active 수는 그대로, 자리만 넘긴다
+            else:
+                self.active -= 1
+                return
+        waiter.wake()
+
+
+class _Limits:
+    """한 범위(전역 또는 호출자 1명)의 토큰 버킷 + 동시 실행 제한. 0 이면 해당 제한 없음."""
+
+    def __init__(self, scope: str, concurrency: int, max_waiting: int, rate: float, burst: int):
+        self.scope = scope
+        self.bucket = TokenBucket(rate, burst or max(1, math.ceil(rate))) if rate > 0 else None
+        self.slots = ConcurrencyLimiter(concurrency, max_waiting, scope) if concurrency > 0 else None
+
+    def take_token(self) -> None:
+        if self.bucket is None:
+            return
+        wait = self.bucket.try_take()
+        if wait > 0:
+            ADMISSION_TOTAL.inc(1, self.scope, "rejected_rate")
+            raise LLMRateLimited("LLM request rate limit exceeded", wait, self.scope)
+
+    def refund_token(self) -> None:
+        if self.bucket is not None:
+            self.bucket.refund()
+
+    @property
+    def idle(self) -> bool:
+        return self.slots is None or self.slots.idle
+
+
+class LLMLimiter:
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 0,
+        max_waiting: int = 0,
+        rate_per_second: float = 0,
+        rate_burst: int = 0,
+        user_max_concurrency: int = 0,
+        user_max_waiting: int = 0,
+        user_rate_per_second: float = 0,
+        user_rate_burst: int = 0,
+        limit_anonymous_callers: bool = False,
+        queue_timeout: float = 10.0,
+        max_tracked_callers: int = 10000,
+    ):
+        self.queue_timeout = queue_timeout
+        self.max_tracked_callers = max(1, max_tracked_callers)
+        self._global = _Limits("global", max_concurrency, max_waiting, rate_per_second, rate_burst)
+        self._user_config = (user_max_concurrency, user_max_waiting, user_rate_per_second, user_rate_burst)
+        self.limit_anonymous_callers = limit_anonymous_callers
+        self._callers: "OrderedDict[str, _Limits]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _caller_limits(self, caller: Optional[str]) -> Optional[_Limits]:
+        concurrency, _, rate, _ = self._user_config
+        if caller is None or (concurrency <= 0 and rate <= 0):
+            return None
+        if caller.startswith("ip:") and not self.limit_anonymous_callers:
+            return None
+        with self._lock:
+            limits = self._callers.get(caller)
+            if limits is None:
+                limits = _Limits("user", *self._user_config)
+                self._callers[caller] = limits
+                # 오래 안 쓰인 호출자부터 정리하되, 실행/대기 중인 호출자는 남긴다.
+                if len(self._callers) > self.max_tracked_callers:
+                    for key in [k for k, v in self._callers.items() if v.idle][: len(self._callers) - self.max_tracked_callers]:
+                        del self._callers[key]
+            else:
+                self._callers.move_to_end(caller)
+            return limits
+
+    def _admission_plan(self, caller: Optional[str]) -> Tuple[_Limits, ...]:
+        user = self._caller_limits(caller)
+        plan = (user, self._global) if user is not None else (self._global,)
+        # 토큰은 대기열에 들어가기 전에 확인한다 (거절 시 자리를 잡지 않음).
+        taken = []
+        try:
+            for limits in plan:
+                limits.take_token()
+                taken.append(limits)
+        except LLMRateLimited:
+            # 전역에서 거절되면 호출자 토큰을 돌려준다 (호출자 한도를 쓰지 않은 요청으로 친다).
+            for limits in taken:
+                limits.refund_token()
+            raise
+        return tuple(limits for limits in plan if limits.slots is not None)
+
+    def acquire(self, caller: Optional[str] = None) -> Tuple[_Limits, ...]:
+        """동기 경로. 반환값을 release 에 넘긴다."""
+        held = []
+        try:
+            for limits in self._admission_plan(caller):
+                limits.slots.acquire(self.queue_timeout)
+                held.append(limits)
+        except BaseException:
+            self.release(tuple(held))
+            raise
+        return tuple(held)
+
+    async def aacquire(self, caller: Optional[str] = None) -> Tuple[_Limits, ...]:
+        held = []
+        try:
+            for limits in self._admission_plan(caller):
+                await limits.slots.aacquire(self.queue_timeout)
+                held.append(limits)
+        except BaseException:
+            self.release(tuple(held))
+            raise
+        return tuple(held)
+
+    def release(self, held: Tuple[_Limits, ...]) -> None:
+        for limits in reversed(held):
+            limits.slots.release()
+
+    def stats(self) -> Dict[str, float]:
+        slots = self._global.slots
+        with self._lock:
+            callers = list(self._callers.values())
+        return {
+            "global_limit": slots.limit if slots else 0,
+            "global_active": slots.active if slots else 0,
+            "global_waiting": slots.waiting if slots else 0,
+            "tracked_callers": len(callers),
+            "user_active": sum(c.slots.active for c in callers if c.slots is not None),
+            "user_waiting": sum(c.slots.waiting for c in callers if c.slots is not None),
+        }
+
+
+def build_llm_limiter(settings: Settings) -> LLMLimiter:
+    return LLMLimiter(
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        max_waiting=settings.LLM_MAX_WAITING,
+        rate_per_second=settings.LLM_RATE_PER_SECOND,
+        rate_burst=settings.LLM_RATE_BURST,
+        user_max_concurrency=settings.LLM_USER_MAX_CONCURRENCY,
+        user_max_waiting=settings.LLM_USER_MAX_WAITING,
+        user_rate_per_second=settings.LLM_USER_RATE_PER_SECOND,
+        user_rate_burst=settings.LLM_USER_RATE_BURST,
+        limit_anonymous_callers=settings.LLM_USER_LIMIT_ANONYMOUS,
+        queue_timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+    )
+
+
+@lru_cache
+def get_llm_limiter() -> LLMLimiter:
+    return build_llm_limiter(get_settings())
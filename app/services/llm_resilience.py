@@ -0,0 +1,517 @@
+"""
+LLM 호출 복원력: 호출 기한, 지터 재시도, (선택) 헤지 요청, 체인별 서킷 브레이커.
+
+- 기한: 체인 호출 한 번(재시도·헤지 포함)은 LLM_CALL_TIMEOUT_SECONDS 안에 끝나야 한다. 넘으면 LLMTimeout.
+  요청 deadline(app.core.deadline)이 더 이르면 그때까지만 기다리고 RequestDeadlineExceeded
+  (요청 쪽 사정이므로 브레이커 실패로 세지 않고 키워드 결과로 대체하지도 않는다)
+- 재시도: 일시적 오류(타임아웃, 연결 오류, 408/429/5xx)만 LLM_RETRY_ATTEMPTS 번까지 full jitter 지수 백오프로.
+  admission 거절(LLMRateLimited)과 입력/파싱 오류는 재시도하지 않는다
+- 헤지: LLM_HEDGE_ENABLED 이면 최근 성공 지연의 p95 가 지나도록 응답이 없을 때 같은 요청을 한 번 더 보내
+  먼저 성공한 쪽을 쓴다 (스트리밍 제외)
+- 서킷 브레이커: 일시적 오류로 끝난 호출이 LLM_BREAKER_FAILURE_THRESHOLD 번 연속되면 열리고,
+  LLM_BREAKER_RESET_SECONDS 동안은 호출하지 않고 바로 LLMUnavailable. 그 뒤 한 호출만 시험(half-open)해
+  성공하면 닫고 실패하면 다시 연다
+
+LLMUnavailable/LLMTimeout 은 RuntimeError 이므로 라우트에서는 기존처럼 503 이고,
+요약 경로는 LangChainService 가 키워드 기반 결과(낮은 confidence)로 대체한다.
+
+동기 경로는 기한·헤지를 위해 체인 호출을 전용 스레드풀(LLM_CALL_EXECUTOR_WORKERS)에서 실행한다.
+기한이 지나거나 헤지에서 지면 아직 시작하지 않은 시도는 취소하지만, 이미 시작한 스레드의 호출은 멈출 수 없으므로
+끝날 때까지 돌고(LLM 자리·풀 스레드도 그동안 잡고 있음) 결과는 버린다. 그런 시도 수는 abandoned 로 센다.
+"""
+import asyncio
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from functools import lru_cache
+from typing import Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional, TypeVar
+
+from app.core.config import Settings, get_settings
+from app.core.deadline import RequestDeadlineExceeded, check_deadline, remaining
+from app.core.metrics import REGISTRY
+from app.services.llm_limiter import LLMRateLimited
+
+T = TypeVar("T")
+
+CALLS_TOTAL = REGISTRY.counter(
+    "llm_calls_total",
+    "LLM chain calls by outcome (success, error, timeout, deadline, cancelled, rejected_open).",
+    ("chain", "outcome"),
+)
+RETRIES_TOTAL = REGISTRY.counter(
+    "llm_retries_total",
+    "LLM call attempts retried after a transient error.",
+    ("chain",),
+)
+HEDGES_TOTAL = REGISTRY.counter(
+    "llm_hedged_requests_total",
+    "Hedged second LLM requests sent, and how many of them answered first.",
+    ("chain", "result"),
+)
+BREAKER_TRANSITIONS_TOTAL = REGISTRY.counter(
+    "llm_circuit_transitions_total",
+    "LLM circuit breaker state changes.",
+    ("chain", "state"),
+)
+FALLBACK_TOTAL = REGISTRY.counter(
+    "llm_fallback_total",
+    "Summaries served from the keyword path instead of the LLM, by reason (open, timeout, error).",
+    ("chain", "reason"),
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+BREAKER_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+# 선택 의존성(google-api-core, httpx 등)을 import 하지 않고 이름으로 판별한다.
+RETRYABLE_ERROR_NAMES = frozenset(
+    {
+        "DeadlineExceeded",
+        "ServiceUnavailable",
+        "ResourceExhausted",
+        "InternalServerError",
+        "TooManyRequests",
+        "GatewayTimeout",
+        "ReadTimeout",
+        "ConnectTimeout",
+        "ConnectError",
+        "RemoteProtocolError",
+    }
+)
+
+LATENCY_WINDOW = 200
+MIN_HEDGE_DELAY_SECONDS = 0.05
+
+
+class LLMUnavailable(RuntimeError):
+    """서킷 브레이커가 열려 있어 LLM 을 부르지 않았다. retry_after 초 뒤 다시 시험한다."""
+
+    def __init__(self, chain: str, retry_after: float):
+        super().__init__(f"LLM {chain} chain is temporarily unavailable (circuit open)")
+        self.chain = chain
+        self.retry_after = retry_after
+
+
+class _Deadline(NamedTuple):
+    at: Optional[float]  # time.monotonic() 기준
+    from_request: bool  # 요청 deadline 이 LLM_CALL_TIMEOUT_SECONDS 보다 이르면 True
+
+
+class LLMTimeout(RuntimeError):
+    """호출 기한 안에 응답을 받지 못했다."""
+
+    def __init__(self, chain: str, timeout: float):
+        super().__init__(f"LLM {chain} call did not finish within {timeout:g}s")
+        self.chain = chain
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (LLMRateLimited, LLMUnavailable)):
+        return False
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError, ConnectionError, LLMTimeout)):
+        return True
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int) and status in RETRYABLE_STATUS_CODES:
+        return True
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+def fallback_reason(exc: BaseException) -> Optional[str]:
+    """키워드 결과로 대체할 오류면 이유(open/timeout/error), 아니면(입력 오류·429 등) None."""
+    if isinstance(exc, LLMUnavailable):
+        return "open"
+    if isinstance(exc, (LLMTimeout, TimeoutError, asyncio.TimeoutError)):
+        return "timeout"
+    if is_retryable(exc):
+        return "error"
+    return None
+
+
+def _keep_waiting(error: BaseException, pending) -> bool:
+    """헤지 중 한쪽이 실패했을 때 남은 요청을 계속 기다릴지 (일시적 오류나 헤지의 admission 거절이면)."""
+    return bool(pending) and (is_retryable(error) or isinstance(error, LLMRateLimited))
+
+
+class CircuitBreaker:
+    def __init__(self, chain: str, failure_threshold: int, reset_seconds: float):
+        self.chain = chain
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            BREAKER_TRANSITIONS_TOTAL.inc(1, self.chain, state)
+
+    def before_call(self) -> None:
+        """호출해도 되면 그대로, 열려 있으면 LLMUnavailable. half-open 에서는 시험 호출 하나만 통과시킨다."""
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if self.state == OPEN and remaining <= 0:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+        CALLS_TOTAL.inc(1, self.chain, "rejected_open")
+        raise LLMUnavailable(self.chain, max(remaining, 1.0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._probing = False
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def record_ignored(self) -> None:
+        """브레이커 판단과 무관한 결과(입력 오류, admission 거절). half-open 시험 자리만 돌려준다."""
+        with self._lock:
+            self._probing = False
+
+
+class LatencyTracker:
+    """최근 성공 호출 지연 (헤지 기준 p95)."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples or len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(q * len(samples)) - 1)]
+
+
+class LLMResilience:
+    def __init__(
+        self,
+        *,
+        timeout: float = 0,
+        retry_attempts: int = 0,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        hedge_enabled: bool = False,
+        hedge_min_samples: int = 20,
+        breaker_failure_threshold: int = 0,
+        breaker_reset_seconds: float = 30.0,
+        executor_workers: int = 32,
+    ):
+        self.timeout = timeout
+        self.retry_attempts = max(0, retry_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_samples = max(1, hedge_min_samples)
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self.executor_workers = max(1, executor_workers)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._abandoned = 0
+        self._lock = threading.Lock()
+
+    def breaker(self, chain: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(chain)
+            if breaker is None:
+                breaker = CircuitBreaker(chain, self.breaker_failure_threshold, self.breaker_reset_seconds)
+                self._breakers[chain] = breaker
+            return breaker
+
+    def _tracker(self, chain: str) -> LatencyTracker:
+        with self._lock:
+            return self._latencies.setdefault(chain, LatencyTracker())
+
+    def observe_latency(self, chain: str, seconds: float) -> None:
+        """체인 자체 실행 시간(자리 대기 제외). 헤지 지연 계산에 쓴다."""
+        self._tracker(chain).observe(seconds)
+
+    def hedge_delay(self, chain: str) -> Optional[float]:
+        if not self.hedge_enabled:
+            return None
+        p95 = self._tracker(chain).percentile(0.95, self.hedge_min_samples)
+        return None if p95 is None else max(MIN_HEDGE_DELAY_SECONDS, p95)
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _deadline(self, request_deadline: Optional[float]) -> _Deadline:
+        own = time.monotonic() + self.timeout if self.timeout > 0 else None
+        if request_deadline is None:
+            return _Deadline(own, False)
+        check_deadline(request_deadline)
+        at = time.monotonic() + remaining(request_deadline)
+        if own is not None and own <= at:
+            return _Deadline(own, False)
+        return _Deadline(at, True)
+
+    def _expired(self, chain: str, deadline: _Deadline) -> Exception:
+        if deadline.from_request:
+            return RequestDeadlineExceeded(f"Request deadline exceeded during the LLM {chain} call")
+        return LLMTimeout(chain, self.timeout)
+
+    def _record(self, chain: str, exc: Optional[BaseException]) -> None:
+        breaker = self.breaker(chain)
+        if exc is not None and not isinstance(exc, Exception):
+            # 취소(클라이언트 연결 끊김, 스트림 중단)는 LLM 상태와 무관하다.
+            CALLS_TOTAL.inc(1, chain, "cancelled")
+            breaker.record_ignored()
+        elif isinstance(exc, RequestDeadlineExceeded):
+            CALLS_TOTAL.inc(1, chain, "deadline")
+            breaker.record_ignored()
+        elif exc is None:
+            CALLS_TOTAL.inc(1, chain, "success")
+            breaker.record_success()
+        elif is_retryable(exc):
+            CALLS_TOTAL.inc(1, chain, "timeout" if isinstance(exc, LLMTimeout) else "error")
+            breaker.record_failure()
+        else:
+            CALLS_TOTAL.inc(1, chain, "error")
+            breaker.record_ignored()
+
+    def guard(self, chain: str, deadline: Optional[float] = None) -> Callable[[Optional[BaseException]], None]:
+        """
+        재시도/헤지/기한 없이 브레이커만 적용한다 (스트리밍: 일부를 보낸 뒤에는 다시 보낼 수 없다).
+        호출 전에 부르고, 반환된 함수에 결과(성공이면 None, 실패·취소면 예외)를 넘긴다.
+        요청 deadline 은 시작 전에만 확인한다 (스트림 도중 취소는 라우트/클라이언트 연결 끊김이 맡는다).
+        """
+        check_deadline(deadline)
+        self.breaker(chain).before_call()
+        return lambda exc: self._record(chain, exc)
+
+    # ---- 동기 경로 ----
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.executor_workers, thread_name_prefix="llm-call")
+            return self._executor
+
+    def _abandon(self, futures: List[Future]) -> None:
+        """더 기다리지 않을 시도들. 시작 전이면 취소하고, 이미 도는 것은 끝날 때까지 abandoned 로 센다."""
+        for future in futures:
+            if future.cancel():
+                continue
+            with self._lock:
+                self._abandoned += 1
+            future.add_done_callback(self._abandoned_done)
+
+    def _abandoned_done(self, _: Future) -> None:
+        with self._lock:
+            self._abandoned -= 1
+
+    def _run_attempt(self, chain: str, attempt: Callable[[], T], deadline: _Deadline) -> T:
+        hedge_delay = self.hedge_delay(chain)
+        if deadline.at is None and hedge_delay is None:
+            return attempt()
+        pool = self._pool()
+        first = pool.submit(attempt)
+        futures: List[Future] = [first]
+        try:
+            return self._wait_attempts(chain, attempt, deadline, hedge_delay, pool, futures)
+        finally:
+            self._abandon(futures)
+
+    def _wait_attempts(
+        self,
+        chain: str,
+        attempt: Callable[[], T],
+        deadline: _Deadline,
+        hedge_delay: Optional[float],
+        pool: ThreadPoolExecutor,
+        futures: List[Future],
+    ) -> T:
+        first = futures[0]
+        hedged = False
+        last_error: Optional[BaseException] = None
+        while futures:
+            wait = None if deadline.at is None else max(0.0, deadline.at - time.monotonic())
+            if hedge_delay is not None and not hedged:
+                wait = hedge_delay if wait is None else min(wait, hedge_delay)
+            done, _ = wait_futures(futures, timeout=wait, return_when=FIRST_COMPLETED)
+            for future in done:
+                futures.remove(future)
+                error = future.exception()
+                if error is None:
+                    if future is not first:
+                        HEDGES_TOTAL.inc(1, chain, "won")
+                    return future.result()
+                if not _keep_waiting(error, futures):
+                    raise error
+                last_error = error
+            if done:
+                continue
+            if deadline.at is not None and time.monotonic() >= deadline.at:
+                raise self._expired(chain, deadline)
+            if not hedged:
+                hedged = True
+                HEDGES_TOTAL.inc(1, chain, "sent")
+                futures.append(pool.submit(attempt))
+        raise last_error
+
+    def call(self, chain: str, attempt: Callable[[], T], deadline: Optional[float] = None) -> T:
+        """
+        attempt() 를 기한·재시도·헤지·브레이커를 적용해 실행한다 (동기).
+        deadline 은 요청 deadline (time.time() 기준 절대 시각, app.core.deadline).
+        """
+        deadline = self._deadline(deadline)
+        self.breaker(chain).before_call()
+        for n in range(self.retry_attempts + 1):
+            try:
+                result = self._run_attempt(chain, attempt, deadline)
+            except Exception as exc:
+                delay = self._backoff(n)
+                last = n == self.retry_attempts or not is_retryable(exc) or isinstance(exc, LLMTimeout)
+                if not last and deadline.at is not None and time.monotonic() + delay >= deadline.at:
+                    last = True
+                if last:
+                    self._record(chain, exc)
+                    raise
+                RETRIES_TOTAL.inc(1, chain)
+                time.sleep(delay)
+                continue
+            self._record(chain, None)
+            return result
+        raise AssertionError("unreachable")
+
+    # ---- async 경로 ----
+
+    async def _arun_attempt(self, chain: str, attempt: Callable[[], Awaitable[T]], deadline: _Deadline) -> T:
+        hedge_delay = self.hedge_delay(chain)
+        if hedge_delay is None:
+            if deadline.at is None:
+                return await attempt()
+            try:
+                return await asyncio.wait_for(attempt(), max(0.0, deadline.at - time.monotonic()))
+            except asyncio.TimeoutError:
+                raise self._expired(chain, deadline) from None
+
+        first = asyncio.ensure_future(attempt())
+        tasks = {first}
+        hedged = False
+        last_error: Optional[BaseException] = None
+        try:
+            while tasks:
+                wait = None if deadline.at is None else max(0.0, deadline.at - time.monotonic())
+                if not hedged:
+                    wait = hedge_delay if wait is None else min(wait, hedge_delay)
+                done, tasks = await asyncio.wait(tasks, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is not first:
+                            HEDGES_TOTAL.inc(1, chain, "won")
+                        return task.result()
+                    if not _keep_waiting(error, tasks):
+                        raise error
+                    last_error = error
+                if done:
+                    continue
+                if deadline.at is not None and time.monotonic() >= deadline.at:
+                    raise self._expired(chain, deadline)
+                if not hedged:
+                    hedged = True
+                    HEDGES_TOTAL.inc(1, chain, "sent")
+                    tasks.add(asyncio.ensure_future(attempt()))
+            raise last_error
+        finally:
+            # 진 쪽(또는 기한 초과 시 전부)은 취소해 LLM 자리를 바로 돌려준다.
+            for task in tasks:
+                task.cancel()
+
+    async def acall(self, chain: str, attempt: Callable[[], Awaitable[T]], deadline: Optional[float] = None) -> T:
+        """call 의 async 버전. 기한이 지나거나 헤지에서 진 호출은 취소된다."""
+        deadline = self._deadline(deadline)
+        self.breaker(chain).before_call()
+        for n in range(self.retry_attempts + 1):
+            try:
+                result = await self._arun_attempt(chain, attempt, deadline)
+            except asyncio.CancelledError as exc:
+                self._record(chain, exc)
+                raise
+            except Exception as exc:
+                delay = self._backoff(n)
+                last = n == self.retry_attempts or not is_retryable(exc) or isinstance(exc, LLMTimeout)
+                if not last and deadline.at is not None and time.monotonic() + delay >= deadline.at:
+                    last = True
+                if last:
+                    self._record(chain, exc)
+                    raise
+                RETRIES_TOTAL.inc(1, chain)
+                await asyncio.sleep(delay)
+                continue
+            self._record(chain, None)
+            return result
+        raise AssertionError("unreachable")
+
+    def stats(self) -> Dict[str, str]:
+        """체인별 브레이커 상태."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.chain: breaker.state for breaker in breakers}
+
+    def executor_stats(self) -> Dict[str, int]:
+        """동기 경로 스레드풀 크기와, 기한 초과·헤지 패배로 버려졌지만 아직 스레드를 잡고 있는 시도 수."""
+        with self._lock:
+            return {"workers": self.executor_workers, "abandoned": self._abandoned}
+
+
+def executor_workers(settings: Settings) -> int:
+    """
+    LLM_CALL_EXECUTOR_WORKERS 가 0 이면 동기 호출이 나오는 곳(리포트 워커 스레드 × 청크 batch 동시성)에서 정한다.
+    헤지면 호출마다 시도가 둘이고, 버려진 시도가 끝날 때까지 스레드를 잡고 있으므로 그만큼 두 배로 둔다.
+    """
+    if settings.LLM_CALL_EXECUTOR_WORKERS > 0:
+        return settings.LLM_CALL_EXECUTOR_WORKERS
+    attempts_per_call = 2 if settings.LLM_HEDGE_ENABLED else 1
+    calls = max(1, settings.REPORT_QUEUE_WORKERS) * max(1, settings.REPORT_CHUNK_MAX_CONCURRENCY)
+    return calls * attempts_per_call * 2
+
+
+def build_llm_resilience(settings: Settings) -> LLMResilience:
+    return LLMResilience(
+        timeout=settings.LLM_CALL_TIMEOUT_SECONDS,
+        retry_attempts=settings.LLM_RETRY_ATTEMPTS,
+        backoff_base=settings.LLM_RETRY_BACKOFF_SECONDS,
+        backoff_max=settings.LLM_RETRY_BACKOFF_MAX_SECONDS,
+        hedge_enabled=settings.LLM_HEDGE_ENABLED,
+        hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+        breaker_failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+        breaker_reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+        executor_workers=executor_workers(settings),
+    )
+
+
+@lru_cache
+def get_llm_resilience() -> LLMResilience:
+    return build_llm_resilience(get_settings())
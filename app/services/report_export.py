@@ -0,0 +1,122 @@
+"""
+리포트 NDJSON 내보내기 (GET /reports/export, python -m worker.export_reports).
+
+한 줄에 리포트 하나(GET /reports/{id} 와 같은 json 문서)를 report_id 순으로 쓴다. 압축 저장된 본문은
+저장 시 render_json_body 로 검증·렌더링된 문서이므로 풀기만 하고, 텍스트 컬럼 행은 render_json_body 가
+report_json 을 검증해(깨졌으면 {}, 줄바꿈이 있으면 한 줄로) 이어 붙인다.
+batch_size 행마다 체크포인트 줄 {"checkpoint": {"after": <마지막 report_id>, "exported": <누적 행 수>, "done": false}}
+을 쓰고, 끝까지 쓰면 "done": true 인 체크포인트로 끝난다. 끊긴 내보내기는 마지막 체크포인트의 after 부터 다시 받는다.
+
+DB 는 yield_per 로 batch_size 행씩 읽고 한 덩어리씩 내보내므로, 메모리는 전체 행 수와 무관하게 batch 하나 크기다.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterator, List, NamedTuple, Optional
+
+from app.db.session import get_async_sessionmaker
+from app.models.report import Report
+from app.repositories.report_repository import AsyncReportRepository, ReportRepository
+from app.services.report_storage import decoded_body
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_KEY = "checkpoint"
+CHECKPOINT_PREFIX = b'{"' + CHECKPOINT_KEY.encode("ascii") + b'"'
+
+
+class ExportFilter(NamedTuple):
+    since: Optional[datetime] = None  # created_at 이상 (naive UTC)
+    until: Optional[datetime] = None  # created_at 미만 (naive UTC)
+    status: Optional[str] = None
+    session_id: Optional[str] = None
+    after: Optional[int] = None  # 이 report_id 다음부터 (체크포인트)
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """created_at 은 naive UTC 로 저장되므로, 시간대가 있는 값은 UTC 로 바꾼 뒤 시간대를 뗀다."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def checkpoint_line(after: Optional[int], exported: int, done: bool = False) -> bytes:
+    checkpoint = {CHECKPOINT_KEY: {"after": after, "exported": exported, "done": done}}
+    return json.dumps(checkpoint).encode("utf-8") + b"\n"
+
+
+class _Chunker:
+    """리포트 줄을 모아 batch_size 행마다 (리포트 줄들 + 체크포인트 줄) 한 덩어리로 내보낸다."""
+
+    def __init__(self, filters: ExportFilter, batch_size: int, exported: int = 0):
+        self.batch_size = max(1, batch_size)
+        self.after = filters.after
+        self.exported = exported
+        self._lines: List[bytes] = []
+
+    def add(self, report: Report) -> Optional[bytes]:
+        self._lines.append(decoded_body(report, "json") + b"\n")
+        self.after = report.report_id
+        self.exported += 1
+        if len(self._lines) < self.batch_size:
+            return None
+        return self._flush(done=False)
+
+    def finish(self) -> bytes:
+        return self._flush(done=True)
+
+    def _flush(self, done: bool) -> bytes:
+        self._lines.append(checkpoint_line(self.after, self.exported, done))
+        chunk = b"".join(self._lines)
+        self._lines = []
+        return chunk
+
+
+def iter_export_chunks(
+    repository: ReportRepository,
+    filters: ExportFilter,
+    batch_size: int,
+    exported: int = 0,
+) -> Iterator[bytes]:
+    """동기 세션용 (CLI). exported 는 이어 쓸 때 체크포인트의 누적 행 수를 이어 가기 위한 시작값."""
+    chunker = _Chunker(filters, batch_size, exported)
+    for report in repository.iter_export(**filters._asdict(), batch_size=chunker.batch_size):
+        chunk = chunker.add(report)
+        if chunk is not None:
+            yield chunk
+    yield chunker.finish()
+
+
+async def aiter_export_chunks(filters: ExportFilter, batch_size: int) -> AsyncIterator[bytes]:
+    """
+    StreamingResponse 용. 요청 세션은 응답을 보내기 전에 닫히므로 자체 세션을 연다.
+    응답 헤더를 보낸 뒤라 도중 실패는 상태 코드로 알릴 수 없다. 로그를 남기고 done 체크포인트 없이 끝내므로,
+    클라이언트는 마지막 체크포인트의 after 로 이어 받는다.
+    """
+    chunker = _Chunker(filters, batch_size)
+    async with get_async_sessionmaker()() as db:
+        repository = AsyncReportRepository(db)
+        try:
+            async for report in repository.iter_export(**filters._asdict(), batch_size=chunker.batch_size):
+                chunk = chunker.add(report)
+                if chunk is not None:
+                    yield chunk
+        except Exception:
+            logger.exception("Report export failed after report_id %s", chunker.after)
+            return
+    yield chunker.finish()
+
+
+def last_checkpoint(path: str) -> Optional[dict]:
+    """
+    NDJSON 파일의 마지막 체크포인트 ({"after", "exported", "done", "offset"}). offset 은 그 줄 끝의 바이트 위치로,
+    이어 쓸 때 그 뒤(체크포인트 없이 끊긴 부분)를 잘라 낸다. 파일을 한 줄씩 읽으므로 크기와 무관하다.
+    """
+    found = None
+    offset = 0
+    with open(path, "rb") as file:
+        for line in file:
+            offset += len(line)
+            if line.startswith(CHECKPOINT_PREFIX) and line.endswith(b"\n"):
+                found = {**json.loads(line)[CHECKPOINT_KEY], "offset": offset}
+    return found
@@ -0,0 +1,148 @@
+"""
+리포트 생성 작업 큐.
+
+- local: 프로세스 내 워커 스레드 풀. DB 의 pending 리포트 행이 영속 큐 역할을 하므로
+  재시작 시 남아 있던 pending(과 중단된 running) 행을 다시 넣는다. 처리 여부는 워커의 클레임이 정하므로
+  여러 프로세스가 같은 행을 다시 넣어도 한 번만 생성된다. (로컬 실행/테스트용)
+- rq: Redis + RQ. 워커는 `python -m worker.rq_worker` 로 실행한다.
+"""
+import logging
+import queue
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional
+
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+REPORT_QUEUE_NAME = "reports"
+REPORT_JOB_PATH = "app.services.report_service.process_report"
+
+
+class QueueFullError(RuntimeError):
+    """큐가 가득 차 작업을 받을 수 없을 때 (라우트에서 503 으로 응답)."""
+
+
+class ReportQueue(ABC):
+    """리포트 생성 큐 인터페이스."""
+
+    @abstractmethod
+    def enqueue(self, report_id: int) -> None:
+        """report_id 작업을 넣는다. 받을 수 없으면 QueueFullError."""
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class LocalReportQueue(ReportQueue):
+    def __init__(
+        self,
+        handler: Callable[[int], None],
+        workers: int = 2,
+        max_size: int = 100,
+        recover: Optional[Callable[[], Iterable[int]]] = None,
+    ):
+        self._handler = handler
+        self._workers = max(1, workers)
+        self._recover = recover
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue(maxsize=max(0, max_size))
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self._workers):
+                t = threading.Thread(target=self._run, name=f"report-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        if self._recover is not None:
+            self._requeue_pending()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for t in threads:
+            t.join(timeout)
+
+    def enqueue(self, report_id: int) -> None:
+        if not self._threads:
+            self.start()
+        try:
+            self._queue.put_nowait(report_id)
+        except queue.Full as exc:
+            raise QueueFullError("Report queue is full, try again later") from exc
+
+    def join(self) -> None:
+        """큐에 들어간 작업이 모두 끝날 때까지 대기."""
+        self._queue.join()
+
+    def _requeue_pending(self) -> None:
+        try:
+            report_ids = list(self._recover())
+        except Exception:
+            logger.exception("Failed to load pending reports for requeue")
+            return
+        for report_id in report_ids:
+            try:
+                self._queue.put_nowait(report_id)
+            except queue.Full:
+                logger.warning("Report queue full; %d pending reports left for later", len(report_ids))
+                return
+
+    def _run(self) -> None:
+        while True:
+            report_id = self._queue.get()
+            try:
+                if report_id is None:
+                    return
+                self._handler(report_id)
+            except Exception:
+                logger.exception("Report job %s crashed", report_id)
+            finally:
+                self._queue.task_done()
+
+
+class RQReportQueue(ReportQueue):
+    def __init__(self, redis_url: str, job_timeout: int = 300):
+        from redis import Redis
+        from rq import Queue
+
+        self._job_timeout = job_timeout
+        self._queue = Queue(REPORT_QUEUE_NAME, connection=Redis.from_url(redis_url))
+
+    def enqueue(self, report_id: int) -> None:
+        try:
+            self._queue.enqueue(REPORT_JOB_PATH, report_id, job_timeout=self._job_timeout)
+        except Exception as exc:
+            raise QueueFullError("Report queue is unavailable") from exc
+
+
+def build_report_queue(settings: Settings) -> ReportQueue:
+    backend = settings.REPORT_QUEUE_BACKEND.lower()
+    if backend == "rq":
+        return RQReportQueue(settings.REDIS_URL, job_timeout=settings.REPORT_JOB_TIMEOUT_SECONDS)
+    if backend != "local":
+        raise ValueError(f"Unknown REPORT_QUEUE_BACKEND: {settings.REPORT_QUEUE_BACKEND}")
+
+    from app.services.report_service import pending_report_ids, process_report
+
+    return LocalReportQueue(
+        process_report,
+        workers=settings.REPORT_QUEUE_WORKERS,
+        max_size=settings.REPORT_QUEUE_MAX_SIZE,
+        recover=pending_report_ids,
+    )
+
+
+@lru_cache
+def get_report_queue() -> ReportQueue:
+    return build_report_queue(get_settings())
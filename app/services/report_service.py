@@ -1,18 +1,90 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import json
-from typing import Optional
+import logging
+from typing import List, NamedTuple, Optional
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models.report import Report
-from app.services.langchain import LangChainService
+from app.core.config import get_settings
+from app.core.deadline import RequestDeadlineExceeded, check_deadline
+from app.core.metrics import stage_timer
+from app.db.session import SessionLocal
+from app.models.report import Report, ReportSessionState
+from app.repositories.report_repository import ReportRepository
+from app.services.langchain import SUMMARY_PROMPT_VERSION, LangChainService, get_shared_langchain_service
+from app.services.report_storage import store_report_bodies
+from app.services.tokens import PromptBudgetExceeded
 
+logger = logging.getLogger(__name__)
 
-def _fetch_session_text(db: Session, session_id: str | int) -> str:
+# deadline 이 지나 취소된 리포트의 failure_reason (LLM/입력 오류와 구분)
+DEADLINE_EXCEEDED_REASON = "Cancelled: report deadline exceeded"
+
+
+class SessionMessage(NamedTuple):
+    message_id: int  # 세션 안에서 증가하는 값 (증분 요약의 watermark)
+    text: str
+
+
+def _fetch_session_messages(db: Session, session_id: str | int, after_id: Optional[int] = None) -> List[SessionMessage]:
+    """
+    TODO: 실제 Session 모델/메시지에서 session_id 의 메시지를 id 순으로 조회 (after_id 가 있으면 그 이후만).
+    현재는 임시 메시지 한 건 반환.
+    """
+    messages = [SessionMessage(1, f"세션 {session_id} 회의에서 논의된 주요 내용 예시입니다.")]
+    return [m for m in messages if after_id is None or m.message_id > after_id]
+
+
+def _previous_summary(state: Optional[ReportSessionState]) -> Optional[dict]:
+    """저장된 누적 요약. 프롬프트 버전이 바뀌었으면 None (처음부터 다시 요약)."""
+    if state is None or state.prompt_version != SUMMARY_PROMPT_VERSION:
+        return None
+    try:
+        return json.loads(state.summary_json)
+    except ValueError:
+        return None
+
+
+def _save_session_state(
+    db: Session,
+    session_id: str,
+    state: Optional[ReportSessionState],
+    messages: List[SessionMessage],
+    summary_struct: dict,
+    incremental: bool,
+) -> bool:
     """
-    TODO: 실제 Session 모델/메시지에서 텍스트를 조합.
-    현재는 임시 문자열 반환.
+    누적 요약을 저장하고 바로 commit 한다. 같은 세션의 리포트가 동시에 생성되면 먼저 저장한 쪽이 이긴다:
+    기존 상태는 읽었던 watermark 가 그대로일 때만 바꾸고(compare-and-set), 첫 상태 INSERT 가 PK 충돌하면 버린다.
+    저장하지 못해도 이 리포트는 자기가 읽은 상태로 만든 올바른 결과이므로 그대로 완료한다.
     """
-    return f"세션 {session_id} 회의에서 논의된 주요 내용 예시입니다."
+    values = {
+        "watermark": messages[-1].message_id,
+        "summary_json": json.dumps(summary_struct, ensure_ascii=False),
+        "prompt_version": SUMMARY_PROMPT_VERSION,
+        "message_count": (state.message_count or 0) + len(messages) if incremental else len(messages),
+        "updated_at": datetime.utcnow(),
+    }
+    if state is None:
+        db.add(ReportSessionState(session_id=session_id, **values))
+        saved = True
+    else:
+        result = db.execute(
+            update(ReportSessionState)
+            .where(ReportSessionState.session_id == session_id, ReportSessionState.watermark == state.watermark)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        saved = result.rowcount == 1
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        saved = False
+    if not saved:
+        logger.info("Report session state %s was updated concurrently; keeping the other summary", session_id)
+    return saved
 
 
 def generate_report_for_session(
@@ -20,22 +92,36 @@ def generate_report_for_session(
     session_id: str | int,
     service: LangChainService,
     requestor: Optional[str] = None,
+    deadline: Optional[float] = None,
 ) -> dict:
     """
     동기 리포트 생성:
-    - 세션 텍스트 수집
-    - LangChainService summarize_reflection 호출
+    - 세션 메시지 수집 (증분 상태가 있으면 watermark 이후 메시지만)
+    - LangChainService summarize_transcript 호출 (길면 map-reduce, 증분이면 이전 누적 요약과 합침)
     - Markdown + JSON 구성
+    새 메시지가 없으면 LLM 을 부르지 않고 저장된 누적 요약으로 다시 렌더링한다.
+    deadline(time.time() 기준)이 지나면 남은 LLM 호출을 시작하지 않고 RequestDeadlineExceeded 를 던진다.
     """
-    session_text = _fetch_session_text(db, session_id)
-    payload = {
-        "what_happened": session_text,
-        "emotions": [],  # 자동 감정 추출 유도
-        "what_you_did": "",
-        "desired_outcome": "",
-    }
-    summary_struct = service.summarize_reflection(payload)
+    session_key = str(session_id)
+    incremental_enabled = get_settings().REPORT_INCREMENTAL_ENABLED
+    state = db.get(ReportSessionState, session_key) if incremental_enabled else None
+    previous = _previous_summary(state)
+    with stage_timer("fetch"):
+        messages = _fetch_session_messages(db, session_id, after_id=state.watermark if previous is not None else None)
+
+    if previous is not None and not messages:
+        summary_struct = previous
+    else:
+        session_text = "\n".join(m.text for m in messages)
+        summary_struct = service.summarize_transcript(session_text, previous=previous, deadline=deadline)
+        if messages and incremental_enabled:
+            _save_session_state(db, session_key, state, messages, summary_struct, incremental=previous is not None)
+
+    with stage_timer("render"):
+        return _render_report(session_id, summary_struct)
 
+
+def _render_report(session_id: str | int, summary_struct: dict) -> dict:
     md_lines = [
         f"# 리포트 (세션 {session_id})",
         "",
@@ -81,3 +167,129 @@ def generate_report_for_session(
     }
 
     return {"report_md": report_md, "report_json": report_json}
+
+
+# 완료 시 워커가 기록하는 컬럼
+_OUTCOME_COLUMNS = (
+    "status",
+    "failure_reason",
+    "processed_at",
+    "dedupe_key",
+    "report_md",
+    "report_json",
+    "report_md_body",
+    "report_json_body",
+    "body_encoding",
+)
+
+
+def _record_outcome(db: Session, report: Report, claimed_at: datetime, values: dict) -> bool:
+    """
+    클레임한 행에만 결과를 기록한다 (status='running' AND started_at=claimed_at 조건부 UPDATE).
+    생성이 REPORT_JOB_TIMEOUT_SECONDS 를 넘겨 다른 워커가 다시 클레임했거나, 새 요청이 이 행을 SUPERSEDED_REASON 으로
+    실패 처리했으면 행의 주인은 이제 그쪽이므로 이 워커의 결과는 버린다.
+    """
+    # 실패 지점에서 깨졌을 수 있는 트랜잭션을 버린다 (report 는 만료되어 다음 접근 때 DB 값으로 다시 읽힌다).
+    db.rollback()
+    recorded = ReportRepository(db).complete_claimed(report.report_id, claimed_at, values)
+    if not recorded:
+        logger.info("Report %s was re-claimed or superseded; dropping this worker's result", report.report_id)
+    return recorded
+
+
+def _mark_failed(db: Session, report: Report, claimed_at: datetime, reason: str) -> None:
+    values = {"status": "failed", "failure_reason": reason, "processed_at": datetime.utcnow(), "dedupe_key": None}
+    _record_outcome(db, report, claimed_at, values)
+
+
+def _finished_values(report: Report, generated: dict) -> dict:
+    # store_report_bodies 는 응답 문서에 완료 메타데이터를 넣으므로, 세션에 붙지 않은 완료 상태 사본에 본문을 채운다.
+    finished = Report(
+        report_id=report.report_id,
+        session_id=report.session_id,
+        created_at=report.created_at,
+        status="finished",
+        failure_reason=None,
+        processed_at=datetime.utcnow(),
+        dedupe_key=None,  # single-flight 클레임 해제
+    )
+    store_report_bodies(
+        finished,
+        generated["report_md"],
+        json.dumps(generated["report_json"], ensure_ascii=False),
+        get_settings().REPORT_STORAGE_COMPRESSION.lower(),
+    )
+    return {column: getattr(finished, column) for column in _OUTCOME_COLUMNS}
+
+
+def _report_deadline(report: Report) -> Optional[float]:
+    if report.deadline_at is None:
+        return None
+    return report.deadline_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+def run_report_job(db: Session, report: Report, service: LangChainService, claimed_at: datetime) -> Report:
+    """
+    클레임된(running) 리포트 한 건을 생성하고 상태(finished/failed)를 기록한다.
+    claimed_at 은 claim_job 이 돌려준 started_at 이며, 그 클레임이 아직 유효할 때만 기록한다 (_record_outcome).
+    예외는 failure_reason 으로 남기고 다시 던지지 않는다.
+    deadline_at 이 지났으면(큐에서 기다리는 동안 포함) LLM 을 부르지 않고 DEADLINE_EXCEEDED_REASON 으로 실패 처리한다.
+    """
+    deadline = _report_deadline(report)
+    try:
+        check_deadline(deadline)
+        generated = generate_report_for_session(db, report.session_id, service, report.requestor, deadline=deadline)
+    except RequestDeadlineExceeded:
+        _mark_failed(db, report, claimed_at, DEADLINE_EXCEEDED_REASON)
+        return report
+    except (RuntimeError, PromptBudgetExceeded) as exc:
+        _mark_failed(db, report, claimed_at, str(exc))
+        return report
+    except Exception:
+        logger.exception("Report %s generation failed", report.report_id)
+        _mark_failed(db, report, claimed_at, "Unexpected error")
+        return report
+
+    try:
+        with stage_timer("persist"):
+            _record_outcome(db, report, claimed_at, _finished_values(report, generated))
+    except Exception:
+        # 여기서 빠져나가면 리포트가 running 으로 남아 클라이언트가 끝없이 기다린다.
+        logger.exception("Report %s could not be saved", report.report_id)
+        _mark_failed(db, report, claimed_at, "Unexpected error")
+    return report
+
+
+def _claim_stale_before() -> datetime:
+    # REPORT_JOB_TIMEOUT_SECONDS 가 지나도 running 인 행은 워커가 중단된 것으로 보고 다시 클레임한다.
+    return datetime.utcnow() - timedelta(seconds=get_settings().REPORT_JOB_TIMEOUT_SECONDS)
+
+
+def process_report(report_id: int) -> None:
+    """
+    큐 워커 진입점 (local 워커 스레드 / RQ 워커 공용).
+    요청 스레드와 분리된 자체 DB 세션을 사용한다.
+    pending → running 조건부 UPDATE 로 클레임한 워커만 생성하므로, 같은 id 가 여러 워커/프로세스 큐에
+    들어가도 LLM 호출은 한 번이다.
+    """
+    db = SessionLocal()
+    try:
+        claimed_at = ReportRepository(db).claim_job(report_id, _claim_stale_before())
+        if claimed_at is None:
+            return
+        report = db.get(Report, report_id)
+        if report is None:
+            return
+        service = get_shared_langchain_service()
+        run_report_job(db, report, service, claimed_at)
+    finally:
+        db.close()
+
+
+def pending_report_ids(limit: int = 1000) -> List[int]:
+    """재시작 시 local 큐에 다시 넣을 리포트 id 목록 (pending + 중단된 running). 실제 처리 여부는 클레임이 정한다."""
+    db = SessionLocal()
+    try:
+        return ReportRepository(db).claimable_ids(_claim_stale_before(), limit)
+    finally:
+        db.close()
@@ -0,0 +1,156 @@
+"""
+리포트 본문 저장/표현.
+
+완료된 리포트는 이후 바뀌지 않으므로, 압축 저장 모드에서는 완료 시점에 GET /reports/{id} 의
+응답 문서(json / md 형식)를 미리 렌더링·압축해 report_*_body 컬럼에 저장하고 텍스트 컬럼은 비운다.
+클라이언트가 같은 Content-Encoding 을 받으면 저장된 바이트를 그대로 내보낸다.
+
+body_encoding 이 형식 표시자: NULL 이면 기존 텍스트 컬럼(report_md/report_json), "gzip"/"zstd" 면 압축 본문.
+"""
+import gzip
+import json
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.report import Report
+
+Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+CODECS: Dict[str, Codec] = {
+    "gzip": (lambda data: gzip.compress(data, compresslevel=6, mtime=0), gzip.decompress),
+}
+
+try:  # 선택 의존성
+    import zstandard
+
+    CODECS["zstd"] = (
+        lambda data: zstandard.ZstdCompressor(level=10).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+except ImportError:  # pragma: no cover - zstandard 미설치 환경
+    pass
+
+
+def available_encodings() -> Tuple[str, ...]:
+    return tuple(CODECS)
+
+
+def _report_json_fragment(report_json_text: Optional[str]) -> str:
+    """
+    응답 문서에 이어 붙일 report_json 조각. 재직렬화 없이 검증만 하고 원문을 그대로 쓴다.
+    깨진 JSON 은 기존처럼 {} 로, 줄바꿈이 든 JSON(들여쓰기 등)은 한 줄로 다시 써서
+    NDJSON 내보내기의 한 줄 = 리포트 하나를 지킨다.
+    """
+    if not report_json_text:
+        return "{}"
+    try:
+        parsed = json.loads(report_json_text)
+    except ValueError:
+        return "{}"
+    if "\n" in report_json_text or "\r" in report_json_text:
+        return json.dumps(parsed, ensure_ascii=False)
+    return report_json_text
+
+
+def render_json_body(report: Report, report_json_text: Optional[str]) -> bytes:
+    """GET /reports/{id} (json) 응답 문서. 저장된 report_json 문자열은 검증 후 재직렬화 없이 이어 붙인다."""
+    meta = jsonable_encoder(
+        {
+            "report_id": report.report_id,
+            "session_id": report.session_id,
+            "status": report.status,
+            "failure_reason": report.failure_reason if report.status == "failed" else None,
+            "created_at": report.created_at,
+            "processed_at": report.processed_at,
+        }
+    )
+    body = json.dumps(meta, ensure_ascii=False)
+    if report.status == "finished":
+        report_json = _report_json_fragment(report_json_text)
+    else:
+        report_json = "null"
+    return f'{body[:-1]}, "report_json": {report_json}}}'.encode("utf-8")
+
+
+def render_md_body(report_md_text: Optional[str]) -> bytes:
+    """GET /reports/{id}?format=md 응답 문서 (JSON 문자열)."""
+    return json.dumps(report_md_text or "", ensure_ascii=False).encode("utf-8")
+
+
+def store_report_bodies(report: Report, report_md: str, report_json_text: str, encoding: Optional[str]) -> None:
+    """
+    완료 처리(status/processed_at 설정) 이후에 호출한다. json 응답 문서에 메타데이터가 포함되기 때문.
+    encoding 이 None/"none" 이거나 사용할 수 없는 코덱이면 기존처럼 텍스트 컬럼에 저장한다.
+    """
+    if not encoding or encoding == "none" or encoding not in CODECS:
+        report.report_md = report_md
+        report.report_json = report_json_text
+        report.report_md_body = None
+        report.report_json_body = None
+        report.body_encoding = None
+        return
+
+    compress = CODECS[encoding][0]
+    report.report_md_body = compress(render_md_body(report_md))
+    report.report_json_body = compress(render_json_body(report, report_json_text))
+    report.body_encoding = encoding
+    report.report_md = None
+    report.report_json = None
+
+
+def rendered_body(report: Report, fmt: str) -> Tuple[bytes, Optional[str]]:
+    """
+    응답 문서를 (바이트, content-encoding) 으로 반환. 압축 저장된 행이면 압축된 그대로 돌려준다.
+    """
+    if report.body_encoding:
+        stored = report.report_md_body if fmt == "md" else report.report_json_body
+        if stored is not None:
+            return stored, report.body_encoding
+    if fmt == "md":
+        return render_md_body(report.report_md), None
+    return render_json_body(report, report.report_json), None
+
+
+def decoded_body(report: Report, fmt: str) -> bytes:
+    body, encoding = rendered_body(report, fmt)
+    if encoding is None:
+        return body
+    return CODECS[encoding][1](body)
+
+
+def report_md_text(report: Report) -> Optional[str]:
+    """저장 형식과 무관하게 Markdown 원문을 반환."""
+    if report.body_encoding and report.report_md_body is not None:
+        return json.loads(decoded_body(report, "md"))
+    return report.report_md
+
+
+def report_json_text(report: Report) -> Optional[str]:
+    """저장 형식과 무관하게 report_json 원문(JSON 문자열)을 반환."""
+    if report.body_encoding and report.report_json_body is not None:
+        document = json.loads(decoded_body(report, "json"))
+        return json.dumps(document.get("report_json"), ensure_ascii=False)
+    return report.report_json
+
+
+def accepts_encoding(accept_encoding: Optional[str], encoding: str) -> bool:
+    """Accept-Encoding 헤더가 encoding 을 허용하는지 (q=0 은 거부, '*' 허용)."""
+    if not accept_encoding:
+        return False
+    allowed = None
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        token = token.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token == encoding:
+            return q > 0
+        if token == "*":
+            allowed = q > 0
+    return bool(allowed)
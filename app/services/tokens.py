@@ -0,0 +1,196 @@
+"""
+오프라인 토큰 수 추정, 토큰 한도 기준 텍스트 분할, 체인 입력 토큰 예산.
+
+모델 토크나이저를 부르지 않고(네트워크 없음) 글자 종류로 어림한다.
+ASCII 는 4글자당 1토큰, 그 외(한글 등)는 글자당 1토큰으로 실제보다 약간 넉넉하게 잡으므로
+추정치 기준으로 자른 텍스트는 컨텍스트 한도를 넘지 않는다.
+추정치와 실제(모델 usage) 토큰 수는 llm_prompt_tokens{source} 로 함께 기록되므로 예산 조정에 쓴다.
+"""
+import math
+import re
+from typing import Iterator, List, Mapping, NamedTuple, Sequence, Tuple
+
+from app.core.metrics import REGISTRY
+
+PROMPT_TRIMMED_TOTAL = REGISTRY.counter(
+    "llm_prompt_trimmed_total",
+    "Chain input fields trimmed to fit the token budget.",
+    ("chain", "field"),
+)
+PROMPT_REJECTED_TOTAL = REGISTRY.counter(
+    "llm_prompt_rejected_total",
+    "Chain calls rejected before reaching the LLM because required fields exceed the token budget.",
+    ("chain",),
+)
+TRUNCATION_MARK = "…"
+
+ASCII_CHARS_PER_TOKEN = 4
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / ASCII_CHARS_PER_TOKEN) + (len(text) - ascii_chars)
+
+
+def _units(text: str, max_tokens: int) -> Iterator[str]:
+    """줄 → 문장 → 글자 순으로, 각 조각이 max_tokens 이하가 되도록 쪼갠다."""
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if estimate_tokens(line) <= max_tokens:
+            yield line
+            continue
+        for sentence in SENTENCE_BOUNDARY.split(line):
+            if estimate_tokens(sentence) <= max_tokens:
+                yield sentence
+                continue
+            # 글자당 최대 1토큰이므로 max_tokens 글자씩 자르면 한도를 넘지 않는다.
+            for start in range(0, len(sentence), max_tokens):
+                yield sentence[start : start + max_tokens]
+
+
+def split_by_tokens(text: str, max_tokens: int) -> List[str]:
+    """
+    text 를 추정 토큰 수가 max_tokens 이하인 청크로 나눈다.
+    줄 경계를 우선 유지하고, 한 줄이 너무 길 때만 문장/글자 단위로 자른다.
+    """
+    max_tokens = max(1, max_tokens)
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for unit in _units(text, max_tokens):
+        tokens = estimate_tokens(unit) + 1  # 줄바꿈
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def estimate_value_tokens(value) -> int:
+    """체인 입력 값 하나의 추정 토큰 수 (문자열, 문자열 목록, {"text": ...} 턴 목록)."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return estimate_tokens(value)
+    if isinstance(value, Mapping):
+        return estimate_tokens(str(value.get("text", "")))
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_value_tokens(item) for item in value)
+    return estimate_tokens(str(value))
+
+
+def estimate_inputs_tokens(inputs: Mapping[str, object]) -> int:
+    return sum(estimate_value_tokens(value) for value in inputs.values())
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되도록 앞부분만 남긴다 (잘렸으면 끝에 …)."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 1:
+        return ""
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens - 1:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low].rstrip() + TRUNCATION_MARK
+
+
+class PromptBudgetExceeded(ValueError):
+    """줄일 수 없는 입력만으로 토큰 예산을 넘는다 (라우트에서 413)."""
+
+    def __init__(self, chain: str, estimated: int, limit: int):
+        super().__init__(
+            f"Input is too large for the {chain} prompt: about {estimated} tokens after trimming, limit {limit}."
+        )
+        self.chain = chain
+        self.estimated = estimated
+        self.limit = limit
+
+
+class TrimRule(NamedTuple):
+    field: str
+    min_tokens: int  # 이 크기까지만 줄인다. 목록(대화 턴)은 오래된 항목부터 뺀다
+
+
+class PromptBudget:
+    """
+    체인별 입력 토큰 예산. 합계가 max_tokens 를 넘으면 trim_order 앞쪽(우선순위 낮은) 필드부터
+    min_tokens 까지 줄이고, 그래도 넘으면 PromptBudgetExceeded. trim_order 에 없는 필드는 줄이지 않는다.
+    """
+
+    def __init__(self, chain: str, max_tokens: int, trim_order: Sequence[TrimRule]):
+        self.chain = chain
+        self.max_tokens = max_tokens
+        self.trim_order = tuple(trim_order)
+
+    def apply(self, inputs: Mapping[str, object]) -> Tuple[dict, int]:
+        """(예산에 맞춘 입력, 추정 토큰 수). max_tokens <= 0 이면 그대로 통과."""
+        inputs = dict(inputs)
+        sizes = {name: estimate_value_tokens(value) for name, value in inputs.items()}
+        total = sum(sizes.values())
+        if self.max_tokens <= 0 or total <= self.max_tokens:
+            return inputs, total
+
+        for rule in self.trim_order:
+            excess = total - self.max_tokens
+            if excess <= 0:
+                break
+            value = inputs.get(rule.field)
+            size = sizes.get(rule.field, 0)
+            if not value or size <= rule.min_tokens:
+                continue
+            target = max(rule.min_tokens, size - excess)
+            if isinstance(value, str):
+                trimmed = truncate_to_tokens(value, target)
+            elif isinstance(value, (list, tuple)):
+                trimmed = list(value)
+                while trimmed and estimate_value_tokens(trimmed) > target:
+                    trimmed.pop(0)
+            else:
+                continue
+            inputs[rule.field] = trimmed
+            sizes[rule.field] = estimate_value_tokens(trimmed)
+            total = sum(sizes.values())
+            PROMPT_TRIMMED_TOTAL.inc(1, self.chain, rule.field)
+
+        if total > self.max_tokens:
+            PROMPT_REJECTED_TOTAL.inc(1, self.chain)
+            raise PromptBudgetExceeded(self.chain, total, self.max_tokens)
+        return inputs, total
+
+
+SUMMARY_TRIM_ORDER = (
+    TrimRule("desired_outcome", 100),
+    TrimRule("what_you_did", 100),
+)
+CHAT_TRIM_ORDER = (
+    TrimRule("conversation", 0),
+    TrimRule("conversation_summary", 200),
+    TrimRule("desired_outcome", 100),
+    TrimRule("what_you_did", 100),
+    TrimRule("what_happened", 300),
+    TrimRule("persona_personality", 50),
+)
+
+
+def summary_budget(max_tokens: int) -> PromptBudget:
+    """요약 체인: what_happened(본문)는 줄이지 않는다."""
+    return PromptBudget("summary", max_tokens, SUMMARY_TRIM_ORDER)
+
+
+def chat_budget(max_tokens: int) -> PromptBudget:
+    """대화 체인: 오래된 턴부터 빼고, 사용자의 새 message 와 페르소나 이름/말투는 줄이지 않는다."""
+    return PromptBudget("chat", max_tokens, CHAT_TRIM_ORDER)
@@ -1,6 +1,9 @@
 from sqlalchemy import inspect, text
 from sqlalchemy.engine import Engine
 
+from app.models.conversation import Conversation, ConversationTurn
+from app.models.report import ReportSessionState
+
 def ensure_reports_failure_reason_column(engine: Engine) -> None:
     """
     Alembic 없이 운영 중 컬럼이 없을 수 있어, 앱 시작 시 안전하게 추가한다.
@@ -26,3 +29,144 @@ def ensure_reports_failure_reason_column(engine: Engine) -> None:
             conn.execute(text(sql))
     except Exception:
         pass
+
+
+REPORT_INDEXES = {
+    "ix_reports_session_id_created_at": ("session_id", "created_at"),
+    "ix_reports_requestor_created_at": ("requestor", "created_at"),
+}
+
+
+def ensure_reports_indexes(engine: Engine) -> None:
+    """
+    리포트 목록 keyset 페이지네이션용 복합 인덱스를 기존 DB 에도 만든다.
+    실패해도 앱은 계속 뜨게 한다.
+    """
+    insp = inspect(engine)
+    try:
+        existing = {ix["name"] for ix in insp.get_indexes("reports")}
+    except Exception:
+        return
+
+    for name, columns in REPORT_INDEXES.items():
+        if name in existing:
+            continue
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"CREATE INDEX {name} ON reports ({', '.join(columns)})"))
+        except Exception:
+            pass
+
+
+def ensure_reports_dedupe_key(engine: Engine) -> None:
+    """
+    리포트 생성 single-flight 용 dedupe_key 컬럼과 유니크 인덱스를 기존 DB 에 추가한다.
+    실패해도 앱은 계속 뜨게 한다 (인덱스가 없으면 정확히 동시에 들어온 요청은 합쳐지지 않을 수 있음).
+    """
+    insp = inspect(engine)
+    try:
+        cols = {c["name"] for c in insp.get_columns("reports")}
+        indexes = {ix["name"] for ix in insp.get_indexes("reports")}
+    except Exception:
+        return
+
+    statements = []
+    if "dedupe_key" not in cols:
+        statements.append("ALTER TABLE reports ADD COLUMN dedupe_key VARCHAR(64)")
+    if "ux_reports_dedupe_key" not in indexes:
+        statements.append("CREATE UNIQUE INDEX ux_reports_dedupe_key ON reports (dedupe_key)")
+    for sql in statements:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(sql))
+        except Exception:
+            pass
+
+
+def ensure_reports_deadline_column(engine: Engine) -> None:
+    """
+    리포트 생성 deadline(deadline_at) 컬럼을 기존 DB 에 추가한다.
+    실패해도 앱은 계속 뜨게 한다 (컬럼이 없으면 INSERT 가 실패하므로 로그로 확인).
+    """
+    insp = inspect(engine)
+    try:
+        cols = {c["name"] for c in insp.get_columns("reports")}
+    except Exception:
+        return
+    if "deadline_at" in cols:
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE reports ADD COLUMN deadline_at TIMESTAMP"))
+    except Exception:
+        pass
+
+
+def ensure_reports_started_at_column(engine: Engine) -> None:
+    """
+    워커 클레임 시각(started_at) 컬럼을 기존 DB 에 추가한다.
+    실패해도 앱은 계속 뜨게 한다 (컬럼이 없으면 클레임 UPDATE 가 실패하므로 로그로 확인).
+    """
+    insp = inspect(engine)
+    try:
+        cols = {c["name"] for c in insp.get_columns("reports")}
+    except Exception:
+        return
+    if "started_at" in cols:
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE reports ADD COLUMN started_at TIMESTAMP"))
+    except Exception:
+        pass
+
+
+def ensure_reports_body_columns(engine: Engine) -> None:
+    """
+    압축 저장 모드용 컬럼(body_encoding, report_md_body, report_json_body)을 기존 DB 에 추가한다.
+    실패해도 앱은 계속 뜨게 한다.
+    """
+    insp = inspect(engine)
+    try:
+        cols = {c["name"] for c in insp.get_columns("reports")}
+    except Exception:
+        return
+
+    dialect = engine.dialect.name
+    blob = {"postgresql": "BYTEA", "mysql": "LONGBLOB"}.get(dialect, "BLOB")
+    columns = {
+        "body_encoding": "VARCHAR(16)",
+        "report_md_body": blob,
+        "report_json_body": blob,
+    }
+    for name, col_type in columns.items():
+        if name in cols:
+            continue
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE reports ADD COLUMN {name} {col_type}"))
+        except Exception:
+            pass
+
+
+def ensure_report_session_states_table(engine: Engine) -> None:
+    """
+    증분 리포트 상태 테이블(report_session_states)이 없으면 만든다.
+    실패해도 앱은 계속 뜨게 한다 (상태를 저장하지 못하면 매번 전체 기록을 요약).
+    """
+    try:
+        ReportSessionState.__table__.create(engine, checkfirst=True)
+    except Exception:
+        pass
+
+
+def ensure_conversation_tables(engine: Engine) -> None:
+    """
+    서버 측 대화 테이블(conversations, conversation_turns)이 없으면 만든다.
+    실패해도 앱은 계속 뜨게 한다 (대화 API 만 동작하지 않음).
+    """
+    for table in (Conversation.__table__, ConversationTurn.__table__):
+        try:
+            table.create(engine, checkfirst=True)
+        except Exception:
+            pass
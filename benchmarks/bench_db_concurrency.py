@@ -0,0 +1,130 @@
+"""
+리포트 쓰기/읽기 혼합 부하에서 SQLite 잠금 경합 비교: 기본 엔진 vs app.db.session.build_engine (WAL 등).
+임시 SQLite 파일을 사용하며 앱 DB 는 건드리지 않는다.
+Run: python -m benchmarks.bench_db_concurrency [--writers 4] [--readers 8] [--seconds 5]
+결과는 JSON 으로 stdout 에 출력한다.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import get_settings
+from app.db.session import Base, build_engine, pool_stats
+from app.models.report import Report
+
+REPORT_MD = "# 리포트\n\n## 요약\n" + "회의에서 일정이 촉박해 불안했고 결국 남은 작업을 맡기로 했다. " * 40
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(p * len(values)))] * 1000, 2)
+
+
+def run(label, engine, writers, readers, seconds):
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    with Session() as db:
+        for i in range(50):
+            db.add(Report(session_id=str(i % 5), status="finished", report_md=REPORT_MD, created_at=datetime.utcnow()))
+        db.commit()
+
+    stop = time.perf_counter() + seconds
+    lock = threading.Lock()
+    write_lat, read_lat, errors = [], [], []
+
+    def writer():
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            try:
+                with Session() as db:
+                    report = Report(session_id="w", status="pending", created_at=datetime.utcnow())
+                    db.add(report)
+                    db.commit()
+                    report.status = "finished"
+                    report.report_md = REPORT_MD
+                    report.processed_at = datetime.utcnow()
+                    db.commit()
+            except Exception as exc:
+                with lock:
+                    errors.append(type(exc).__name__)
+                continue
+            with lock:
+                write_lat.append(time.perf_counter() - t0)
+
+    def reader():
+        n = 0
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            try:
+                with Session() as db:
+                    db.query(Report).filter(Report.session_id == str(n % 5)).order_by(Report.report_id.desc()).limit(10).all()
+            except Exception as exc:
+                with lock:
+                    errors.append(type(exc).__name__)
+                continue
+            n += 1
+            with lock:
+                read_lat.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    result = {
+        "engine": label,
+        "writes_per_s": round(len(write_lat) / seconds, 1),
+        "reads_per_s": round(len(read_lat) / seconds, 1),
+        "write_p95_ms": percentile(write_lat, 0.95),
+        "write_p99_ms": percentile(write_lat, 0.99),
+        "read_p95_ms": percentile(read_lat, 0.95),
+        "read_p99_ms": percentile(read_lat, 0.99),
+        "errors": len(errors),
+        "error_types": sorted(set(errors)),
+    }
+    stats = pool_stats(engine)
+    if "checkouts" in stats:
+        result["pool_wait_max_ms"] = round(stats["wait_seconds_max"] * 1000, 2)
+    engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_url = f"sqlite:///{os.path.join(tmp, 'baseline.db')}"
+        baseline = create_engine(baseline_url, connect_args={"check_same_thread": False})
+        results.append(run("default", baseline, args.writers, args.readers, args.seconds))
+
+        tuned_url = f"sqlite:///{os.path.join(tmp, 'tuned.db')}"
+        tuned = build_engine(tuned_url, get_settings())
+        results.append(run("tuned", tuned, args.writers, args.readers, args.seconds))
+
+    print(
+        json.dumps(
+            {"benchmark": "db_concurrency", "writers": args.writers, "readers": args.readers, "seconds": args.seconds, "results": results},
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
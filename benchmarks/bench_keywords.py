@@ -0,0 +1,96 @@
+"""
+키워드 fallback 추출 마이크로 벤치마크: 기존 문장별 중첩 루프 방식 vs KeywordEngine (카테고리별 컴파일 정규식).
+Run: python -m benchmarks.bench_keywords [--sentences 2000] [--repeat 5]
+결과는 JSON 으로 stdout 에 출력한다.
+"""
+import argparse
+import json
+import re
+
+from app.services.langchain import LangChainService
+from app.services.llm_cache import NullLLMCache
+from benchmarks.common import best_of
+from benchmarks.corpus import build_text
+
+
+def legacy_split(text):
+    parts = text.replace("!", ".").replace("?", ".").split(".")
+    return [p.strip() for p in parts if p.strip()]
+
+
+def legacy_emotions(text, max_items=3):
+    lowered = text.lower()
+    rules = [
+        ("불안", ["불안", "걱정", "초조", "anx"]),
+        ("당황", ["당황", "황당", "embarrass", "awkward"]),
+        ("화남", ["화나", "짜증", "분노", "angry"]),
+        ("슬픔", ["슬픔", "우울", "sad"]),
+        ("기쁨", ["기쁨", "행복", "즐거", "happy"]),
+        ("죄책감", ["죄책", "미안", "guilt"]),
+    ]
+    found = [label for label, keys in rules if any(k in lowered for k in keys)]
+    return (found or ["불안"])[:max_items]
+
+
+def legacy_decisions(text):
+    keywords = ["결정", "하기로", "선택", "결론", "합의", "정하기"]
+    return [s[:150] for s in legacy_split(text) if any(k in s for k in keywords)][:5]
+
+
+def legacy_actions(text):
+    keywords = ["해야", "준비", "정리", "확인", "작성", "검토", "추가"]
+    items = []
+    for s in legacy_split(text):
+        if any(k in s for k in keywords):
+            item = {"text": s[:150], "owner": None, "due": None}
+            if "@" in s:
+                owner_part = s.split("@", 1)[1].split(" ", 1)[0]
+                if owner_part:
+                    item["owner"] = owner_part[:30]
+            m = re.search(r"\d{4}-\d{2}-\d{2}", s)
+            if m:
+                item["due"] = m.group(0)
+            items.append(item)
+    return items[:10]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, nargs="+", default=[10, 200, 2000])
+    parser.add_argument("--keyword-every", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    service = LangChainService(cache=NullLLMCache())
+    results = []
+    cases = [(n, k) for k in args.keyword_every for n in args.sentences]
+    for n, keyword_every in cases:
+        text = build_text(n, keyword_every)
+        assert service.detect_emotions(text) == legacy_emotions(text)
+        assert service._extract_decisions(text) == legacy_decisions(text)
+        assert service._extract_action_items(text) == legacy_actions(text)
+
+        legacy = best_of(lambda: (legacy_emotions(text), legacy_decisions(text), legacy_actions(text)), args.repeat)
+
+        def engine_scan():
+            scan = service.keywords.scan(text)
+            service.keywords.ranked_labels(scan, "emotion")
+            service._decisions_from_scan(scan)
+            service._action_items_from_scan(scan)
+
+        engine = best_of(engine_scan, args.repeat)
+        results.append(
+            {
+                "sentences": n,
+                "keyword_every": keyword_every,
+                "chars": len(text),
+                "legacy_ms": round(legacy * 1000, 3),
+                "engine_ms": round(engine * 1000, 3),
+                "speedup": round(legacy / engine, 2) if engine else None,
+            }
+        )
+    print(json.dumps({"benchmark": "keyword_extraction", "results": results}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
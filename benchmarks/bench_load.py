@@ -0,0 +1,182 @@
+"""
+FastAPI 앱 in-process 부하 테스트 (가짜 LLM, 네트워크/uvicorn 없음).
+httpx ASGITransport 로 앱을 직접 호출하며, 임시 SQLite 파일 DB 를 사용한다.
+
+시나리오(--scenario): summary, summary_batch, chat, chat_stream, report_create, report_get, mixed
+가짜 LLM 지연/실패율은 --latency / --failure-rate (형식은 benchmarks.fake_llm 참고).
+Run: python -m benchmarks.bench_load [--scenario mixed] [--concurrency 50] [--requests 2000]
+     [--latency lognormal:0.3,0.5] [--failure-rate 0.02] [--seed 1] [--output load.json]
+결과는 JSON 으로 stdout 에 출력한다.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+from benchmarks.common import emit, percentiles
+from benchmarks.corpus import chat_request, summary_request
+
+MIXED_WEIGHTS = {
+    "summary": 40,
+    "chat": 20,
+    "chat_stream": 15,
+    "summary_batch": 5,
+    "report_create": 5,
+    "report_get": 15,
+}
+
+Request = Tuple[str, str, str, dict]  # (scenario, method, path, json body)
+
+
+def build_requests(scenario: str, count: int, rng: random.Random, payload_pool: int, report_id: int) -> List[Request]:
+    weights = MIXED_WEIGHTS if scenario == "mixed" else {scenario: 1}
+    names, values = list(weights), list(weights.values())
+    pool = [summary_request(rng) for _ in range(payload_pool)] if payload_pool else None
+    requests: List[Request] = []
+    for name in rng.choices(names, values, k=count):
+        body = rng.choice(pool) if pool else summary_request(rng)
+        if name == "summary":
+            requests.append((name, "POST", "/api/reflections/summary", body))
+        elif name == "summary_batch":
+            items = [rng.choice(pool) if pool else summary_request(rng) for _ in range(8)]
+            requests.append((name, "POST", "/api/reflections/summary:batch", {"items": items}))
+        elif name == "chat":
+            requests.append((name, "POST", "/api/reflections/chat", chat_request(rng)))
+        elif name == "chat_stream":
+            requests.append((name, "POST", "/api/reflections/chat/stream", chat_request(rng)))
+        elif name == "report_create":
+            requests.append((name, "POST", "/api/reflections/reports", {"sessionId": f"bench-{rng.randrange(1000)}"}))
+        elif name == "report_get":
+            requests.append((name, "GET", f"/api/reflections/reports/{report_id}", {}))
+        else:
+            raise ValueError(f"Unknown scenario: {name}")
+    return requests
+
+
+async def run_load(app, requests: List[Request], concurrency: int, duration: float):
+    import httpx
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    queue: "asyncio.Queue[Request]" = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+    deadline = time.perf_counter() + duration if duration else None
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def worker():
+            while not queue.empty():
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                name, method, path, body = queue.get_nowait()
+                t0 = time.perf_counter()
+                try:
+                    if method == "GET":
+                        response = await client.get(path)
+                    else:
+                        response = await client.post(path, json=body)
+                    await response.aread()
+                    status = str(response.status_code)
+                except Exception as exc:
+                    status = type(exc).__name__
+                latencies[name].append(time.perf_counter() - t0)
+                statuses[name][status] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, statuses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", default="mixed", choices=["mixed", *MIXED_WEIGHTS])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--duration", type=float, default=0, help="초. 0 이면 --requests 를 모두 보낼 때까지")
+    parser.add_argument("--latency", default="lognormal:0.3,0.5")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--payload-pool", type=int, default=0, help="서로 다른 요청 본문 수 (0 = 모두 다름, 캐시 miss)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    # 설정은 앱 import 시점에 읽히므로 먼저 환경 변수를 정한다.
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    os.environ.setdefault("LLM_WARMUP_ON_STARTUP", "false")
+    # 모든 요청이 같은 클라이언트 주소(한 호출자)에서 오므로, 호출자별 한도를 끄지 않으면 대부분 429 가 된다.
+    os.environ.setdefault("LLM_USER_MAX_CONCURRENCY", "0")
+    os.environ.setdefault("LLM_USER_RATE_PER_SECOND", "0")
+    os.environ.setdefault("LLM_MAX_WAITING", str(max(128, args.concurrency * 8)))
+
+    from app.db.session import Base, dispose_async_engine, engine
+    from app.main import app
+    from app.services.langchain import get_shared_langchain_service
+    from app.services.report_queue import get_report_queue
+    from benchmarks.fake_llm import FakeLLM
+
+    Base.metadata.create_all(engine)
+    fake = FakeLLM(args.latency, args.failure_rate, seed=args.seed)
+    fake.install(get_shared_langchain_service())
+
+    async def scenario():
+        import httpx
+
+        # report_get 용 리포트 한 건을 미리 만든다 (가짜 LLM 실패 시 failed 상태여도 조회는 된다).
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            created = await client.post("/api/reflections/reports", json={"sessionId": "bench-seed"})
+        await asyncio.to_thread(get_report_queue().join)
+        rng = random.Random(args.seed)
+        requests = build_requests(args.scenario, args.requests, rng, args.payload_pool, created.json()["report_id"])
+        calls_before = fake.calls
+        try:
+            latencies, statuses, elapsed = await run_load(app, requests, args.concurrency, args.duration)
+        finally:
+            # ASGITransport 는 lifespan(shutdown)을 돌리지 않으므로 같은 루프에서 직접 정리한다.
+            await dispose_async_engine()
+        return latencies, statuses, elapsed, fake.calls - calls_before
+
+    try:
+        latencies, statuses, elapsed, llm_calls = asyncio.run(scenario())
+        get_report_queue().join()
+    finally:
+        get_report_queue().stop()
+        engine.dispose()
+        tmp.cleanup()
+
+    results = []
+    all_latencies: List[float] = []
+    for name in sorted(latencies):
+        values = latencies[name]
+        all_latencies.extend(values)
+        results.append(
+            {
+                "scenario": name,
+                "requests": len(values),
+                "statuses": dict(statuses[name]),
+                "throughput_rps": round(len(values) / elapsed, 2) if elapsed else None,
+                **percentiles(values),
+            }
+        )
+    results.append(
+        {
+            "scenario": "total",
+            "requests": len(all_latencies),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(all_latencies) / elapsed, 2) if elapsed else None,
+            "llm_calls": llm_calls,
+            **percentiles(all_latencies),
+        }
+    )
+    emit("load", vars(args), results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+순수 함수 마이크로 벤치마크 (LLM 호출 없음): 감정/결정/액션 추출, 문장 분리, 요약 후처리,
+Markdown 렌더링, 캐시 키 계산, 비밀번호 해싱.
+말뭉치는 benchmarks.corpus 의 한국어 세션 로그이며 --seed 가 같으면 입력이 같다.
+Run: python -m benchmarks.bench_micro [--sentences 5 50 500] [--repeat 5] [--output micro.json]
+결과는 JSON 으로 stdout 에 출력한다. (값은 호출 1회당 마이크로초, repeat 회 중 최솟값)
+"""
+import argparse
+import os
+import random
+
+from app.core.config import get_settings
+from app.core import security
+from app.services.langchain import LangChainService
+from app.services.llm_cache import NullLLMCache, make_cache_key
+from app.services.report_service import _render_report
+from benchmarks.common import emit, per_call_us
+from benchmarks.corpus import session_log
+from benchmarks.fake_llm import FakeLLM
+
+
+def text_cases(service: LangChainService, text: str, repeat: int) -> dict:
+    fake = FakeLLM()
+    raw_summary = fake._summary_text({"what_happened": text})
+    summary = service._build_summary(raw_summary, ["불안"])
+    inputs = {"what_happened": text, "emotions": "불안", "what_you_did": "", "desired_outcome": ""}
+    return {
+        "split_sentences_us": per_call_us(lambda: service._split_sentences(text), repeat),
+        "keyword_scan_us": per_call_us(lambda: service.keywords.scan(text), repeat),
+        "detect_emotions_us": per_call_us(lambda: service.detect_emotions(text), repeat),
+        "extract_decisions_us": per_call_us(lambda: service._extract_decisions(text), repeat),
+        "extract_action_items_us": per_call_us(lambda: service._extract_action_items(text), repeat),
+        "build_summary_us": per_call_us(lambda: service._build_summary(raw_summary, ["불안"]), repeat),
+        "render_report_us": per_call_us(lambda: _render_report("s-1", summary), repeat),
+        "cache_key_us": per_call_us(
+            lambda: make_cache_key(inputs, model="gemini-2.5-flash", prompt_version="summary-v1"), repeat
+        ),
+    }
+
+
+def hash_cases(repeat: int) -> dict:
+    hasher = security.get_password_hasher()
+    # 워커 프로세스 기동 비용은 측정에서 제외
+    for future in [hasher.submit("warm-up", b"salt", 1) for _ in range(max(1, hasher.workers))]:
+        future.result()
+    stored = security.hash_password("correct horse battery staple")
+    return {
+        "iterations": security.current_iterations(),
+        "hash_password_us": per_call_us(lambda: security.hash_password("correct horse battery staple"), repeat, 0.5),
+        "verify_password_us": per_call_us(
+            lambda: security.verify_password("correct horse battery staple", stored), repeat, 0.5
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--keyword-ratio", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--hash-iterations", type=int, default=None, help="PASSWORD_HASH_ITERATIONS 재정의")
+    parser.add_argument("--skip-hash", action="store_true")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    if args.hash_iterations is not None:
+        os.environ["PASSWORD_HASH_ITERATIONS"] = str(args.hash_iterations)
+        get_settings.cache_clear()
+
+    service = LangChainService(cache=NullLLMCache())
+    rng = random.Random(args.seed)
+    results = []
+    for n in args.sentences:
+        text = session_log(rng, n, args.keyword_ratio)
+        results.append({"case": "text", "sentences": n, "chars": len(text), **text_cases(service, text, args.repeat)})
+    if not args.skip_hash:
+        try:
+            results.append({"case": "password", **hash_cases(args.repeat)})
+        finally:
+            security.get_password_hasher().shutdown()
+
+    emit("micro", vars(args), results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+로그인(비밀번호 검증) 처리량 vs 해싱 풀 크기 벤치마크.
+요청 스레드 풀(--threads)에서 동시에 verify_password 를 호출하는 상황을 흉내 낸다.
+Run: python -m benchmarks.bench_password_hashing [--pool-sizes 0 1 2 4] [--logins 64]
+결과는 JSON 으로 stdout 에 출력한다.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core import security
+from app.core.security import PasswordHasherPool, PasswordHashingBusy
+
+
+def run(pool_size: int, logins: int, threads: int, max_pending: int, iterations: int) -> dict:
+    pool = PasswordHasherPool(pool_size, max_pending)
+    salt = os.urandom(security.SALT_SIZE)
+    expected = security._pbkdf2("correct horse", salt, iterations)
+    stored = security._format_hash(iterations, salt, expected)
+    # 워커 프로세스 기동 비용은 측정에서 제외
+    for future in [pool.submit("warm-up", salt, 1) for _ in range(max(1, pool_size))]:
+        future.result()
+
+    def login(_):
+        t0 = time.perf_counter()
+        try:
+            _, iters, s, h = security._split_hash(stored)
+            ok = pool.derive("correct horse", s, iters) == h
+        except PasswordHashingBusy:
+            return "rejected", time.perf_counter() - t0
+        return ("ok" if ok else "bad"), time.perf_counter() - t0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        outcomes = list(executor.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    pool.shutdown()
+
+    latencies = sorted(lat for status, lat in outcomes if status == "ok")
+    accepted = len(latencies)
+
+    def pct(p):
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+    return {
+        "pool_size": pool_size,
+        "accepted": accepted,
+        "rejected": sum(1 for status, _ in outcomes if status == "rejected"),
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(accepted / elapsed, 2) if elapsed else None,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=390000)
+    args = parser.parse_args()
+
+    results = [run(size, args.logins, args.threads, args.max_pending, args.iterations) for size in args.pool_sizes]
+    print(
+        json.dumps(
+            {
+                "benchmark": "login_throughput",
+                "iterations": args.iterations,
+                "threads": args.threads,
+                "cpu_count": os.cpu_count(),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
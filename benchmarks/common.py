@@ -0,0 +1,78 @@
+"""
+벤치마크 공용 유틸: 백분위 계산, 실행 환경 정보, JSON 결과 출력.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Sequence
+
+
+def percentiles(values: Sequence[float], points: Sequence[float] = (0.50, 0.95, 0.99)) -> Dict[str, Optional[float]]:
+    """초 단위 값 -> {"p50_ms": ..., "p95_ms": ..., "p99_ms": ...} (nearest-rank)."""
+    ordered = sorted(values)
+    result: Dict[str, Optional[float]] = {}
+    for p in points:
+        key = f"p{int(round(p * 100))}_ms"
+        if not ordered:
+            result[key] = None
+            continue
+        result[key] = round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+    return result
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def per_call_us(fn: Callable[[], object], repeat: int, min_seconds: float = 0.05) -> float:
+    """fn 한 번 호출 비용(마이크로초). 호출 수를 min_seconds 이상이 되도록 늘린 뒤 repeat 회 중 최솟값."""
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - t0 >= min_seconds or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    def run():
+        for _ in range(loops):
+            fn()
+
+    return round(best_of(run, repeat) / loops * 1e6, 3)
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "git_commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def emit(benchmark: str, config: dict, results, output: Optional[str] = None) -> dict:
+    """결과를 JSON 으로 stdout 에 출력하고, output 경로가 있으면 파일로도 저장한다."""
+    document = {"benchmark": benchmark, "config": config, "environment": environment(), "results": results}
+    text = json.dumps(document, ensure_ascii=False, indent=2)
+    print(text)
+    if output:
+        with open(output, "w", encoding="utf-8") as fp:
+            fp.write(text + "\n")
+    return document
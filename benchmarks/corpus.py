@@ -0,0 +1,94 @@
+"""
+벤치마크용 한국어 회고/회의 로그 말뭉치. 같은 seed 면 같은 텍스트가 나온다.
+"""
+import random
+from typing import List
+
+# 감정/결정/액션 키워드가 들어 있는 문장
+CORPUS_SENTENCES = [
+    "오늘 회의에서 일정이 너무 촉박해서 불안했다",
+    "팀장님이 갑자기 질문해서 당황했고 조금 짜증도 났다",
+    "결국 남은 작업은 내가 맡기로 결정했다",
+    "다음 주까지 발표 자료를 준비해야 한다 @민수 2025-11-14",
+    "동료에게 미안한 마음이 들었다",
+    "회의록을 정리하고 요구사항을 다시 확인하기로 합의했다",
+    "I felt anxious and a bit awkward during the review",
+    "점심은 평소처럼 먹었다",
+]
+
+# 실제 세션 로그처럼 키워드가 없는 문장이 대부분인 말뭉치
+NEUTRAL_SENTENCES = [
+    "점심은 평소처럼 먹었다",
+    "오후에는 고객사 미팅이 있었다",
+    "디자인 시안에 대해 이야기를 나눴다",
+    "그 부분은 다음에 다시 이야기하자고 했다",
+    "퇴근길에 지하철이 많이 붐볐다",
+    "It was a long day at the office",
+]
+
+SITUATIONS = [
+    "주간 회의에서 내 제안이 바로 반려됐다",
+    "친구와 약속 시간을 두고 말다툼이 있었다",
+    "발표 중에 질문을 받고 말이 막혔다",
+    "팀원이 마감 직전에 일정 변경을 알렸다",
+    "부모님과 진로 문제로 언성이 높아졌다",
+]
+REACTIONS = [
+    "즉각 반박했다",
+    "아무 말도 하지 못하고 넘어갔다",
+    "자리를 피했다",
+    "웃으면서 넘기려고 했다",
+]
+WISHES = [
+    "차분하게 근거를 설명하고 싶었다",
+    "내 감정을 솔직하게 말하고 싶었다",
+    "상대의 입장을 먼저 물어보고 싶었다",
+]
+
+
+def build_text(n_sentences: int, keyword_every: int = 1) -> str:
+    """keyword_every=k 이면 k 문장마다 한 번 키워드 문장을 넣는다 (1 = 모든 문장이 키워드 문장)."""
+    sentences = []
+    for i in range(n_sentences):
+        if i % keyword_every == 0:
+            sentences.append(CORPUS_SENTENCES[(i // keyword_every) % len(CORPUS_SENTENCES)])
+        else:
+            sentences.append(NEUTRAL_SENTENCES[i % len(NEUTRAL_SENTENCES)])
+    return ". ".join(sentences) + "."
+
+
+def session_log(rng: random.Random, n_sentences: int, keyword_ratio: float = 0.2) -> str:
+    """키워드 문장 비율이 keyword_ratio 인 무작위 세션 로그."""
+    sentences = [
+        rng.choice(CORPUS_SENTENCES) if rng.random() < keyword_ratio else rng.choice(NEUTRAL_SENTENCES)
+        for _ in range(n_sentences)
+    ]
+    return ". ".join(sentences) + "."
+
+
+def summary_request(rng: random.Random, unique: bool = True) -> dict:
+    """POST /api/reflections/summary 요청 본문. unique 면 캐시에 걸리지 않도록 꼬리표를 붙인다."""
+    tag = f" (#{rng.randrange(10**9)})" if unique else ""
+    return {
+        "whatHappened": rng.choice(SITUATIONS) + ". " + session_log(rng, rng.randint(2, 8)) + tag,
+        "emotions": [] if rng.random() < 0.5 else ["불안"],
+        "whatYouDid": rng.choice(REACTIONS),
+        "howYouWishItHadGone": rng.choice(WISHES),
+    }
+
+
+def chat_request(rng: random.Random, turns: int = 6) -> dict:
+    conversation: List[dict] = []
+    for i in range(turns):
+        conversation.append({"sender": "user" if i % 2 == 0 else "ai", "text": session_log(rng, 2)})
+    body = summary_request(rng)
+    body.update(
+        {
+            "personaName": "팀장님",
+            "personaTone": "차분한",
+            "personaPersonality": "공감적인 리더",
+            "message": rng.choice(WISHES),
+            "conversation": conversation,
+        }
+    )
+    return body
@@ -0,0 +1,119 @@
+"""
+Gemini 대신 쓰는 가짜 체인. 지연 분포와 실패율을 지정할 수 있고 seed 로 재현 가능하다.
+
+지연 분포 지정 형식 (초):
+- "none"                  지연 없음
+- "fixed:0.2"             항상 0.2
+- "uniform:0.1,0.5"       0.1 ~ 0.5 균등
+- "lognormal:0.3,0.5"     중앙값 0.3, sigma 0.5 (꼬리가 긴 실제 LLM 지연에 가까움)
+"""
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Callable
+
+from langchain_core.runnables import RunnableLambda
+
+
+class FakeLLMError(RuntimeError):
+    """가짜 LLM 호출 실패. 제공자의 일시적 503 처럼 보여 재시도/서킷 브레이커/키워드 대체 경로를 탄다."""
+
+    status_code = 503
+
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()]
+    if kind == "none":
+        return lambda: 0.0
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        low, high = values
+        return lambda: rng.uniform(low, high)
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        return lambda: rng.lognormvariate(math.log(median), sigma)
+    raise ValueError(f"Unknown latency spec: {spec!r}")
+
+
+class FakeLLM:
+    def __init__(self, latency: str = "none", failure_rate: float = 0.0, seed: int = 0, tokens_per_reply: int = 20):
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sample_latency = parse_latency(latency, self._rng)
+        self.failure_rate = failure_rate
+        self.tokens_per_reply = tokens_per_reply
+        self.calls = 0
+        self.failures = 0
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            delay = self._sample_latency()
+            failed = self._rng.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+        return delay, failed
+
+    def _summary_text(self, inputs: dict) -> str:
+        return json.dumps(
+            {
+                "summary": f"{str(inputs.get('what_happened', ''))[:80]} 요약",
+                "keyInsights": ["즉각적인 방어 반응이 갈등을 키웠습니다.", "관계 회복을 바라고 있습니다."],
+                "suggestedPhrases": ["지금 생각해보니 감정이 앞섰던 것 같아."],
+            },
+            ensure_ascii=False,
+        )
+
+    def _reply_tokens(self, inputs: dict):
+        words = re.findall(r"\S+\s*", f"그 상황이라면 저도 당황했을 것 같아요. {inputs.get('message') or ''}")
+        return (words * (self.tokens_per_reply // max(1, len(words)) + 1))[: self.tokens_per_reply]
+
+    def summary_chain(self) -> RunnableLambda:
+        def invoke(inputs):
+            delay, failed = self._draw()
+            time.sleep(delay)
+            if failed:
+                raise FakeLLMError("Fake LLM failure")
+            return self._summary_text(inputs)
+
+        async def ainvoke(inputs):
+            delay, failed = self._draw()
+            await asyncio.sleep(delay)
+            if failed:
+                raise FakeLLMError("Fake LLM failure")
+            return self._summary_text(inputs)
+
+        return RunnableLambda(invoke, afunc=ainvoke)
+
+    def chat_chain(self) -> RunnableLambda:
+        # 지연은 토큰 사이에 고르게 나눠 스트리밍처럼 흘려보낸다.
+        def stream(inputs):
+            delay, failed = self._draw()
+            tokens = self._reply_tokens(inputs)
+            if failed:
+                raise FakeLLMError("Fake LLM failure")
+            for token in tokens:
+                time.sleep(delay / len(tokens))
+                yield token
+
+        async def astream(inputs):
+            delay, failed = self._draw()
+            tokens = self._reply_tokens(inputs)
+            if failed:
+                raise FakeLLMError("Fake LLM failure")
+            for token in tokens:
+                await asyncio.sleep(delay / len(tokens))
+                yield token
+
+        return RunnableLambda(stream, afunc=astream)
+
+    def install(self, service) -> None:
+        """LangChainService 의 체인을 가짜 체인으로 교체한다."""
+        service._summary = self.summary_chain()
+        service._chat = self.chat_chain()
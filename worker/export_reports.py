@@ -0,0 +1,60 @@
+"""
+리포트 NDJSON 내보내기 (GET /api/reflections/reports/export 와 같은 스트림을 DB 에서 바로 읽어 쓴다).
+Run: python -m worker.export_reports [--output reports.ndjson] [--since 2026-10-01] [--until 2026-10-02]
+     [--status finished] [--session-id <id>] [--after <report_id>] [--batch-size 1000] [--resume]
+--resume 은 --output 파일의 마지막 체크포인트 줄부터 이어 쓴다 (그 뒤에 쓰인 내용은 버린다).
+끊긴 실행과 같은 필터를 넘겨야 한다. --output 이 없으면 stdout 으로 쓴다.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.repositories.report_repository import ReportRepository
+from app.services.report_export import ExportFilter, iter_export_chunks, last_checkpoint, naive_utc
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", default=None, help="NDJSON 파일 (기본: stdout)")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None, help="created_at >= (ISO 8601, 시간대 없으면 UTC)")
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None, help="created_at < (ISO 8601, 시간대 없으면 UTC)")
+    parser.add_argument("--status", default=None, choices=["pending", "running", "finished", "failed"])
+    parser.add_argument("--session-id", default=None)
+    parser.add_argument("--after", type=int, default=None, help="이 report_id 다음부터")
+    parser.add_argument("--batch-size", type=int, default=get_settings().REPORT_EXPORT_BATCH_SIZE)
+    parser.add_argument("--resume", action="store_true", help="--output 의 마지막 체크포인트부터 이어 쓰기")
+    args = parser.parse_args()
+
+    since, until = naive_utc(args.since), naive_utc(args.until)
+    if since is not None and until is not None and since >= until:
+        parser.error("--since must be earlier than --until")
+    if args.resume and not args.output:
+        parser.error("--resume requires --output")
+
+    after, exported, mode = args.after, 0, "wb"
+    if args.resume and os.path.exists(args.output):
+        checkpoint = last_checkpoint(args.output)
+        if checkpoint is not None:
+            after, exported = checkpoint["after"], checkpoint["exported"]
+            with open(args.output, "r+b") as file:
+                file.truncate(checkpoint["offset"])
+            mode = "ab"
+    filters = ExportFilter(since=since, until=until, status=args.status, session_id=args.session_id, after=after)
+
+    out = open(args.output, mode) if args.output else sys.stdout.buffer
+    db = SessionLocal()
+    try:
+        for chunk in iter_export_chunks(ReportRepository(db), filters, args.batch_size, exported):
+            out.write(chunk)
+            out.flush()
+    finally:
+        db.close()
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,19 @@
 """
-RQ worker entrypoint.
+RQ 워커 진입점.
 Run: python -m worker.rq_worker
-Requires Redis.
+Redis 가 필요하다. REPORT_QUEUE_BACKEND=rq 일 때 쓰며, 작업은
+POST /api/reflections/reports 가 넣는다 (app.services.report_service.process_report).
 """
 import os
 from redis import Redis
 from rq import Worker, Queue, Connection
 from app.core.config import get_settings
+from app.services.report_queue import REPORT_QUEUE_NAME
 
 settings = get_settings()
-redis_url = getattr(settings, "REDIS_URL", "redis://localhost:6379/0")
+redis_url = settings.REDIS_URL
 redis_conn = Redis.from_url(redis_url)
-listen = ["reports"]
+listen = [REPORT_QUEUE_NAME]
 
 if __name__ == "__main__":
     with Connection(redis_conn):